@@ -1,30 +1,57 @@
+import asyncio
 import json
 import logging
 import time
-import torch
 import uuid
-import gc
 from datetime import datetime
 
+import httpx
 from typing_extensions import Annotated
 
 from fastapi import FastAPI, Request, Depends
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 
 from slowapi import Limiter
 from slowapi.errors import RateLimitExceeded
 from slowapi.middleware import SlowAPIMiddleware
 from slowapi.util import get_remote_address
 
-from Utilities.data_processor import DataProcessor
+from Utilities.agent_executors import AgentExecutors, IntentBusyError
+from Utilities.agent_metrics import (
+    REGISTRY,
+    IN_FLIGHT_REQUESTS,
+    RATE_LIMITED,
+    intent_label,
+    record_request,
+    set_request_labels,
+    update_executor_gauges,
+)
+from Utilities.metrics import CONTENT_TYPE
+from Utilities.tracing import TracingMiddleware, tracer
+from Utilities.filtered_dataset import refresh_filtered_dataset
 from Utilities.intent_executor import IntentExecutor
 from Utilities.intent_detection import IntentDetection
+from Utilities.agent_registry import AgentRegistry
 from Utilities.user_authenticator import UserAuthenticator
-from Constants.api_constants import REQ_PER_MIN
+from Utilities.query_cache import QueryCache
+from Utilities.prompt_prefixes import PromptPrefixRegistrar
+from Utilities.memory_governor import MemoryGovernor
+from Mixins.llm_response_mixin import close_clients
+from Constants.api_constants import (
+    REQ_PER_MIN,
+    APP_NAME,
+    MEMORY_CLEANUP_EVERY_N_REQUESTS,
+    MEMORY_RSS_LIMIT_MB,
+    MEMORY_CLEANUP_MIN_INTERVAL_SECONDS,
+    PREFIX_REGISTRATION_RETRY_SECONDS,
+    PREFIX_REGISTRATION_MAX_RETRY_SECONDS,
+)
+from Constants.cache_constants import QUERY_CACHE_ENABLED
+from Constants.Agents.dataframe_agent_constants import SEARCH_PAGE_SIZE
 
 from Handlers.error_handler import ErrorHandlers
-from Handlers.json_response_handler import JSONResponseHandler
+from Handlers.json_response_handler import JSONResponseHandler, accepts_arrow, dumps
 
 logging.basicConfig(
     level=logging.INFO,
@@ -35,12 +62,14 @@ app = FastAPI()
 
 limiter = Limiter(key_func=get_remote_address)
 app.state.limiter = limiter
-app.add_exception_handler(
-    RateLimitExceeded,
-    lambda request, exc: JSONResponse(
-        status_code=429, content={"detail": "rate limit exceeded"}
-    ),
-)
+
+
+def rate_limit_exceeded(request: Request, exc: RateLimitExceeded) -> JSONResponse:
+    RATE_LIMITED.inc(endpoint=request.url.path)
+    return JSONResponse(status_code=429, content={"detail": "rate limit exceeded"})
+
+
+app.add_exception_handler(RateLimitExceeded, rate_limit_exceeded)
 
 app.add_middleware(SlowAPIMiddleware)
 
@@ -52,19 +81,96 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(TracingMiddleware, tracer=tracer)
 
 
-intent_detection = IntentDetection()
-intent_executor = IntentExecutor()
+agent_executors = AgentExecutors()
+intent_detection = IntentDetection(io_executor=agent_executors.io_pool)
 user_auth = UserAuthenticator()
 json_response_handler = JSONResponseHandler()
 error_handler = ErrorHandlers()
-data_processor = DataProcessor(df1_path="./DataFiles/Leads.csv",
-                               df2_path="./DataFiles/SampleData.csv")
+refresh_filtered_dataset(leads_path="./DataFiles/Leads.csv",
+                         sample_path="./DataFiles/SampleData.csv")
+
+intent_executor = IntentExecutor(
+    registry=AgentRegistry(cpu_executor=agent_executors.cpu_pool), executors=agent_executors)
+query_cache = QueryCache() if QUERY_CACHE_ENABLED else None
+memory_governor = MemoryGovernor(every_n_requests=MEMORY_CLEANUP_EVERY_N_REQUESTS,
+                                 rss_limit_mb=MEMORY_RSS_LIMIT_MB,
+                                 min_interval_seconds=MEMORY_CLEANUP_MIN_INTERVAL_SECONDS)
+
+
+def detected_intent(intent_body):
+    return intent_body.get("intent") if isinstance(intent_body, dict) else None
+
+
+def label_request(intent, app_name: str) -> None:
+    """
+    Labels the metrics and the trace span of the current request.
+    """
+    set_request_labels(intent, app_name)
+    tracer.set_attributes(intent=intent_label(intent), app_name=app_name)
+
+
+def apply_page_options(intent_response, data: dict):
+    """
+    Re-pages a `search_dataframe` result when the request asks for another
+    page size (`limit`) or a column projection (`columns`).
+    """
+    limit = data.get("limit")
+    columns = data.get("columns")
+    if (limit is None and columns is None) or not isinstance(intent_response, dict) \
+            or "filter" not in intent_response:
+        return intent_response
+    return intent_executor.registry.dataframe_agent.get_page(
+        intent_response["filter"], limit=limit or SEARCH_PAGE_SIZE, columns=columns)
 
-filtered_dataframe = data_processor.get_filter_data()
-data_processor.save_filtered_dataframe(
-    filtered_dataframe=filtered_dataframe, path="./DataFiles/filtered.csv")
+
+async def watch_snapshot() -> None:
+    """
+    Checks the leads snapshot for changes every `check_interval` seconds.
+    The reload runs on the CPU pool, so the event loop keeps serving the
+    previous snapshot until the new one is swapped in.
+    """
+    snapshot = intent_executor.registry.snapshot
+    while True:
+        await asyncio.sleep(snapshot.check_interval)
+        try:
+            await agent_executors.run_cpu(snapshot.reload)
+        except Exception as e:
+            logging.error(f"Snapshot reload failed: {e}", exc_info=True)
+
+
+async def register_prompt_prefixes() -> None:
+    """
+    Registers the prompt prefixes with the model server, retrying with
+    exponential backoff while the server is unreachable or failing, so the
+    Agent can start before the model server is up.
+    """
+    delay = PREFIX_REGISTRATION_RETRY_SECONDS
+    while True:
+        try:
+            await PromptPrefixRegistrar().register_all()
+            return
+        except (httpx.RequestError, httpx.HTTPStatusError) as e:
+            logging.warning(f"Prompt prefix registration failed, retrying in {delay}s: {e}")
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, PREFIX_REGISTRATION_MAX_RETRY_SECONDS)
+
+
+@app.on_event("startup")
+async def start_background_tasks() -> None:
+    app.state.prefix_registration = asyncio.create_task(register_prompt_prefixes())
+    app.state.snapshot_watcher = asyncio.create_task(watch_snapshot())
+
+
+@app.on_event("shutdown")
+async def shutdown_llm_clients() -> None:
+    app.state.prefix_registration.cancel()
+    app.state.snapshot_watcher.cancel()
+    await close_clients()
+    agent_executors.shutdown()
+    tracer.shutdown()
 
 
 @app.post("/agent/inference/get-response")
@@ -75,28 +181,45 @@ async def get_audio_transcript(
 
     start_time = time.time()
     logging.info("Inference request received.")
+    endpoint = "get-response"
+    set_request_labels(None, APP_NAME)
+    IN_FLIGHT_REQUESTS.inc(endpoint=endpoint)
 
     try:
         data = await request.json()
         query = data.get("query")
+        app_name = data.get("app_name", APP_NAME)
+        label_request("detect_intent", app_name)
 
         incoming_client_ip = request.client.host
         incoming_client_port = request.client.port
 
-        intent_body = intent_detection.get_intent(query=query)
+        stages = {}
+        dataset_version = intent_executor.registry.snapshot_version
+        cached = query_cache.get(query, dataset_version) if query_cache else None
+        if cached is not None:
+            intent_body = cached["intent"]
+            intent_response = cached["query_response"]
+            label_request(detected_intent(intent_body), app_name)
+        else:
+            detection_start = time.perf_counter()
+            async with agent_executors.limit("detect_intent"):
+                intent_body = await intent_detection.aget_intent(query=query)
+            stages["intent_detection"] = time.perf_counter() - detection_start
+            label_request(detected_intent(intent_body), app_name)
 
-        intent_response = intent_executor.select_and_execute_agent_from_intent(
-            intent_body=intent_body)
+            intent_response = await intent_executor.aselect_and_execute_agent_from_intent(
+                intent_body=intent_body)
+
+            if query_cache:
+                query_cache.set(query, intent_body, intent_response, dataset_version)
+
+        intent_response = await agent_executors.run_cpu(apply_page_options, intent_response, data)
 
         end_time = time.time()
         process_time = round(end_time - start_time, 1)
 
-<<<<<<< HEAD
-        torch.cuda.clear_cache()
-=======
-        torch.cuda.empty_cache()
->>>>>>> f6f648b (new commit)
-        gc.collect()
+        await agent_executors.run_io(memory_governor.after_request)
 
         result_response = {
             "response_id": str(uuid.uuid1()),
@@ -104,14 +227,236 @@ async def get_audio_transcript(
             "intent": intent_body,
             "query_response": intent_response,
             "process_time": process_time,
+            "cache_hit": cached is not None,
+            "trace_id": tracer.current_span().trace_id,
             "incoming_client_ip": incoming_client_ip,
             "incoming_client_port": incoming_client_port,
         }
 
         logging.info(
             f"Response generated successfully in {process_time} seconds.")
-        return json_response_handler.get_200_response(response_dict=result_response)
+        serialization_start = time.perf_counter()
+        with tracer.span("serialization"):
+            response = json_response_handler.get_200_response(
+                response_dict=result_response, request=request)
+        stages["serialization"] = time.perf_counter() - serialization_start
+        stages["total"] = time.time() - start_time
+        record_request(endpoint, 200, stages, cache_hit=cached is not None)
+        return response
+
+    except IntentBusyError as e:
+        record_request(endpoint, 503)
+        return error_handler.handle_queue_full_error(str(e), retry_after=e.retry_after)
+    except (
+        json.JSONDecodeError,
+        KeyError,
+        TypeError,
+        ValueError,
+        FileNotFoundError,
+        PermissionError,
+        AttributeError,
+    ) as e:
+        logging.error(f"Request error: {e}")
+        record_request(endpoint, 400)
+        return error_handler.handle_error(e, status_code=400)
+    except Exception as e:
+        logging.error(f"Internal server error: {e}", exc_info=True)
+        record_request(endpoint, 500)
+        return error_handler.handle_error(e, status_code=500)
+    finally:
+        IN_FLIGHT_REQUESTS.dec(endpoint=endpoint)
+
+
+@app.post("/agent/inference/stream-response")
+@limiter.limit(f"{REQ_PER_MIN}/minute")
+async def stream_response(
+    request: Request, auth_flag: Annotated[bool, Depends(user_auth.get_current_user)]
+):
+    """
+    Streams the answer to a query as NDJSON lines. An `intent` line comes
+    first; `write_email` drafts are then relayed token by token from the
+    model server, other intents send a single `result` line. A closing
+    `done` line carries the parsed response and timings. When the intent's
+    concurrency limit is still reached after the queue timeout, a `busy`
+    line with `retry_after` replaces them.
+    """
+    start_time = time.time()
+    logging.info("Streaming inference request received.")
+    endpoint = "stream-response"
+    streaming = False
+    set_request_labels(None, APP_NAME)
+    IN_FLIGHT_REQUESTS.inc(endpoint=endpoint)
+
+    try:
+        data = await request.json()
+        query = data.get("query")
+        app_name = data.get("app_name", APP_NAME)
+        label_request("detect_intent", app_name)
+
+        stages = {}
+        dataset_version = intent_executor.registry.snapshot_version
+        cached = query_cache.get(query, dataset_version) if query_cache else None
+        if cached is not None:
+            intent_body = cached["intent"]
+        else:
+            detection_start = time.perf_counter()
+            async with agent_executors.limit("detect_intent"):
+                intent_body = await intent_detection.aget_intent(query=query)
+            stages["intent_detection"] = time.perf_counter() - detection_start
+        label_request(detected_intent(intent_body), app_name)
+        if not isinstance(intent_body, dict):
+            raise ValueError("Could not detect the intent of the query.")
+
+        async def ndjson_events():
+            yield dumps({"event": "intent", "intent": intent_body}) + b"\n"
+            try:
+                time_to_first_token = None
+                if cached is not None:
+                    intent_response = cached["query_response"]
+                    result_response = await agent_executors.run_cpu(
+                        apply_page_options, intent_response, data)
+                    yield dumps({"event": "result", "query_response": result_response}) + b"\n"
+                elif (intent_body.get("intent") == "write_email"
+                        and intent_executor.registry.email_agent.email_from_arguments(
+                            intent_body.get("arguments")) is None):
+                    email_agent = intent_executor.registry.email_agent
+                    draft = []
+                    async with agent_executors.limit("write_email"):
+                        async for event in email_agent.astream_email(action=intent_body.get("action")):
+                            if event.get("event") == "token":
+                                if time_to_first_token is None:
+                                    time_to_first_token = round(
+                                        time.time() - start_time, 3)
+                                draft.append(event["token"])
+                                yield dumps(event) + b"\n"
+                    try:
+                        intent_response = email_agent._extract_json(
+                            response="".join(draft)) or "".join(draft)
+                    except ValueError:
+                        intent_response = "".join(draft)
+                    result_response = intent_response
+                else:
+                    intent_response = await intent_executor.aselect_and_execute_agent_from_intent(
+                        intent_body=intent_body)
+                    result_response = await agent_executors.run_cpu(
+                        apply_page_options, intent_response, data)
+                    yield dumps({"event": "result", "query_response": result_response}) + b"\n"
+
+                if cached is None and query_cache:
+                    query_cache.set(query, intent_body, intent_response, dataset_version)
+
+                process_time = round(time.time() - start_time, 1)
+                yield dumps({
+                    "event": "done",
+                    "response_id": str(uuid.uuid1()),
+                    "datetime": str(datetime.now()),
+                    "intent": intent_body,
+                    "query_response": result_response,
+                    "process_time": process_time,
+                    "time_to_first_token": time_to_first_token,
+                    "cache_hit": cached is not None,
+                    "trace_id": tracer.current_span().trace_id,
+                }) + b"\n"
+                logging.info(
+                    f"Response streamed in {process_time} seconds, "
+                    f"first token after {time_to_first_token} seconds.")
+                stages["total"] = time.time() - start_time
+                record_request(endpoint, 200, stages, cache_hit=cached is not None)
+                await agent_executors.run_io(memory_governor.after_request)
+            except IntentBusyError as e:
+                logging.warning(f"Service overloaded while streaming: {e}")
+                record_request(endpoint, 503)
+                yield dumps({"event": "busy", "error": "Server is busy, please retry later",
+                             "retry_after": e.retry_after}) + b"\n"
+            except Exception as e:
+                logging.error(f"Streaming error: {e}", exc_info=True)
+                record_request(endpoint, 500)
+                yield dumps({"event": "error", "error": "An unexpected error occurred"}) + b"\n"
+            finally:
+                IN_FLIGHT_REQUESTS.dec(endpoint=endpoint)
+
+        response = StreamingResponse(ndjson_events(), media_type="application/x-ndjson")
+        streaming = True
+        return response
+
+    except IntentBusyError as e:
+        record_request(endpoint, 503)
+        return error_handler.handle_queue_full_error(str(e), retry_after=e.retry_after)
+    except (
+        json.JSONDecodeError,
+        KeyError,
+        TypeError,
+        ValueError,
+        FileNotFoundError,
+        PermissionError,
+        AttributeError,
+    ) as e:
+        logging.error(f"Request error: {e}")
+        record_request(endpoint, 400)
+        return error_handler.handle_error(e, status_code=400)
+    except Exception as e:
+        logging.error(f"Internal server error: {e}", exc_info=True)
+        record_request(endpoint, 500)
+        return error_handler.handle_error(e, status_code=500)
+    finally:
+        if not streaming:
+            IN_FLIGHT_REQUESTS.dec(endpoint=endpoint)
+
 
+@app.post("/agent/inference/search-page")
+@limiter.limit(f"{REQ_PER_MIN}/minute")
+async def get_search_page(
+    request: Request, auth_flag: Annotated[bool, Depends(user_auth.get_current_user)]
+) -> JSONResponse:
+    """
+    Returns a further page of a `search_dataframe` result from the
+    `next_cursor` of the previous page, without another LLM call. `limit`
+    and `columns` may be given to change the page size or projection.
+    Clients sending `Accept: application/vnd.apache.arrow.stream` get the
+    rows as an Arrow IPC stream with the page fields in its metadata.
+    """
+    start_time = time.time()
+    endpoint = "search-page"
+    set_request_labels("search_dataframe", APP_NAME)
+    IN_FLIGHT_REQUESTS.inc(endpoint=endpoint)
+
+    try:
+        data = await request.json()
+        label_request("search_dataframe", data.get("app_name", APP_NAME))
+        cursor = data.get("cursor")
+        if not isinstance(cursor, str):
+            raise ValueError("A 'cursor' from a previous page is required.")
+
+        as_arrow = accepts_arrow(request)
+        async with agent_executors.limit("search_dataframe"):
+            page = await agent_executors.run_cpu(
+                intent_executor.registry.dataframe_agent.get_page_from_cursor,
+                cursor, limit=data.get("limit"), columns=data.get("columns"), as_frame=as_arrow)
+        serialization_start = time.perf_counter()
+        if as_arrow:
+            page_frame = page.pop("frame")
+            with tracer.span("serialization", format="arrow"):
+                response = json_response_handler.get_arrow_response(
+                    page_frame, metadata=page, request=request)
+        else:
+            result_response = {
+                "response_id": str(uuid.uuid1()),
+                "datetime": str(datetime.now()),
+                "query_response": page,
+                "process_time": round(time.time() - start_time, 3),
+                "trace_id": tracer.current_span().trace_id,
+            }
+            with tracer.span("serialization"):
+                response = json_response_handler.get_200_response(
+                    response_dict=result_response, request=request)
+        record_request(endpoint, 200, {
+            "serialization": time.perf_counter() - serialization_start,
+            "total": time.time() - start_time})
+        return response
+
+    except IntentBusyError as e:
+        record_request(endpoint, 503)
+        return error_handler.handle_queue_full_error(str(e), retry_after=e.retry_after)
     except (
         json.JSONDecodeError,
         KeyError,
@@ -122,7 +467,77 @@ async def get_audio_transcript(
         AttributeError,
     ) as e:
         logging.error(f"Request error: {e}")
+        record_request(endpoint, 400)
         return error_handler.handle_error(e, status_code=400)
+    except Exception as e:
+        logging.error(f"Internal server error: {e}", exc_info=True)
+        record_request(endpoint, 500)
+        return error_handler.handle_error(e, status_code=500)
+    finally:
+        IN_FLIGHT_REQUESTS.dec(endpoint=endpoint)
+
+
+@app.get("/agent/admin/cache")
+async def get_query_cache(
+    request: Request, auth_flag: Annotated[bool, Depends(user_auth.get_current_user)]
+) -> JSONResponse:
+    """
+    Returns query cache counters and a summary of the cached entries.
+    """
+    try:
+        cache_stats = query_cache.stats() if query_cache else {"enabled": False}
+        cache_stats["dataset_version"] = intent_executor.registry.snapshot_version
+        return json_response_handler.get_200_response(
+            response_dict=cache_stats, request=request)
+    except Exception as e:
+        logging.error(f"Internal server error: {e}", exc_info=True)
+        return error_handler.handle_error(e, status_code=500)
+
+
+@app.delete("/agent/admin/cache")
+async def flush_query_cache(
+    request: Request, auth_flag: Annotated[bool, Depends(user_auth.get_current_user)]
+) -> JSONResponse:
+    """
+    Drops every cached answer.
+    """
+    try:
+        removed = query_cache.flush() if query_cache else 0
+        return json_response_handler.get_200_response(
+            response_dict={"removed": removed}, request=request)
+    except Exception as e:
+        logging.error(f"Internal server error: {e}", exc_info=True)
+        return error_handler.handle_error(e, status_code=500)
+
+
+@app.get("/agent/admin/executors")
+async def get_executor_stats(
+    request: Request, auth_flag: Annotated[bool, Depends(user_auth.get_current_user)]
+) -> JSONResponse:
+    """
+    Returns worker pool sizes and per-intent concurrency counters.
+    """
+    try:
+        return json_response_handler.get_200_response(
+            response_dict=agent_executors.stats(), request=request)
+    except Exception as e:
+        logging.error(f"Internal server error: {e}", exc_info=True)
+        return error_handler.handle_error(e, status_code=500)
+
+
+@app.get("/metrics")
+async def get_metrics(
+    request: Request, auth_flag: Annotated[bool, Depends(user_auth.get_current_user)]
+) -> Response:
+    """
+    Prometheus metrics: per-stage latencies (intent detection, LLM call,
+    DataFrame filtering, serialization, total), requests, query cache hits,
+    in-flight requests, per-intent queue depth and rate-limit rejections,
+    labelled by intent and `app_name`.
+    """
+    try:
+        update_executor_gauges(agent_executors.stats())
+        return Response(content=REGISTRY.render(), media_type=CONTENT_TYPE)
     except Exception as e:
         logging.error(f"Internal server error: {e}", exc_info=True)
         return error_handler.handle_error(e, status_code=500)
@@ -1,9 +1,20 @@
 import logging
 import pandas as pd
-from Constants.Agents.dataframe_agent_constants import DATAFRAME_AGENT_PROMPT_TEMPLATE
+from Constants.Agents.dataframe_agent_constants import (
+    DATAFRAME_AGENT_PROMPT_TEMPLATE,
+    SEARCH_PAGE_SIZE,
+    SEARCH_MAX_PAGE_SIZE,
+)
 from Mixins.llm_response_mixin import LLMResponseMixin
-from typing import Dict, Any
-import re
+from Utilities.agent_metrics import STAGE_SECONDS, request_labels
+from Utilities.dataframe_snapshot import DataFrameSnapshot, SnapshotState
+from Utilities.filter_engine import FilterEngine, FilterError
+from Utilities.tracing import tracer
+from concurrent.futures import Executor
+from typing import Dict, Any, List, Optional
+import asyncio
+import base64
+import contextvars
 import json
 
 # Configure logging
@@ -19,18 +30,30 @@ class DataFrameAgent(LLMResponseMixin):
     using LLM responses for dynamic filtering based on user queries.
 
     Attributes:
-        filtered_dataframe (pd.DataFrame): The DataFrame to be filtered.
+        snapshot (DataFrameSnapshot): Shared snapshot holding the DataFrame to be filtered.
+        cpu_executor (Optional[Executor]): Executor the async methods filter on,
+            so pandas work never runs on the event loop.
     """
 
-    def __init__(self):
+    generation_profile = "dataframe_filter"
+
+    def __init__(self, snapshot: Optional[DataFrameSnapshot] = None,
+                 cpu_executor: Optional[Executor] = None):
         """
-        Initializes the DataFrameAgent with a filtered DataFrame.
+        Initializes the DataFrameAgent with a filtered DataFrame snapshot.
+
+        Args:
+            snapshot (Optional[DataFrameSnapshot]): Shared snapshot to read from.
+                A private one is loaded when omitted.
+            cpu_executor (Optional[Executor]): Executor for filtering in the
+                async methods. The event loop's default executor when omitted.
         """
-<<<<<<< HEAD
-        self.filtered_dataframe = pd.read_csv("./DataFiles/filtred.csv")
-=======
-        self.filtered_dataframe = pd.read_csv("./DataFiles/filtered.csv")
->>>>>>> f6f648b (new commit)
+        self.snapshot = snapshot or DataFrameSnapshot()
+        self.cpu_executor = cpu_executor
+
+    @property
+    def filtered_dataframe(self) -> pd.DataFrame:
+        return self.snapshot.dataframe
 
     def _extract_json(self, response: str) -> Dict[str, Any]:
         """
@@ -45,20 +68,30 @@ class DataFrameAgent(LLMResponseMixin):
         Raises:
             ValueError: If JSON extraction or decoding fails.
         """
-        match = re.search(r'\{.*\}', response, re.DOTALL)
-        if match:
-            json_str = match.group(0)
-            try:
-                extracted_json = json.loads(json_str)
-                logging.info("Successfully extracted JSON from response.")
-                return extracted_json
-            except json.JSONDecodeError as e:
-                logging.error(f"JSON decoding failed: {e}")
-                raise ValueError(
-                    "Failed to decode JSON from the response.") from e
-        else:
+        try:
+            extracted_json = super()._extract_json(response)
+        except json.JSONDecodeError as e:
+            logging.error(f"JSON decoding failed: {e}")
+            raise ValueError(
+                "Failed to decode JSON from the response.") from e
+        if extracted_json is None:
             logging.warning("No JSON object found in the response.")
             raise ValueError("No JSON object found in the response.")
+        logging.info("Successfully extracted JSON from response.")
+        return extracted_json
+
+    def _build_prompt(self, action: str) -> str:
+        """
+        Fills the prompt with the query and the columns of the current
+        snapshot by kind, so the LLM only uses columns and operators the
+        filter engine accepts.
+        """
+        schema = self.snapshot.filter_engine.schema
+        columns = {kind: ", ".join(json.dumps(column) for column, column_kind in schema.items()
+                                   if column_kind == kind)
+                   for kind in ("numeric", "text")}
+        return DATAFRAME_AGENT_PROMPT_TEMPLATE.format(
+            numeric_columns=columns["numeric"], text_columns=columns["text"], data_query=action)
 
     def get_filter_params(self, action: str) -> Dict[str, str]:
         """
@@ -71,7 +104,7 @@ class DataFrameAgent(LLMResponseMixin):
             Dict[str, str]: A dictionary containing filtering parameters like column and condition.
         """
         try:
-            prompt = DATAFRAME_AGENT_PROMPT_TEMPLATE.format(data_query=action)
+            prompt = self._build_prompt(action)
             response = self.get_llm_response(prompt=prompt)
             extracted_json = self._extract_json(
                 response=response['llm_response'])
@@ -84,40 +117,228 @@ class DataFrameAgent(LLMResponseMixin):
             logging.exception(f"Unexpected error occurred: {e}")
             return {"error": "An unexpected error occurred while processing the action."}
 
-    def get_filtred_data(self, action: str) -> str:
+    async def aget_filter_params(self, action: str) -> Dict[str, str]:
         """
-        Filters the DataFrame based on parameters extracted from the LLM response.
+        Awaitable version of `get_filter_params`.
 
         Args:
-            action (str): The user-defined action/query for filtering the data.
+            action (str): The action/query describing how to filter the data.
 
         Returns:
-            str: A JSON string of the filtered DataFrame.
+            Dict[str, str]: A dictionary containing filtering parameters like column and condition.
         """
         try:
-            params = self.get_filter_params(action=action)
-            if "error" in params:
-                return json.dumps(params)
+            prompt = self._build_prompt(action)
+            response = await self.aget_llm_response(prompt=prompt)
+            extracted_json = self._extract_json(
+                response=response['llm_response'])
+            return extracted_json
+        except KeyError as e:
+            logging.error(
+                f"KeyError encountered while extracting LLM response: {e}")
+            return {"error": "Failed to process the action due to missing response data."}
+        except Exception as e:
+            logging.exception(f"Unexpected error occurred: {e}")
+            return {"error": "An unexpected error occurred while processing the action."}
+
+    def _predicate(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Returns the predicate tree of the parameters. The original single
+        `column`/`condition` pair is converted by `FilterEngine.from_legacy`.
+        """
+        if "filter" in params:
+            return params["filter"]
+        return FilterEngine.from_legacy(
+            params.get("column", ""), params.get("condition", ""), self.filtered_dataframe)
+
+    @staticmethod
+    def _encode_cursor(state: Dict[str, Any]) -> str:
+        return base64.urlsafe_b64encode(json.dumps(state).encode("utf-8")).decode("ascii")
+
+    @staticmethod
+    def _decode_cursor(cursor: str) -> Dict[str, Any]:
+        try:
+            state = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        except (ValueError, UnicodeError) as e:
+            raise ValueError("Invalid search cursor.") from e
+        if not isinstance(state, dict) or "filter" not in state or "offset" not in state:
+            raise ValueError("Invalid search cursor.")
+        return state
+
+    def get_page(self, predicate: Dict[str, Any], offset: int = 0,
+                 limit: int = SEARCH_PAGE_SIZE,
+                 columns: Optional[List[str]] = None,
+                 as_frame: bool = False) -> Dict[str, Any]:
+        """
+        Returns one page of the rows matching a predicate.
+
+        Args:
+            predicate (Dict[str, Any]): Filter predicate tree.
+            offset (int): Position of the first row of the page.
+            limit (int): Rows per page, at most `SEARCH_MAX_PAGE_SIZE`.
+            columns (Optional[List[str]]): Columns to return. All when omitted.
+            as_frame (bool): Return the page rows as a DataFrame under `frame`
+                instead of `columns` and `rows`.
+
+        Returns:
+            Dict[str, Any]: The page with `total` matches, `columns`, `rows`
+            (plain Python values, missing values as None) and a
+            `next_cursor` (None on the last page).
+
+        Raises:
+            FilterError: If the predicate, the limit or a column is invalid.
+        """
+        return self._get_page(self.snapshot.state, predicate, offset, limit, columns, as_frame)
+
+    def _get_page(self, snapshot_state: SnapshotState, predicate: Dict[str, Any],
+                  offset: int, limit: int, columns: Optional[List[str]],
+                  as_frame: bool) -> Dict[str, Any]:
+        """
+        `get_page` over one snapshot state, so the version, the DataFrame and
+        the filter engine of a page always belong together across reloads.
+        """
+        if not isinstance(offset, int) or not isinstance(limit, int) \
+                or offset < 0 or not 0 < limit <= SEARCH_MAX_PAGE_SIZE:
+            raise FilterError(
+                f"Offset must be >= 0 and limit between 1 and {SEARCH_MAX_PAGE_SIZE}.")
 
-            column = params.get("column", "")
-            condition = params.get("condition", "")
+        dataset_version = snapshot_state.version
+        filter_engine = snapshot_state.filter_engine
+        dataframe = filter_engine.dataframe
+        if columns is not None:
+            if not isinstance(columns, list) or not columns:
+                raise FilterError("Columns must be a non-empty list.")
+            unknown = [c for c in columns if c not in dataframe.columns]
+            if unknown:
+                raise FilterError(f"Invalid column names: {unknown}")
 
-            if column not in self.filtered_dataframe.columns:
-                logging.error(f"Invalid column name provided: {column}")
-                return json.dumps({"error": "Invalid column name."})
+        with STAGE_SECONDS.time(stage="dataframe_filter", **request_labels()), \
+                tracer.span("dataframe_filter", offset=offset, limit=limit) as span:
+            row_ids = filter_engine.mask(predicate).nonzero()[0]
+            page_ids = row_ids[offset:offset + limit]
+            page_df = dataframe.iloc[page_ids] if columns is None else dataframe.iloc[page_ids][columns]
+            span.set_attributes(matches=int(len(row_ids)))
 
-            new_df = self.filtered_dataframe[
-                self.filtered_dataframe[column].astype(
-<<<<<<< HEAD
-                    str).str.contains(condition.lower(), case=False, na=False)
-=======
-                    str).str.contains(condition.replace("'", ""), case=False, na=False)
->>>>>>> f6f648b (new commit)
-            ]
+        next_offset = offset + limit
+        next_cursor = None
+        if next_offset < len(row_ids):
+            next_cursor = self._encode_cursor({
+                "filter": predicate, "offset": next_offset, "limit": limit,
+                "columns": columns, "version": dataset_version})
+        page = {
+            "filter": predicate,
+            "total": int(len(row_ids)),
+            "offset": offset,
+            "limit": limit,
+            "next_cursor": next_cursor,
+        }
+        if as_frame:
+            page["frame"] = page_df
+        else:
+            page["columns"] = list(page_df.columns)
+            page["rows"] = page_df.astype(object).where(page_df.notna(), None).to_numpy().tolist()
+        return page
+
+    def get_page_from_cursor(self, cursor: str, limit: Optional[int] = None,
+                             columns: Optional[List[str]] = None,
+                             as_frame: bool = False) -> Dict[str, Any]:
+        """
+        Returns the page a cursor from a previous page points to.
+
+        Args:
+            cursor (str): `next_cursor` of the previous page.
+            limit (Optional[int]): Overrides the page size of the cursor.
+            columns (Optional[List[str]]): Overrides the projection of the cursor.
+            as_frame (bool): See `get_page`.
+
+        Raises:
+            ValueError: If the cursor is invalid or the dataset changed since
+                the first page was served.
+        """
+        state = self._decode_cursor(cursor)
+        snapshot_state = self.snapshot.state
+        if state.get("version") != snapshot_state.version:
+            raise ValueError("The dataset changed since the search, run the query again.")
+        return self._get_page(snapshot_state, state["filter"], offset=state["offset"],
+                              limit=limit or state.get("limit", SEARCH_PAGE_SIZE),
+                              columns=columns or state.get("columns"), as_frame=as_frame)
+
+    def _apply_filter(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Applies the extracted filtering parameters to the DataFrame.
+
+        Args:
+            params (Dict[str, Any]): Filtering parameters produced by the LLM,
+                either a `filter` predicate or a `column` and a `condition`.
+
+        Returns:
+            Dict[str, Any]: The first page of matches (see `get_page`), or an `error`.
+        """
+        try:
+            if "error" in params:
+                return params
+
+            predicate = self._predicate(params)
+            page = self.get_page(predicate)
 
             logging.info(
-                f"Data successfully filtered based on column '{column}' and condition '{condition}'.")
-            return new_df.to_json()
+                f"Data successfully filtered with {json.dumps(predicate)}: {page['total']} matches.")
+            return page
+        except FilterError as e:
+            logging.error(f"Invalid filter: {e}")
+            return {"error": str(e)}
         except Exception as e:
             logging.exception(f"Error occurred while filtering data: {e}")
-            return json.dumps({"error": "An unexpected error occurred while filtering data."})
+            return {"error": "An unexpected error occurred while filtering data."}
+
+    def get_filtred_data_from_arguments(self, arguments: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Filters the DataFrame with parameters already extracted alongside the
+        intent, without another LLM call.
+
+        Args:
+            arguments (Dict[str, Any]): A `filter` predicate, or a valid
+                'column' and a 'condition'.
+
+        Returns:
+            Optional[Dict[str, Any]]: The first page of matches, or None if
+            the arguments are unusable and the caller should fall back.
+        """
+        if not isinstance(arguments, dict):
+            return None
+        if "filter" not in arguments and not (
+                isinstance(arguments.get("column"), str)
+                and isinstance(arguments.get("condition"), str)):
+            return None
+        try:
+            return self.get_page(self._predicate(arguments))
+        except FilterError as e:
+            logging.warning(f"Combined extraction returned an invalid filter: {e}")
+            return None
+
+    def get_filtred_data(self, action: str) -> Dict[str, Any]:
+        """
+        Filters the DataFrame based on parameters extracted from the LLM response.
+
+        Args:
+            action (str): The user-defined action/query for filtering the data.
+
+        Returns:
+            Dict[str, Any]: The first page of matches (see `get_page`).
+        """
+        params = self.get_filter_params(action=action)
+        return self._apply_filter(params=params)
+
+    async def aget_filtred_data(self, action: str) -> Dict[str, Any]:
+        """
+        Awaitable version of `get_filtred_data`.
+
+        Args:
+            action (str): The user-defined action/query for filtering the data.
+
+        Returns:
+            Dict[str, Any]: The first page of matches (see `get_page`).
+        """
+        params = await self.aget_filter_params(action=action)
+        return await asyncio.get_running_loop().run_in_executor(
+            self.cpu_executor, contextvars.copy_context().run, self._apply_filter, params)
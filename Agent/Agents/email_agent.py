@@ -1,9 +1,7 @@
 import logging
 from Constants.Agents.email_agent_constants import EMAIL_PROMPT_TEMPLATE
 from Mixins.llm_response_mixin import LLMResponseMixin
-from typing import Dict
-import re
-import json
+from typing import Any, AsyncIterator, Dict, Optional
 
 
 logging.basicConfig(level=logging.INFO)
@@ -16,16 +14,22 @@ class EmailAgent(LLMResponseMixin):
     Inherits from LLMResponseMixin to utilize LLM response generation.
     """
 
-    def _extract_json(self, response: str) -> Dict[str, str]:
-        match = re.search(r'\{.*\}', response, re.DOTALL)
+    generation_profile = "email"
 
-        if match:
-            json_str = match.group(0)
-            try:
-                extracted_json = json.loads(json_str)
-                return extracted_json
-            except json.JSONDecodeError as e:
-                raise
+    def email_from_arguments(self, arguments: Dict[str, Any]) -> Optional[Dict[str, str]]:
+        """
+        Returns an email already generated alongside the intent.
+        Returns:
+            Optional[Dict[str, str]]: Subject and body, or None if the
+            arguments are unusable and the caller should fall back.
+        """
+        if not isinstance(arguments, dict):
+            return None
+        subject = arguments.get("subject")
+        body = arguments.get("body")
+        if not subject or not body:
+            return None
+        return {"subject": subject, "body": body}
 
     def generate_email(self, action: str):
         """
@@ -46,3 +50,33 @@ class EmailAgent(LLMResponseMixin):
         except Exception as e:
             logger.exception(f"Unexpected error occurred: {e}")
             return "An unexpected error occurred while generating the email."
+
+    async def agenerate_email(self, action: str):
+        """
+        Awaitable version of `generate_email`.
+        Returns:
+            str: Generated sales email content.
+        """
+        try:
+            prompt = EMAIL_PROMPT_TEMPLATE.format(email_query=action)
+            response = await self.aget_llm_response(prompt=prompt)
+            extracted_json = self._extract_json(
+                response=response['llm_response'])
+            return extracted_json
+        except KeyError as e:
+            logger.error(f"KeyError encountered: {e}")
+            return "An error occurred while generating the email response."
+        except Exception as e:
+            logger.exception(f"Unexpected error occurred: {e}")
+            return "An unexpected error occurred while generating the email."
+
+    async def astream_email(self, action: str) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Streams the email draft as the model generates it.
+
+        Yields:
+            Dict[str, Any]: Token events from the LLM API followed by its `done` event.
+        """
+        prompt = EMAIL_PROMPT_TEMPLATE.format(email_query=action)
+        async for event in self.astream_llm_response(prompt=prompt):
+            yield event
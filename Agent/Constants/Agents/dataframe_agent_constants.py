@@ -2,26 +2,24 @@ DATAFRAME_AGENT_PROMPT_TEMPLATE = """
 <s>[INST]
 You are an AI assistant. Respond strictly in the following JSON format:
 ```json{{
-  "column": "<column name>",
-<<<<<<< HEAD
-  "condition": "<condition for boolean search>"
-}}```[/INST]
-[INST]
-Example : get the data where 'Company' is university, from the data
-```json{{
-  "column": "Company",
-  "condition": "university"
+  "filter": <predicate>
 }}```
-[/INST]
-[INST]
-Extract the column name and the condition from the Query below.
-
-Data filter : {data_query}
-[/INST]
-=======
-  "condition": "<single word condition for boolean search>"
-}}```[/INST]
-[INST]Extract the column name and the condition from the Query below.
+A predicate is either {{"column": "<column name>", "op": "<operator>", "value": <value>}}
+or {{"and": [<predicate>, ...]}} or {{"or": [<predicate>, ...]}}.
+Operators: "eq", "ne", "lt", "le", "gt", "ge", "between" (value [low, high]) and
+"in" (value is a list) on numeric columns; "eq", "ne", "in" and "contains" on text columns.
+Example: "leads from Mumbai with more than 5 visits" is
+{{"and": [{{"column": "City", "op": "eq", "value": "Mumbai"}}, {{"column": "TotalVisits", "op": "gt", "value": 5}}]}}
+Use only the columns below, with numbers as values for numeric columns.
+Numeric columns: {numeric_columns}
+Text columns: {text_columns}[/INST]
+[INST]Extract the filter from the Query below.
 Data filter Query : {data_query}[/INST]
->>>>>>> f6f648b (new commit)
 """
+
+# Upper bound on predicates (leaves and and/or nodes) in one filter.
+FILTER_MAX_PREDICATES = 16
+
+# Rows per page of search results, and the largest page a client may request.
+SEARCH_PAGE_SIZE = 50
+SEARCH_MAX_PAGE_SIZE = 1000
@@ -1,2 +1,57 @@
+import os
+
 REQ_PER_MIN = 100
-APP_NAME = "SDR Agent"
\ No newline at end of file
+APP_NAME = "SDR Agent"
+# Calling applications that get their own metric series; any other
+# `app_name` is counted as "other".
+KNOWN_APP_NAMES = [APP_NAME]
+
+# "two_call" detects the intent and lets the agent extract its arguments with
+# a second generation; "combined" extracts both in a single generation and
+# falls back to the agent's own call when the arguments are unusable.
+INTENT_EXTRACTION_MODE = os.getenv("INTENT_EXTRACTION_MODE", "two_call")
+
+# Memory cleanup runs every N requests or above the RSS limit (MB), not per request.
+MEMORY_CLEANUP_EVERY_N_REQUESTS = 500
+MEMORY_RSS_LIMIT_MB = 2048
+# Minimum seconds between two RSS-triggered cleanups.
+MEMORY_CLEANUP_MIN_INTERVAL_SECONDS = 60
+
+# Blocking agent work runs off the event loop: blocking I/O (sync LLM calls,
+# log appends) on the I/O pool, pandas filtering and paging on the CPU pool.
+AGENT_IO_WORKERS = int(os.getenv("AGENT_IO_WORKERS", "16"))
+AGENT_CPU_WORKERS = int(os.getenv("AGENT_CPU_WORKERS", str(os.cpu_count() or 1)))
+
+# Requests per intent allowed to run at once, so a burst of one intent cannot
+# starve the others. Further requests wait up to INTENT_QUEUE_TIMEOUT_SECONDS
+# and are then rejected with 503.
+INTENT_CONCURRENCY_LIMITS = {
+    "detect_intent": 16,
+    "write_email": 4,
+    "search_dataframe": 16,
+}
+INTENT_QUEUE_TIMEOUT_SECONDS = 30
+INTENT_RETRY_AFTER_SECONDS = 5
+
+# Prompt prefixes are registered with the model server in the background,
+# retrying with exponential backoff until the server answers.
+PREFIX_REGISTRATION_RETRY_SECONDS = 2
+PREFIX_REGISTRATION_MAX_RETRY_SECONDS = 60
+
+# Responses at least this large (bytes) are gzip-compressed for clients that accept it.
+GZIP_MIN_BYTES = 1024
+GZIP_LEVEL = 5
+
+# Tracing: spans of each request are linked to the other service through the
+# W3C `traceparent` header. New traces are sampled at TRACE_SAMPLE_RATE, traces
+# taking at least TRACE_SLOW_SECONDS are always kept. TRACE_EXPORTER is
+# "jsonl" (TRACE_JSONL_PATH), "otlp" (an OTLP/HTTP collector) or "none".
+TRACE_SERVICE_NAME = "sdr-agent"
+TRACE_SAMPLE_RATE = float(os.getenv("TRACE_SAMPLE_RATE", "0.01"))
+TRACE_SLOW_SECONDS = float(os.getenv("TRACE_SLOW_SECONDS", "10"))
+TRACE_EXPORTER = os.getenv("TRACE_EXPORTER", "jsonl")
+TRACE_JSONL_PATH = os.getenv("TRACE_JSONL_PATH", "./Logs/agent_traces.jsonl")
+TRACE_OTLP_ENDPOINT = os.getenv("TRACE_OTLP_ENDPOINT", "http://localhost:4318/v1/traces")
+TRACE_EXPORT_BATCH_SIZE = 256
+TRACE_EXPORT_INTERVAL_SECONDS = 2.0
+TRACE_QUEUE_MAX_SPANS = 10_000
@@ -0,0 +1,15 @@
+QUERY_CACHE_ENABLED = True
+QUERY_CACHE_MAX_BYTES = 128 * 1024 * 1024
+
+# Seconds an answer stays valid per intent; 0 disables caching for it.
+QUERY_CACHE_TTL_BY_INTENT = {
+    "search_dataframe": 3600,
+    "write_email": 600,
+}
+QUERY_CACHE_DEFAULT_TTL = 0
+
+# Most recently used entries listed by the cache stats endpoint.
+QUERY_CACHE_STATS_MAX_KEYS = 100
+
+# Answers for these intents are dropped when the filtered dataset changes.
+DATASET_DEPENDENT_INTENTS = {"search_dataframe"}
@@ -0,0 +1,37 @@
+FILTERED_DATA_PATH = "./DataFiles/filtered.csv"
+
+# Columnar copy of the filtered leads (uncompressed Arrow IPC, memory-mappable).
+# The CSV above stays as the fallback when pyarrow or this file is missing.
+FILTERED_ARROW_PATH = "./DataFiles/filtered.arrow"
+
+# Per-source row hashes of the processed Lead Numbers and the dataset version,
+# used by the incremental refresh.
+FILTERED_STATE_PATH = "./DataFiles/filtered_state.npz"
+
+# Bump when the columns or dtypes below change; older Arrow files are ignored.
+FILTERED_DATA_SCHEMA_VERSION = 1
+
+# Explicit dtypes of the filtered leads. Columns not listed are strings.
+FILTERED_DATA_DTYPES = {
+    "Lead Number": "int64",
+    "Converted": "Int64",
+    "TotalVisits": "float64",
+    "Total Time Spent on Website": "Int64",
+    "Page Views Per Visit": "float64",
+    "Asymmetrique Activity Score": "float64",
+    "Asymmetrique Profile Score": "float64",
+}
+
+# Low-cardinality columns stored dictionary-encoded (pandas category).
+DICTIONARY_COLUMNS = ["Lead Origin", "Lead Source", "City"]
+
+# Build the filtered leads with the chunked, filter-pushdown path instead of
+# loading both files into DataProcessor.
+PREPARE_IN_CHUNKS = True
+PREPARE_CHUNK_SIZE = 200_000
+# Columns kept in the filtered leads; None keeps every column, since the
+# DataFrame agent can filter on any of them.
+FILTERED_COLUMNS = None
+
+# Seconds between two background checks of the snapshot file for changes.
+SNAPSHOT_CHECK_INTERVAL = 5.0
@@ -0,0 +1,19 @@
+INTENT_FAST_PATH_ENABLED = True
+
+# Classifier answers are used only at or above this confidence. Kept high
+# until an evaluation on held-out logged queries supports a lower value.
+INTENT_CONFIDENCE_THRESHOLD = 0.9
+
+INTENT_MODEL_PATH = "./DataFiles/intent_classifier.json"
+INTENT_SEED_QUERIES_PATH = "./DataFiles/intent_seed_queries.jsonl"
+# Queries resolved by the LLM are appended here as training data.
+INTENT_QUERY_LOG_PATH = "./DataFiles/intent_query_log.jsonl"
+# Distinct logged queries needed before held-out accuracy is reported.
+INTENT_MIN_EVAL_QUERIES = 50
+
+INTENT_KEYWORD_RULES = {
+    "write_email": r"\b(write|draft|compose|send|prepare)\b.*\b(e-?mails?|mails?|message)\b",
+    "reply_email": r"\b(reply|respond)\b.*\b(e-?mails?|mails?|message)\b",
+    "delete_email": r"\b(delete|remove|trash)\b.*\b(e-?mails?|mails?|message)\b",
+    "search_dataframe": r"\b(search|find|show|list|get|filter|fetch|look ?up)\b.*\b(leads?|compan(y|ies)|data|rows?|records?|city|cities|source)\b",
+}
@@ -43,3 +43,35 @@ User Input: "{query}"
 [/INST]
 
 """
+
+
+COMBINED_INTENT_PROMPT_TEMPLATE = """
+[INST]<s>
+You are an AI assistant. Respond strictly in the following JSON format:
+
+```json{{
+  "intent": "<intent>",
+  "action": "<short description>",
+  "arguments": {{<arguments for the intent>}}
+}}```
+
+Please fill in the placeholders with relevant, realistic information. Do not add any extra text or explanation outside the JSON format.
+[/INST]
+[INST]
+Provide Intent of the user input only from the given intent_list, with its arguments:
+Intent List : ["write_email" : User wants to send an email,
+                arguments: {{"subject": "<email subject>", "body": "<email body>"}}
+                Compose the Email as "Harshit" a 'Sales Development Representative' from 'Pawsitivity'.,
+            "search_dataframe" : User wants to search entity in a dataframe,
+                arguments: {{"filter": {{"column": "<column name>", "op": "<eq|ne|lt|le|gt|ge|between|in|contains>", "value": <value>}}}},
+                combine several predicates with {{"and": [...]}} or {{"or": [...]}},
+            "reply_email" : User wants to reply to an email,
+                arguments: {{}},
+            "delete_email" : User wants to delete an email,
+                arguments: {{}}]
+[/INST]
+[INST]
+User Input: "{query}"
+[/INST]
+
+"""
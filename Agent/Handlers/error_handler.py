@@ -78,6 +78,15 @@ class ErrorHandlers:
         response_content = {"error": "Invalid attribute access"}
         return JSONResponse(content=response_content, status_code=400)
 
+    def handle_queue_full_error(self, error_message: str, retry_after: int) -> JSONResponse:
+        logger.warning(f"Service overloaded: {error_message}")
+        response_content = {"error": "Server is busy, please retry later"}
+        return JSONResponse(
+            content=response_content,
+            status_code=503,
+            headers={"Retry-After": str(retry_after)},
+        )
+
     def handle_unexpected_error(
         self, error_message: str, status_code: int
     ) -> JSONResponse:
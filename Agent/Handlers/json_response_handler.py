@@ -1,30 +1,100 @@
-from fastapi.responses import JSONResponse
-from typing import Dict, Any
+from fastapi import Request
+from fastapi.responses import Response
+from typing import Dict, Any, Optional
+import gzip
+import json
 import logging
 
+import pandas as pd
+
+from Constants.api_constants import GZIP_MIN_BYTES, GZIP_LEVEL
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
 )
 
+ARROW_STREAM_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Serializes `content` to JSON bytes in a single pass, with orjson when it
+    is installed and the stdlib otherwise. Values neither can encode (e.g.
+    Timestamps) are written as `str`, with both.
+    """
+    if orjson is not None:
+        return orjson.dumps(content, default=str, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(content, separators=(",", ":"), default=str).encode("utf-8")
+
+
+def accepts_arrow(request: Optional[Request]) -> bool:
+    return request is not None and ARROW_STREAM_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+def accepts_gzip(accept_encoding: str) -> bool:
+    """
+    Whether an `Accept-Encoding` header value allows gzip. A q-value of 0
+    refuses a coding (`gzip;q=0`); `*` covers gzip when it is not listed.
+    """
+    wildcard = False
+    for coding in accept_encoding.split(","):
+        name, _, parameters = coding.partition(";")
+        quality = 1.0
+        for parameter in parameters.split(";"):
+            key, _, value = parameter.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        name = name.strip().lower()
+        if name == "gzip":
+            return quality > 0
+        if name == "*":
+            wildcard = quality > 0
+    return wildcard
+
 
 class JSONResponseHandler:
     """
     A class to handle the creation of JSON responses.
 
+    Bodies are serialized once with orjson (stdlib json as fallback) and
+    gzip-compressed when they exceed `GZIP_MIN_BYTES` and the client's
+    `Accept-Encoding` allows gzip.
+
     Methods:
-        get_200_response(response_dict: Dict[str, Any]) -> JSONResponse:
+        get_200_response(response_dict: Dict[str, Any], request: Optional[Request]) -> Response:
             Returns a JSON response with the given content.
+        get_arrow_response(dataframe: pd.DataFrame, metadata: Dict[str, Any], request: Optional[Request]) -> Response:
+            Returns a DataFrame as an Arrow IPC stream.
     """
 
-    def get_200_response(self, response_dict: Dict[str, Any]) -> JSONResponse:
+    @staticmethod
+    def _compressed(body: bytes, request: Optional[Request], media_type: str) -> Response:
+        headers = {"Vary": "Accept-Encoding"}
+        if request is not None and len(body) >= GZIP_MIN_BYTES \
+                and accepts_gzip(request.headers.get("accept-encoding", "")):
+            body = gzip.compress(body, compresslevel=GZIP_LEVEL)
+            headers["Content-Encoding"] = "gzip"
+        return Response(content=body, status_code=200, media_type=media_type, headers=headers)
+
+    def get_200_response(self, response_dict: Dict[str, Any],
+                         request: Optional[Request] = None) -> Response:
         """
         Creates a JSON response with a 200 OK status.
 
         Args:
             response_dict (Dict[str, Any]): The dictionary containing the response data.
+            request (Optional[Request]): The incoming request, used to decide on gzip.
 
         Returns:
-            JSONResponse: A FastAPI JSON response object with status code 200.
+            Response: A FastAPI response object with status code 200.
 
         Raises:
             ValueError: If the response_dict is not a dictionary.
@@ -35,7 +105,7 @@ class JSONResponseHandler:
                 raise ValueError("response_dict must be of type Dict[str, Any].")
 
             logging.info("Creating a 200 OK JSON response.")
-            return JSONResponse(content=response_dict, status_code=200)
+            return self._compressed(dumps(response_dict), request, "application/json")
 
         except ValueError as ve:
             logging.error("ValueError encountered: %s", ve)
@@ -45,3 +115,23 @@ class JSONResponseHandler:
                 "An unexpected error occurred while creating JSON response."
             )
             raise
+
+    def get_arrow_response(self, dataframe: pd.DataFrame, metadata: Dict[str, Any],
+                           request: Optional[Request] = None) -> Response:
+        """
+        Creates a 200 OK response carrying a DataFrame as an Arrow IPC stream.
+        `metadata` is stored JSON-encoded in the schema metadata.
+
+        Raises:
+            ImportError: If pyarrow is not installed.
+        """
+        import pyarrow as pa
+
+        table = pa.Table.from_pandas(dataframe, preserve_index=False)
+        table = table.replace_schema_metadata(
+            {**(table.schema.metadata or {}), b"response": dumps(metadata)})
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        logging.info("Creating a 200 OK Arrow response.")
+        return self._compressed(sink.getvalue().to_pybytes(), request, ARROW_STREAM_MEDIA_TYPE)
@@ -1,7 +1,25 @@
+import json
 import logging
-from Mixins.mixin_constants import LLM_API_URL, LLM_USER, LLM_PASS
+import time
+from Mixins.mixin_constants import (
+    LLM_API_URL,
+    LLM_STREAM_API_URL,
+    LLM_PREFIX_API_URL,
+    LLM_USER,
+    LLM_PASS,
+    LLM_REQUEST_TIMEOUT,
+    LLM_MAX_CONNECTIONS,
+    LLM_MAX_KEEPALIVE_CONNECTIONS,
+    LLM_KEEPALIVE_EXPIRY,
+    LLM_UDS_PATH,
+    LLM_STOP_AT_JSON,
+    GENERATION_PROFILES,
+)
+from Utilities.agent_metrics import STAGE_SECONDS, request_labels
+from Utilities.json_tracker import extract_json
+from Utilities.tracing import tracer
 import httpx
-from typing import Any
+from typing import Any, AsyncIterator, Dict, Optional
 
 logging.basicConfig(
     level=logging.INFO,
@@ -9,12 +27,111 @@ logging.basicConfig(
 )
 
 
+_async_client: Optional[httpx.AsyncClient] = None
+_sync_client: Optional[httpx.Client] = None
+
+
+def _client_kwargs() -> Dict[str, Any]:
+    """
+    Builds the shared keyword arguments for the pooled LLM API clients.
+
+    Returns:
+        Dict[str, Any]: Auth, timeout and connection pool limits.
+    """
+    return {
+        "auth": (LLM_USER, LLM_PASS),
+        "timeout": LLM_REQUEST_TIMEOUT,
+        "limits": httpx.Limits(
+            max_connections=LLM_MAX_CONNECTIONS,
+            max_keepalive_connections=LLM_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=LLM_KEEPALIVE_EXPIRY,
+        ),
+    }
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """
+    Returns the process-wide async client, creating it on first use.
+
+    Returns:
+        httpx.AsyncClient: A keep-alive client shared by every agent.
+    """
+    global _async_client
+    if _async_client is None or _async_client.is_closed:
+        kwargs = _client_kwargs()
+        if LLM_UDS_PATH:
+            kwargs["transport"] = httpx.AsyncHTTPTransport(
+                uds=LLM_UDS_PATH, limits=kwargs["limits"])
+        _async_client = httpx.AsyncClient(**kwargs)
+        logging.info("Created shared async LLM API client.")
+    return _async_client
+
+
+def get_sync_client() -> httpx.Client:
+    """
+    Returns the process-wide blocking client, creating it on first use.
+
+    Returns:
+        httpx.Client: A keep-alive client shared by every agent.
+    """
+    global _sync_client
+    if _sync_client is None or _sync_client.is_closed:
+        kwargs = _client_kwargs()
+        if LLM_UDS_PATH:
+            kwargs["transport"] = httpx.HTTPTransport(
+                uds=LLM_UDS_PATH, limits=kwargs["limits"])
+        _sync_client = httpx.Client(**kwargs)
+        logging.info("Created shared LLM API client.")
+    return _sync_client
+
+
+async def close_clients() -> None:
+    """
+    Closes the shared clients. Intended for application shutdown.
+    """
+    global _async_client, _sync_client
+    if _async_client is not None:
+        await _async_client.aclose()
+        _async_client = None
+    if _sync_client is not None:
+        _sync_client.close()
+        _sync_client = None
+
+
 class LLMResponseMixin:
     """
     A mixin class to handle interactions with the LLM API using HTTPX client.
 
+    All instances share one pooled client per flavour (blocking and async), so
+    connections to the model server are kept alive across requests.
+
+    Subclasses set `generation_profile` to one of `GENERATION_PROFILES`; its
+    generation parameters are sent with every request.
     """
 
+    generation_profile = "default"
+
+    def _build_llm_payload(self, prompt: str) -> Dict[str, Any]:
+        return {"prompt": prompt, "app_name": "Sales_Agent",
+                "stop_at_json": LLM_STOP_AT_JSON,
+                "profile": self.generation_profile,
+                "generation": GENERATION_PROFILES[self.generation_profile]}
+
+    def _extract_json(self, response: str) -> Optional[Dict[str, Any]]:
+        """
+        Extracts the first balanced JSON object from an LLM response.
+
+        Args:
+            response (str): The LLM output potentially containing a JSON object.
+
+        Returns:
+            Optional[Dict[str, Any]]: The decoded object, or None if there is none.
+
+        Raises:
+            json.JSONDecodeError: If no balanced object decodes.
+        """
+        return extract_json(response)
+
     def get_llm_response(self, prompt: str) -> Any:
         """
         Sends a request to the LLM API and retrieves the response.
@@ -32,12 +149,53 @@ class LLMResponseMixin:
         logging.info("Attempting to fetch LLM response for the given prompt.")
 
         try:
-            with httpx.Client(auth=(LLM_USER, LLM_PASS), timeout=6000) as client:
-                response = client.post(url=LLM_API_URL,
-                                       json={"prompt": prompt, "app_name": "Sales_Agent"})
-                response.raise_for_status()
-                logging.info("Successfully fetched response from LLM API.")
-                return response.json()
+            with STAGE_SECONDS.time(stage="llm_call", **request_labels()), \
+                    tracer.span("llm_call", kind="client", profile=self.generation_profile):
+                response = get_sync_client().post(
+                    url=LLM_API_URL, json=self._build_llm_payload(prompt),
+                    headers=tracer.inject())
+            response.raise_for_status()
+            logging.info("Successfully fetched response from LLM API.")
+            return response.json()
+
+        except httpx.HTTPStatusError as http_err:
+            logging.error(
+                f"HTTP error occurred: {http_err.response.status_code} - {http_err.response.text}")
+            raise
+
+        except httpx.RequestError as req_err:
+            logging.error(f"Request error occurred: {req_err}")
+            raise
+
+        except Exception as e:
+            logging.exception(f"An unexpected error occurred: {e}")
+            raise
+
+    async def aget_llm_response(self, prompt: str) -> Any:
+        """
+        Awaitable version of `get_llm_response` using the shared async client.
+
+        Args:
+            prompt (str): The input prompt for the LLM API.
+
+        Returns:
+            Any: The response from the LLM API if successful.
+
+        Raises:
+            httpx.HTTPStatusError: If the server returns an error response.
+            httpx.RequestError: If there is a network issue during the request.
+        """
+        logging.info("Attempting to fetch LLM response for the given prompt.")
+
+        try:
+            with STAGE_SECONDS.time(stage="llm_call", **request_labels()), \
+                    tracer.span("llm_call", kind="client", profile=self.generation_profile):
+                response = await get_async_client().post(
+                    url=LLM_API_URL, json=self._build_llm_payload(prompt),
+                    headers=tracer.inject())
+            response.raise_for_status()
+            logging.info("Successfully fetched response from LLM API.")
+            return response.json()
 
         except httpx.HTTPStatusError as http_err:
             logging.error(
@@ -51,3 +209,89 @@ class LLMResponseMixin:
         except Exception as e:
             logging.exception(f"An unexpected error occurred: {e}")
             raise
+
+    async def aregister_prompt_prefix(self, prefix: str) -> bool:
+        """
+        Asks the LLM API to precompute the model state for a fixed prompt prefix.
+
+        Args:
+            prefix (str): The fixed start shared by every prompt of a template.
+
+        Returns:
+            bool: True if the model server keeps state for the prefix.
+
+        Raises:
+            httpx.RequestError: If the model server cannot be reached.
+            httpx.HTTPStatusError: If the model server fails with a 5xx status.
+        """
+        try:
+            response = await get_async_client().post(
+                url=LLM_PREFIX_API_URL, json={"prefix": prefix})
+            response.raise_for_status()
+            return bool(response.json().get("registered"))
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code >= 500:
+                raise
+            logging.warning(f"Could not register prompt prefix: {e}")
+            return False
+
+    async def astream_llm_response(self, prompt: str) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Streams a response from the LLM API's NDJSON endpoint.
+
+        Args:
+            prompt (str): The input prompt for the LLM API.
+
+        Yields:
+            Dict[str, Any]: `token` events as they arrive, then the final
+            `done` event, extended with `client_time_to_first_token`.
+
+        Raises:
+            httpx.HTTPStatusError: If the server returns an error response.
+            httpx.RequestError: If there is a network issue during the request.
+            RuntimeError: If the server reports an error mid-stream.
+        """
+        logging.info("Attempting to stream LLM response for the given prompt.")
+        start_time = time.perf_counter()
+        time_to_first_token = None
+
+        try:
+            with tracer.span("llm_call", kind="client", profile=self.generation_profile,
+                             stream=True) as span:
+                async with get_async_client().stream(
+                        "POST", url=LLM_STREAM_API_URL,
+                        json=self._build_llm_payload(prompt),
+                        headers=tracer.inject()) as response:
+                    response.raise_for_status()
+                    async for line in response.aiter_lines():
+                        if not line:
+                            continue
+                        event = json.loads(line)
+                        if event.get("event") == "error":
+                            raise RuntimeError(event.get("error"))
+                        if event.get("event") == "token" and time_to_first_token is None:
+                            time_to_first_token = time.perf_counter() - start_time
+                            logging.info(
+                                f"First token received after {time_to_first_token:.3f} seconds.")
+                        if event.get("event") == "done":
+                            event["client_time_to_first_token"] = round(
+                                time_to_first_token or 0.0, 3)
+                            span.set_attributes(
+                                time_to_first_token=event["client_time_to_first_token"])
+                        yield event
+            STAGE_SECONDS.observe(time.perf_counter() - start_time,
+                                  stage="llm_call", **request_labels())
+            logging.info("Successfully streamed response from LLM API.")
+
+        except httpx.HTTPStatusError as http_err:
+            logging.error(
+                f"HTTP error occurred: {http_err.response.status_code}")
+            raise
+
+        except httpx.RequestError as req_err:
+            logging.error(f"Request error occurred: {req_err}")
+            raise
+
+        except Exception as e:
+            logging.exception(f"An unexpected error occurred: {e}")
+            raise
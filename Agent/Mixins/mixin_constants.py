@@ -1,4 +1,30 @@
 LLM_API_URL = "http://127.0.01:8300/model_s/inference/get-response"
+LLM_STREAM_API_URL = "http://127.0.01:8300/model_s/inference/stream-response"
+LLM_PREFIX_API_URL = "http://127.0.01:8300/model_s/prefixes/register"
 
 LLM_USER = "model1api"
 LLM_PASS = "model@111"
+
+LLM_REQUEST_TIMEOUT = 6000
+LLM_MAX_CONNECTIONS = 100
+LLM_MAX_KEEPALIVE_CONNECTIONS = 20
+LLM_KEEPALIVE_EXPIRY = 60.0
+
+# Every agent prompt asks for a single JSON object, so the model server is
+# asked to stop generating as soon as that object closes.
+LLM_STOP_AT_JSON = True
+
+# Named generation profiles sent with every request. Each agent declares the
+# profile it uses; the model server applies the overrides per request and
+# reports tokens and latency per profile. Unset keys keep the server defaults.
+GENERATION_PROFILES = {
+    "default": {},
+    "intent": {"max_new_tokens": 96, "stop": ["[INST]"]},
+    "intent_combined": {"max_new_tokens": 512, "stop": ["[INST]"]},
+    "dataframe_filter": {"max_new_tokens": 256, "stop": ["[INST]"]},
+    "email": {"max_new_tokens": 512, "stop": ["[INST]"]},
+}
+
+# Set to the model server's Unix domain socket path when both services share
+# a host, e.g. "/tmp/model_api.sock". None keeps plain TCP.
+LLM_UDS_PATH = None
@@ -0,0 +1,134 @@
+import asyncio
+import contextlib
+import contextvars
+import functools
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, Optional
+
+from Constants.api_constants import (
+    AGENT_IO_WORKERS,
+    AGENT_CPU_WORKERS,
+    INTENT_CONCURRENCY_LIMITS,
+    INTENT_QUEUE_TIMEOUT_SECONDS,
+    INTENT_RETRY_AFTER_SECONDS,
+)
+
+logging.basicConfig(level=logging.INFO,
+                    format='%(asctime)s - %(levelname)s - %(message)s')
+
+
+class IntentBusyError(Exception):
+    """
+    Raised when an intent has been at its concurrency limit for longer than
+    the queue timeout.
+    """
+
+    def __init__(self, intent: str, retry_after: int):
+        super().__init__(f"Too many concurrent '{intent}' requests.")
+        self.intent = intent
+        self.retry_after = retry_after
+
+
+class AgentExecutors:
+    """
+    Executors for the blocking parts of agent work and per-intent
+    concurrency limits for the Agent API.
+
+    Blocking I/O (synchronous LLM calls, log appends) runs on an I/O thread
+    pool and pandas filtering and paging on a separate CPU pool, so neither
+    stalls the event loop nor competes with the other for workers. Each
+    intent has its own semaphore: a burst of `write_email` requests fills
+    the email slots while `search_dataframe` lookups keep running.
+    """
+
+    def __init__(self, io_workers: int = AGENT_IO_WORKERS,
+                 cpu_workers: int = AGENT_CPU_WORKERS,
+                 limits: Optional[Dict[str, int]] = None,
+                 queue_timeout: float = INTENT_QUEUE_TIMEOUT_SECONDS,
+                 retry_after: int = INTENT_RETRY_AFTER_SECONDS):
+        """
+        Args:
+            io_workers (int): Threads for blocking I/O.
+            cpu_workers (int): Threads for DataFrame work.
+            limits (Optional[Dict[str, int]]): Concurrent requests per intent.
+                Defaults to `INTENT_CONCURRENCY_LIMITS`; unlisted intents are unlimited.
+            queue_timeout (float): Seconds a request waits for a slot.
+            retry_after (int): Seconds suggested to clients that were turned away.
+        """
+        self.io_workers = io_workers
+        self.cpu_workers = cpu_workers
+        self.io_pool = ThreadPoolExecutor(max_workers=io_workers, thread_name_prefix="agent-io")
+        self.cpu_pool = ThreadPoolExecutor(max_workers=cpu_workers, thread_name_prefix="agent-cpu")
+        self.limits = dict(INTENT_CONCURRENCY_LIMITS if limits is None else limits)
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self._semaphores = {intent: asyncio.Semaphore(limit)
+                            for intent, limit in self.limits.items()}
+        self._counters: Dict[str, Dict[str, int]] = {
+            intent: {"in_flight": 0, "waiting": 0, "peak_in_flight": 0,
+                     "completed": 0, "rejected": 0}
+            for intent in self.limits}
+
+    async def _run(self, pool: ThreadPoolExecutor, fn: Callable, *args: Any, **kwargs: Any) -> Any:
+        # Runs in a copy of the caller's context, so request labels of the
+        # metrics carry over to the worker thread.
+        return await asyncio.get_running_loop().run_in_executor(
+            pool, functools.partial(contextvars.copy_context().run, fn, *args, **kwargs))
+
+    async def run_io(self, fn: Callable, *args: Any, **kwargs: Any) -> Any:
+        """
+        Runs a blocking I/O call on the I/O pool.
+        """
+        return await self._run(self.io_pool, fn, *args, **kwargs)
+
+    async def run_cpu(self, fn: Callable, *args: Any, **kwargs: Any) -> Any:
+        """
+        Runs CPU-bound DataFrame work on the CPU pool.
+        """
+        return await self._run(self.cpu_pool, fn, *args, **kwargs)
+
+    @contextlib.asynccontextmanager
+    async def limit(self, intent: Optional[str]) -> AsyncIterator[None]:
+        """
+        Holds one of the intent's concurrency slots for the duration of the block.
+
+        Raises:
+            IntentBusyError: If no slot frees up within the queue timeout.
+        """
+        semaphore = self._semaphores.get(intent)
+        if semaphore is None:
+            yield
+            return
+
+        counters = self._counters[intent]
+        counters["waiting"] += 1
+        try:
+            await asyncio.wait_for(semaphore.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            counters["rejected"] += 1
+            logging.warning(f"Rejecting '{intent}' request, concurrency limit reached.")
+            raise IntentBusyError(intent, self.retry_after)
+        finally:
+            counters["waiting"] -= 1
+
+        counters["in_flight"] += 1
+        counters["peak_in_flight"] = max(counters["peak_in_flight"], counters["in_flight"])
+        try:
+            yield
+        finally:
+            counters["in_flight"] -= 1
+            counters["completed"] += 1
+            semaphore.release()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "io_workers": self.io_workers,
+            "cpu_workers": self.cpu_workers,
+            "intents": {intent: {"limit": self.limits[intent], **counters}
+                        for intent, counters in self._counters.items()},
+        }
+
+    def shutdown(self) -> None:
+        self.io_pool.shutdown(wait=False)
+        self.cpu_pool.shutdown(wait=False)
@@ -0,0 +1,84 @@
+import contextvars
+from typing import Any, Dict, Optional
+
+from Constants.api_constants import APP_NAME, INTENT_CONCURRENCY_LIMITS, KNOWN_APP_NAMES
+from Utilities.metrics import MetricsRegistry
+
+# Metrics of the Agent API, exposed on /metrics. Stages are
+# intent_detection, llm_call, dataframe_filter, serialization and total.
+REGISTRY = MetricsRegistry()
+
+STAGE_SECONDS = REGISTRY.histogram(
+    "agent_stage_seconds", "Latency of a request stage in seconds.",
+    ("stage", "intent", "app_name"))
+REQUESTS = REGISTRY.counter(
+    "agent_requests_total", "Agent requests by response status.",
+    ("endpoint", "intent", "app_name", "status"))
+CACHE_HITS = REGISTRY.counter(
+    "agent_query_cache_hits_total", "Queries answered from the query cache.",
+    ("endpoint", "intent", "app_name"))
+RATE_LIMITED = REGISTRY.counter(
+    "agent_rate_limited_total", "Requests rejected by the rate limiter.", ("endpoint",))
+IN_FLIGHT_REQUESTS = REGISTRY.gauge(
+    "agent_in_flight_requests", "Agent requests being handled.", ("endpoint",))
+INTENT_IN_FLIGHT = REGISTRY.gauge(
+    "agent_intent_in_flight", "Requests holding a concurrency slot of the intent.",
+    ("intent",))
+INTENT_QUEUE_DEPTH = REGISTRY.gauge(
+    "agent_intent_queue_depth", "Requests waiting for a concurrency slot of the intent.",
+    ("intent",))
+
+# Labels of the request being handled, so code below the handlers (LLM
+# calls, filtering on the executors) can label its samples.
+_request_labels: contextvars.ContextVar[Optional[Dict[str, str]]] = \
+    contextvars.ContextVar("agent_request_labels", default=None)
+
+
+def intent_label(intent: Any) -> str:
+    """
+    The intent as a label value. Anything the LLM invents is "unknown",
+    which keeps the number of series bounded.
+    """
+    return intent if isinstance(intent, str) and intent in INTENT_CONCURRENCY_LIMITS \
+        else "unknown"
+
+
+def app_label(app_name: Any) -> str:
+    """
+    The calling application as a label value, "other" unless it is one of
+    `KNOWN_APP_NAMES`.
+    """
+    return app_name if isinstance(app_name, str) and app_name in KNOWN_APP_NAMES \
+        else "other"
+
+
+def set_request_labels(intent: Any, app_name: str) -> None:
+    _request_labels.set({"intent": intent_label(intent), "app_name": app_label(app_name)})
+
+
+def request_labels() -> Dict[str, str]:
+    return _request_labels.get() or {"intent": "unknown", "app_name": APP_NAME}
+
+
+def record_request(endpoint: str, status: int, stages: Optional[Dict[str, float]] = None,
+                   cache_hit: bool = False) -> None:
+    """
+    Records a finished request under the current request labels: its status,
+    the latency of each stage in `stages` (seconds by stage name) and
+    whether it was a query cache hit.
+    """
+    labels = request_labels()
+    REQUESTS.inc(endpoint=endpoint, status=status, **labels)
+    for stage, seconds in (stages or {}).items():
+        STAGE_SECONDS.observe(seconds, stage=stage, **labels)
+    if cache_hit:
+        CACHE_HITS.inc(endpoint=endpoint, **labels)
+
+
+def update_executor_gauges(executor_stats: Dict[str, Any]) -> None:
+    """
+    Sets the per-intent gauges from `AgentExecutors.stats()`, at scrape time.
+    """
+    for intent, counters in executor_stats["intents"].items():
+        INTENT_IN_FLIGHT.set(counters["in_flight"], intent=intent)
+        INTENT_QUEUE_DEPTH.set(counters["waiting"], intent=intent)
@@ -0,0 +1,57 @@
+import logging
+from concurrent.futures import Executor
+from typing import Callable, Dict, Optional
+
+from Agents.dataframe_agent import DataFrameAgent
+from Agents.email_agent import EmailAgent
+from Utilities.dataframe_snapshot import DataFrameSnapshot
+
+logging.basicConfig(level=logging.INFO,
+                    format='%(asctime)s - %(levelname)s - %(message)s')
+
+
+class AgentRegistry:
+    """
+    Builds every agent once and maps intents to their handlers.
+
+    The DataFrame agent shares a single `DataFrameSnapshot`, so the filtered
+    lead table is parsed once at startup and only again when the file changes.
+
+    Attributes:
+        snapshot (DataFrameSnapshot): Shared snapshot of the filtered leads.
+        email_agent (EmailAgent): Agent used for `write_email`.
+        dataframe_agent (DataFrameAgent): Agent used for `search_dataframe`.
+    """
+
+    def __init__(self, snapshot: Optional[DataFrameSnapshot] = None,
+                 cpu_executor: Optional[Executor] = None):
+        self.snapshot = snapshot or DataFrameSnapshot()
+        self.email_agent = EmailAgent()
+        self.dataframe_agent = DataFrameAgent(snapshot=self.snapshot, cpu_executor=cpu_executor)
+        logging.info("Agent registry initialized.")
+
+    @property
+    def snapshot_version(self) -> str:
+        return self.snapshot.version
+
+    def get_handlers(self) -> Dict[str, Callable]:
+        return {
+            "write_email": self.email_agent.generate_email,
+            "search_dataframe": self.dataframe_agent.get_filtred_data,
+        }
+
+    def get_argument_handlers(self) -> Dict[str, Callable]:
+        """
+        Handlers that act on arguments extracted together with the intent.
+        They return None when the arguments are unusable.
+        """
+        return {
+            "write_email": self.email_agent.email_from_arguments,
+            "search_dataframe": self.dataframe_agent.get_filtred_data_from_arguments,
+        }
+
+    def get_async_handlers(self) -> Dict[str, Callable]:
+        return {
+            "write_email": self.email_agent.agenerate_email,
+            "search_dataframe": self.dataframe_agent.aget_filtred_data,
+        }
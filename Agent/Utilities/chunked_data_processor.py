@@ -0,0 +1,166 @@
+import logging
+import os
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+import pandas as pd
+
+from Constants.data_constants import PREPARE_CHUNK_SIZE, FILTERED_COLUMNS, FILTERED_DATA_DTYPES
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s"
+)
+
+MERGE_COLUMN = "Lead Number"
+
+
+def source_schema(columns: Iterable[str]) -> Dict[str, str]:
+    """
+    Explicit dtypes for raw lead columns: numeric columns from
+    `FILTERED_DATA_DTYPES`, every other column as string. Reading with it
+    keeps the dtypes of a column identical in every chunk, whatever values
+    the chunk happens to contain.
+    """
+    return {column: FILTERED_DATA_DTYPES.get(column, "string") for column in columns}
+
+
+class ChunkedDataProcessor:
+    """
+    Streaming equivalent of `DataProcessor.get_filter_data` for lead files
+    that do not fit in memory.
+
+    Both files are read in chunks and filtered before joining (`Lead Origin
+    == 'Landing Page Submission'` on the leads, `Company` not empty on the
+    sample data), so the outer merge result is never materialized. The
+    filtered rows of the smaller file are kept in memory indexed by `Lead
+    Number`; the larger file is streamed against that hash index and the
+    joined rows are appended to the output CSV chunk by chunk. Peak memory is
+    the filtered smaller side plus one chunk.
+
+    Attributes:
+        df1_path (str): Path to the leads CSV file.
+        df2_path (str): Path to the sample data CSV file.
+        chunk_size (int): Rows read per chunk.
+        usecols (Dict[str, List[str]]): Columns read from each source.
+        dtypes (Dict[str, Dict[str, str]]): Explicit dtypes of each source.
+        output_columns (List[str]): Columns of the written CSV.
+    """
+
+    def __init__(self, df1_path: str, df2_path: str,
+                 chunk_size: int = PREPARE_CHUNK_SIZE,
+                 columns: Optional[List[str]] = FILTERED_COLUMNS):
+        """
+        Args:
+            df1_path (str): Path to the leads CSV file.
+            df2_path (str): Path to the sample data CSV file.
+            chunk_size (int): Rows read per chunk.
+            columns (Optional[List[str]]): Columns to keep. None keeps every column.
+        """
+        self.df1_path = df1_path
+        self.df2_path = df2_path
+        self.chunk_size = chunk_size
+        self.sources = {
+            "leads": {"path": df1_path, "encoding": None,
+                      "predicate": lambda chunk: chunk["Lead Origin"] == "Landing Page Submission"},
+            "sample": {"path": df2_path, "encoding": "ISO-8859-1",
+                       "predicate": lambda chunk: chunk["Company"].notna()},
+        }
+        self._project(columns)
+
+    def _project(self, columns: Optional[List[str]]) -> None:
+        """
+        Picks the columns read from each file. Like `DataProcessor`, columns
+        present in both files are taken from the leads file only.
+        """
+        leads_columns = list(pd.read_csv(self.df1_path, nrows=0).columns)
+        sample_columns = list(pd.read_csv(
+            self.df2_path, nrows=0, encoding="ISO-8859-1").columns)
+        if MERGE_COLUMN not in leads_columns or MERGE_COLUMN not in sample_columns:
+            raise KeyError(MERGE_COLUMN)
+        sample_columns = [c for c in sample_columns
+                          if c == MERGE_COLUMN or c not in leads_columns]
+
+        if columns is not None:
+            required = {MERGE_COLUMN, "Lead Origin", "Company"}
+            leads_columns = [c for c in leads_columns if c in columns or c in required]
+            sample_columns = [c for c in sample_columns if c in columns or c in required]
+
+        self.usecols = {"leads": leads_columns, "sample": sample_columns}
+        self.dtypes = {source: source_schema(columns)
+                       for source, columns in self.usecols.items()}
+        self.output_columns = leads_columns + [c for c in sample_columns if c != MERGE_COLUMN]
+
+    def read_chunks(self, source: str) -> Iterator[pd.DataFrame]:
+        """
+        Reads the projected columns of a source ("leads" or "sample") chunk
+        by chunk with its explicit dtypes.
+        """
+        config = self.sources[source]
+        return pd.read_csv(config["path"], encoding=config["encoding"],
+                           usecols=self.usecols[source], dtype=self.dtypes[source],
+                           chunksize=self.chunk_size)
+
+    def concat(self, source: str, chunks: Iterable[pd.DataFrame]) -> pd.DataFrame:
+        """
+        Concatenates chunks of a source. No chunks give an empty DataFrame
+        with the source's columns and dtypes.
+        """
+        chunks = list(chunks)
+        if not chunks:
+            return pd.DataFrame(columns=self.usecols[source]).astype(self.dtypes[source])
+        return pd.concat(chunks, ignore_index=True)
+
+    def read(self, source: str, lead_numbers: Optional[pd.Index] = None) -> pd.DataFrame:
+        """
+        Reads a source, keeping only the rows of `lead_numbers` if given.
+        Only the selected rows of each chunk are held in memory.
+        """
+        chunks = self.read_chunks(source)
+        if lead_numbers is not None:
+            chunks = (chunk[chunk[MERGE_COLUMN].isin(lead_numbers)] for chunk in chunks)
+        return self.concat(source, chunks)
+
+    def _filtered_chunks(self, source: str,
+                         on_chunk: Optional[Callable[[str, pd.DataFrame], None]]
+                         ) -> Iterator[pd.DataFrame]:
+        for chunk in self.read_chunks(source):
+            if on_chunk is not None:
+                on_chunk(source, chunk)
+            yield chunk[self.sources[source]["predicate"](chunk)]
+
+    def prepare(self, output_path: str,
+                on_chunk: Optional[Callable[[str, pd.DataFrame], None]] = None) -> int:
+        """
+        Writes the filtered, joined leads to `output_path` as CSV. The file is
+        written next to `output_path` and renamed when complete.
+
+        Args:
+            output_path (str): CSV file to write.
+            on_chunk (Optional[Callable]): Called with the source name
+                ("leads" or "sample") and every raw chunk before filtering.
+
+        Returns:
+            int: Number of rows written.
+        """
+        build_source, probe_source = ("leads", "sample")
+        if os.path.getsize(self.df2_path) < os.path.getsize(self.df1_path):
+            build_source, probe_source = ("sample", "leads")
+
+        build_side = self.concat(build_source, self._filtered_chunks(build_source, on_chunk))
+        build_side = build_side.set_index(MERGE_COLUMN)
+        logging.info(
+            f"Hash index on '{build_source}' holds {len(build_side)} filtered rows.")
+
+        temporary_path = f"{output_path}.tmp"
+        rows = 0
+        for chunk in self._filtered_chunks(probe_source, on_chunk):
+            joined = chunk.join(build_side, on=MERGE_COLUMN, how="inner")
+            joined[self.output_columns].to_csv(
+                temporary_path, mode="w" if rows == 0 else "a",
+                header=rows == 0, index=False)
+            rows += len(joined)
+        if rows == 0:
+            pd.DataFrame(columns=self.output_columns).to_csv(temporary_path, index=False)
+        os.replace(temporary_path, output_path)
+        logging.info(f"Filtered data contains {rows} leads.")
+        return rows
@@ -1,3 +1,5 @@
+import os
+
 import pandas as pd
 import logging
 
@@ -40,6 +42,24 @@ class DataProcessor:
             logging.error(f"Unexpected error during initialization: {e}")
             raise
 
+    @classmethod
+    def from_dataframes(cls, df1: pd.DataFrame, df2: pd.DataFrame) -> "DataProcessor":
+        """
+        Creates a DataProcessor over already loaded DataFrames, e.g. a subset
+        of leads during an incremental refresh.
+
+        Args:
+            df1 (pd.DataFrame): Leads DataFrame.
+            df2 (pd.DataFrame): Sample data DataFrame.
+
+        Returns:
+            DataProcessor: A processor that does not read any file.
+        """
+        data_processor = cls.__new__(cls)
+        data_processor.df1 = df1
+        data_processor.df2 = df2
+        return data_processor
+
     def _merge_dataframes(self, merge_on_column: str) -> pd.DataFrame:
         """
         Merges two DataFrames on a specified column, avoiding duplication on common columns.
@@ -95,7 +115,8 @@ class DataProcessor:
 
     def save_filtered_dataframe(self, filtered_dataframe: pd.DataFrame, path: str, index: bool = False) -> str:
         """
-        Saves a DataFrame to a CSV file.
+        Saves a DataFrame to a CSV file. The file is written next to `path`
+        and renamed, so readers never see a partial file.
 
         Args:
             filtered_dataframe (pd.DataFrame): The DataFrame to save.
@@ -106,7 +127,9 @@ class DataProcessor:
             None
         """
         try:
-            filtered_dataframe.to_csv(path, index=index)
+            temporary_path = f"{path}.tmp"
+            filtered_dataframe.to_csv(temporary_path, index=index)
+            os.replace(temporary_path, path)
             print(f"DataFrame successfully saved to {path}")
         except Exception as e:
             print(f"Failed to save DataFrame: {e}")
@@ -0,0 +1,177 @@
+import hashlib
+import logging
+import os
+import threading
+from dataclasses import dataclass, replace
+from typing import Optional
+
+import pandas as pd
+
+from Constants.data_constants import (
+    FILTERED_DATA_PATH,
+    FILTERED_ARROW_PATH,
+    SNAPSHOT_CHECK_INTERVAL,
+)
+from Utilities.filter_engine import FilterEngine
+from Utilities.filtered_dataset import is_arrow_available, read_arrow, read_csv
+from Utilities.substring_index import DataFrameSubstringIndex
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s"
+)
+
+
+@dataclass(frozen=True)
+class SnapshotState:
+    """
+    One loaded version of the snapshot file. The DataFrame, its indexes and
+    its version always belong together; read them from the same state.
+    """
+
+    version: str
+    dataframe: pd.DataFrame
+    substring_index: DataFrameSubstringIndex
+    filter_engine: FilterEngine
+    path: str
+    mtime: float
+
+
+class DataFrameSnapshot:
+    """
+    Holds a long-lived, read-only DataFrame loaded from disk and reloads it
+    atomically when the underlying file changes.
+
+    The file is only re-parsed when its mtime changes *and* its content hash
+    differs from the loaded one. A reload builds a complete new
+    `SnapshotState` (frame, indexes and version) and swaps it in with a
+    single assignment, so the properties are plain reads and never block.
+    `reload` hashes and parses the file and must not run on the event loop;
+    the Agent API calls it from a background task on its CPU pool every
+    `check_interval` seconds.
+
+    The columnar Arrow file is preferred and loaded memory-mapped with its
+    stored dtypes. The CSV is used when pyarrow is not installed, the Arrow
+    file is missing or it was written with another schema version.
+
+    Attributes:
+        path (str): Path of the Arrow file backing the snapshot.
+        fallback_path (str): Path of the CSV file used as fallback.
+        state (SnapshotState): The currently loaded version.
+    """
+
+    def __init__(self, path: str = FILTERED_ARROW_PATH,
+                 fallback_path: str = FILTERED_DATA_PATH,
+                 check_interval: float = SNAPSHOT_CHECK_INTERVAL):
+        """
+        Initializes the snapshot and loads the file immediately.
+
+        Args:
+            path (str): Path of the Arrow file to load.
+            fallback_path (str): Path of the CSV file to load instead.
+            check_interval (float): Seconds between two checks for changes
+                by the caller's background task.
+        """
+        self.path = path
+        self.fallback_path = fallback_path
+        self.check_interval = check_interval
+        self._reload_lock = threading.Lock()
+        self._state: Optional[SnapshotState] = None
+        self.reload(force=True)
+
+    @staticmethod
+    def _hash_file(path: str) -> str:
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        return digest.hexdigest()[:16]
+
+    def _resolve_path(self) -> str:
+        if is_arrow_available() and os.path.exists(self.path):
+            return self.path
+        return self.fallback_path
+
+    def _load(self, path: str) -> pd.DataFrame:
+        if path == self.fallback_path:
+            return read_csv(path)
+        try:
+            return read_arrow(path)
+        except (OSError, ValueError) as e:
+            logging.warning(f"Could not load {path} ({e}), falling back to {self.fallback_path}.")
+            return read_csv(self.fallback_path)
+
+    def reload(self, force: bool = False) -> bool:
+        """
+        Reloads the DataFrame if the file changed since the last load.
+        Blocking: hashes and parses the file and builds the indexes.
+
+        Args:
+            force (bool): Reload even if mtime and hash are unchanged.
+
+        Returns:
+            bool: True if a new state was swapped in.
+        """
+        with self._reload_lock:
+            current = self._state
+            path = self._resolve_path()
+            try:
+                mtime = os.stat(path).st_mtime
+            except FileNotFoundError:
+                logging.error(f"Snapshot file not found: {path}")
+                if current is None:
+                    raise
+                return False
+
+            if not force and path == current.path and mtime == current.mtime:
+                return False
+
+            content_hash = self._hash_file(path)
+            if not force and content_hash == current.version:
+                self._state = replace(current, path=path, mtime=mtime)
+                return False
+
+            dataframe = self._load(path)
+            substring_index = DataFrameSubstringIndex(dataframe)
+            self._state = SnapshotState(
+                version=content_hash,
+                dataframe=dataframe,
+                substring_index=substring_index,
+                filter_engine=FilterEngine(dataframe, substring_index),
+                path=path,
+                mtime=mtime,
+            )
+            logging.info(
+                f"Loaded snapshot {content_hash} from {path} with {len(dataframe)} rows.")
+            return True
+
+    @property
+    def state(self) -> SnapshotState:
+        return self._state
+
+    @property
+    def active_path(self) -> str:
+        return self._state.path
+
+    @property
+    def dataframe(self) -> pd.DataFrame:
+        return self._state.dataframe
+
+    @property
+    def substring_index(self) -> DataFrameSubstringIndex:
+        """
+        Substring index bound to the current DataFrame. Its `dataframe`
+        attribute is always the frame the index was built for.
+        """
+        return self._state.substring_index
+
+    @property
+    def filter_engine(self) -> FilterEngine:
+        """
+        Predicate filter engine bound to the current DataFrame.
+        """
+        return self._state.filter_engine
+
+    @property
+    def version(self) -> str:
+        return self._state.version
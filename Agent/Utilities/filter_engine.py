@@ -0,0 +1,208 @@
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from Constants.Agents.dataframe_agent_constants import FILTER_MAX_PREDICATES
+from Utilities.substring_index import DataFrameSubstringIndex
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s"
+)
+
+NUMERIC_OPS = {"eq", "ne", "lt", "le", "gt", "ge", "between", "in"}
+TEXT_OPS = {"eq", "ne", "in", "contains"}
+COMPARISONS = {
+    "eq": np.equal, "ne": np.not_equal,
+    "lt": np.less, "le": np.less_equal,
+    "gt": np.greater, "ge": np.greater_equal,
+}
+
+
+class FilterError(ValueError):
+    """
+    Raised when a predicate is malformed or does not fit the column dtype.
+    """
+
+
+class FilterEngine:
+    """
+    Evaluates typed multi-predicate filters over a read-only DataFrame.
+
+    A predicate is either a leaf `{"column", "op", "value"}` or a boolean
+    node `{"and": [...]}` / `{"or": [...]}`. Leaves are validated against the
+    column dtype and compiled into NumPy boolean masks:
+
+    - numeric columns support eq, ne, lt, le, gt, ge, between and in on a
+      float64 view of the column;
+    - text and category columns support eq, ne, in (case-insensitive) and
+      contains. Text columns are factorized once, so a predicate is decided
+      per distinct value and broadcast to the rows through the codes.
+      `contains` uses the substring index when it can.
+
+    Nothing is cast to `str` per row. Column views are built lazily and
+    cached for the lifetime of the DataFrame.
+
+    Attributes:
+        schema (Dict[str, str]): "numeric" or "text" for every column that
+            holds at least one value, i.e. the columns worth filtering on.
+    """
+
+    def __init__(self, dataframe: pd.DataFrame,
+                 substring_index: Optional[DataFrameSubstringIndex] = None):
+        """
+        Args:
+            dataframe (pd.DataFrame): The DataFrame to filter.
+            substring_index (Optional[DataFrameSubstringIndex]): Index over
+                the same DataFrame, used for `contains`.
+        """
+        self.dataframe = dataframe
+        self.substring_index = substring_index
+        self._lock = threading.Lock()
+        self._numeric: Dict[str, np.ndarray] = {}
+        self._factorized: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self.schema = {
+            column: "numeric" if self._is_numeric(column) else "text"
+            for column in dataframe.columns[dataframe.notna().any().to_numpy()]
+        }
+
+    @staticmethod
+    def from_legacy(column: str, condition: str, dataframe: pd.DataFrame) -> Dict[str, Any]:
+        """
+        Converts the single `column`/`condition` pair of the original prompt
+        into a predicate: equality on numeric columns, contains otherwise.
+        """
+        condition = str(condition).replace("'", "")
+        if column in dataframe.columns and pd.api.types.is_numeric_dtype(dataframe[column]):
+            return {"column": column, "op": "eq", "value": condition}
+        return {"column": column, "op": "contains", "value": condition}
+
+    def _is_numeric(self, column: str) -> bool:
+        dtype = self.dataframe[column].dtype
+        return pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)
+
+    def _numeric_view(self, column: str) -> np.ndarray:
+        with self._lock:
+            if column not in self._numeric:
+                self._numeric[column] = self.dataframe[column].to_numpy(
+                    dtype=np.float64, na_value=np.nan)
+            return self._numeric[column]
+
+    def _factorized_view(self, column: str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns row codes (-1 for missing) and the lower-cased distinct values.
+        """
+        with self._lock:
+            if column not in self._factorized:
+                series = self.dataframe[column]
+                if isinstance(series.dtype, pd.CategoricalDtype):
+                    codes, uniques = series.cat.codes.to_numpy(), series.cat.categories
+                else:
+                    codes, uniques = pd.factorize(series)
+                lowered = np.array([str(value).lower() for value in uniques], dtype=object)
+                self._factorized[column] = (codes, lowered)
+            return self._factorized[column]
+
+    @staticmethod
+    def _to_number(value: Any, column: str) -> float:
+        if isinstance(value, bool):
+            raise FilterError(f"Expected a number for column '{column}', got {value!r}.")
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            raise FilterError(f"Expected a number for column '{column}', got {value!r}.")
+
+    def _numeric_mask(self, column: str, op: str, value: Any) -> np.ndarray:
+        if op not in NUMERIC_OPS:
+            raise FilterError(f"Operator '{op}' is not supported on numeric column '{column}'.")
+        values = self._numeric_view(column)
+        if op == "between":
+            if not isinstance(value, (list, tuple)) or len(value) != 2:
+                raise FilterError("'between' expects [low, high].")
+            low, high = (self._to_number(v, column) for v in value)
+            return (values >= low) & (values <= high)
+        if op == "in":
+            if not isinstance(value, (list, tuple)):
+                raise FilterError("'in' expects a list of values.")
+            return np.isin(values, [self._to_number(v, column) for v in value])
+        mask = COMPARISONS[op](values, self._to_number(value, column))
+        return mask & ~np.isnan(values) if op == "ne" else mask
+
+    def _text_mask(self, column: str, op: str, value: Any) -> np.ndarray:
+        if op not in TEXT_OPS:
+            raise FilterError(f"Operator '{op}' is not supported on text column '{column}'.")
+        if op == "in":
+            if not isinstance(value, (list, tuple)):
+                raise FilterError("'in' expects a list of values.")
+            targets = {str(v).lower() for v in value}
+        elif isinstance(value, (list, tuple, dict)) or value is None:
+            raise FilterError(f"Operator '{op}' expects a single value.")
+        else:
+            targets = {str(value).lower()}
+
+        if op == "contains":
+            pattern = next(iter(targets))
+            if self.substring_index is not None:
+                row_ids = self.substring_index.contains(column, pattern)
+                if row_ids is not None:
+                    mask = np.zeros(len(self.dataframe), dtype=bool)
+                    mask[row_ids] = True
+                    return mask
+            codes, uniques = self._factorized_view(column)
+            matching = np.fromiter((pattern in u for u in uniques), dtype=bool, count=len(uniques))
+        else:
+            codes, uniques = self._factorized_view(column)
+            matching = np.isin(uniques, list(targets))
+
+        mask = np.isin(codes, np.flatnonzero(matching))
+        return ~mask & (codes >= 0) if op == "ne" else mask
+
+    def _leaf_mask(self, predicate: Dict[str, Any]) -> np.ndarray:
+        column = predicate.get("column")
+        op = predicate.get("op")
+        if not isinstance(column, str) or column not in self.dataframe.columns:
+            raise FilterError(f"Invalid column name: {column}")
+        if "value" not in predicate:
+            raise FilterError(f"Predicate on '{column}' has no value.")
+        if self._is_numeric(column):
+            return self._numeric_mask(column, op, predicate["value"])
+        return self._text_mask(column, op, predicate["value"])
+
+    def _mask(self, predicate: Any, budget: List[int]) -> np.ndarray:
+        if not isinstance(predicate, dict):
+            raise FilterError(f"Predicate must be an object, got {predicate!r}.")
+        budget[0] -= 1
+        if budget[0] < 0:
+            raise FilterError(f"Filters are limited to {FILTER_MAX_PREDICATES} predicates.")
+
+        for operator, combine in (("and", np.logical_and), ("or", np.logical_or)):
+            if operator in predicate:
+                children = predicate[operator]
+                if not isinstance(children, list) or not children:
+                    raise FilterError(f"'{operator}' expects a non-empty list of predicates.")
+                mask = self._mask(children[0], budget)
+                for child in children[1:]:
+                    mask = combine(mask, self._mask(child, budget))
+                return mask
+        return self._leaf_mask(predicate)
+
+    def mask(self, predicate: Dict[str, Any]) -> np.ndarray:
+        """
+        Validates a predicate and evaluates it to a row mask.
+
+        Args:
+            predicate (Dict[str, Any]): The predicate tree.
+
+        Returns:
+            np.ndarray: Boolean mask over the DataFrame rows.
+
+        Raises:
+            FilterError: If the predicate is invalid for this DataFrame.
+        """
+        return self._mask(predicate, [FILTER_MAX_PREDICATES])
+
+    def filter(self, predicate: Dict[str, Any]) -> pd.DataFrame:
+        return self.dataframe[self.mask(predicate)]
@@ -0,0 +1,306 @@
+import argparse
+import logging
+import os
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from Constants.data_constants import (
+    FILTERED_DATA_PATH,
+    FILTERED_ARROW_PATH,
+    FILTERED_STATE_PATH,
+    FILTERED_DATA_SCHEMA_VERSION,
+    FILTERED_DATA_DTYPES,
+    DICTIONARY_COLUMNS,
+    PREPARE_IN_CHUNKS,
+)
+from Utilities.chunked_data_processor import MERGE_COLUMN, ChunkedDataProcessor, source_schema
+from Utilities.data_processor import DataProcessor
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s"
+)
+
+SCHEMA_VERSION_KEY = b"schema_version"
+DATASET_VERSION_KEY = b"dataset_version"
+
+
+def is_arrow_available() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def apply_schema(dataframe: pd.DataFrame) -> pd.DataFrame:
+    """
+    Casts the filtered leads to their explicit dtypes: numeric columns from
+    `FILTERED_DATA_DTYPES`, `DICTIONARY_COLUMNS` as categories and every
+    other column as string.
+    """
+    dtypes = {}
+    for column in dataframe.columns:
+        if column in FILTERED_DATA_DTYPES:
+            dtypes[column] = FILTERED_DATA_DTYPES[column]
+        elif column in DICTIONARY_COLUMNS:
+            dtypes[column] = "category"
+        else:
+            dtypes[column] = "string"
+    return dataframe.astype(dtypes)
+
+
+def write_arrow(dataframe: pd.DataFrame, path: str = FILTERED_ARROW_PATH,
+                dataset_version: int = 0) -> None:
+    """
+    Writes the filtered leads as an uncompressed Arrow IPC file so it can be
+    memory-mapped. Category columns become dictionary-encoded arrays and the
+    schema and dataset versions are stored in the schema metadata. The file
+    is written next to `path` and renamed, so readers never see a partial
+    file.
+
+    Raises:
+        ImportError: If pyarrow is not installed.
+    """
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(apply_schema(dataframe), preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[SCHEMA_VERSION_KEY] = str(FILTERED_DATA_SCHEMA_VERSION).encode()
+    metadata[DATASET_VERSION_KEY] = str(dataset_version).encode()
+    table = table.replace_schema_metadata(metadata)
+
+    temporary_path = f"{path}.tmp"
+    with pa.OSFile(temporary_path, "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(temporary_path, path)
+    logging.info(f"Wrote {len(dataframe)} leads to {path}.")
+
+
+def read_arrow(path: str = FILTERED_ARROW_PATH) -> pd.DataFrame:
+    """
+    Loads the Arrow file through a memory map.
+
+    Raises:
+        ImportError: If pyarrow is not installed.
+        ValueError: If the file was written with another schema version.
+    """
+    import pyarrow as pa
+
+    with pa.memory_map(path, "r") as source:
+        table = pa.ipc.open_file(source).read_all()
+    version = (table.schema.metadata or {}).get(SCHEMA_VERSION_KEY, b"").decode()
+    if version != str(FILTERED_DATA_SCHEMA_VERSION):
+        raise ValueError(
+            f"{path} has schema version '{version}', expected {FILTERED_DATA_SCHEMA_VERSION}.")
+    return table.to_pandas()
+
+
+def read_csv(path: str = FILTERED_DATA_PATH) -> pd.DataFrame:
+    return apply_schema(pd.read_csv(path))
+
+
+def _row_hashes(dataframe: pd.DataFrame) -> pd.Series:
+    """
+    One 64-bit content hash per Lead Number. Duplicate Lead Numbers are
+    combined, so a change in any of their rows changes the hash. Columns are
+    cast to `source_schema` first, so a row hashes the same in any chunk.
+    """
+    dataframe = dataframe.astype(source_schema(dataframe.columns))
+    hashes = pd.util.hash_pandas_object(dataframe, index=False)
+    hashes.index = dataframe[MERGE_COLUMN].to_numpy()
+    return hashes.groupby(level=0).sum()
+
+
+def _combine_hashes(hashes: List[pd.Series]) -> pd.Series:
+    if not hashes:
+        return pd.Series(dtype="uint64")
+    return pd.concat(hashes).groupby(level=0).sum()
+
+
+def _source_hashes(processor: ChunkedDataProcessor, source: str) -> pd.Series:
+    return _combine_hashes([_row_hashes(chunk) for chunk in processor.read_chunks(source)])
+
+
+def _changed_leads(current: pd.Series, previous: pd.Series) -> pd.Index:
+    common = current.index.intersection(previous.index)
+    changed = common[current.loc[common].to_numpy() != previous.loc[common].to_numpy()]
+    return (changed
+            .union(current.index.difference(previous.index))
+            .union(previous.index.difference(current.index)))
+
+
+def _load_state(path: str) -> Optional[Dict]:
+    if not os.path.exists(path):
+        return None
+    with np.load(path) as state:
+        if int(state["schema_version"]) != FILTERED_DATA_SCHEMA_VERSION:
+            return None
+        return {
+            "leads": pd.Series(state["leads_hashes"], index=state["leads_ids"]),
+            "sample": pd.Series(state["sample_hashes"], index=state["sample_ids"]),
+            "dataset_version": int(state["dataset_version"]),
+        }
+
+
+def _save_state(path: str, leads_hashes: pd.Series, sample_hashes: pd.Series,
+                dataset_version: int) -> None:
+    temporary_path = f"{path}.tmp.npz"
+    np.savez(temporary_path,
+             leads_ids=leads_hashes.index.to_numpy(), leads_hashes=leads_hashes.to_numpy(),
+             sample_ids=sample_hashes.index.to_numpy(), sample_hashes=sample_hashes.to_numpy(),
+             schema_version=FILTERED_DATA_SCHEMA_VERSION, dataset_version=dataset_version)
+    os.replace(temporary_path, path)
+
+
+def _materialize(data_processor: DataProcessor, filtered_dataframe: pd.DataFrame,
+                 csv_path: str, arrow_path: str, dataset_version: int) -> None:
+    data_processor.save_filtered_dataframe(
+        filtered_dataframe=filtered_dataframe, path=csv_path)
+    if is_arrow_available():
+        write_arrow(filtered_dataframe, arrow_path, dataset_version=dataset_version)
+    else:
+        logging.warning("pyarrow is not installed, only the CSV was written.")
+
+
+def build_filtered_dataset(leads_path: str = "./DataFiles/Leads.csv",
+                           sample_path: str = "./DataFiles/SampleData.csv",
+                           csv_path: str = FILTERED_DATA_PATH,
+                           arrow_path: str = FILTERED_ARROW_PATH,
+                           state_path: str = FILTERED_STATE_PATH,
+                           chunked: bool = PREPARE_IN_CHUNKS) -> pd.DataFrame:
+    """
+    Merges and filters the full lead files and materializes the result as
+    CSV and, when pyarrow is installed, as Arrow. Records the processed Lead
+    Numbers for later incremental refreshes.
+
+    Args:
+        chunked (bool): Use `ChunkedDataProcessor` instead of loading both
+            files into `DataProcessor`.
+
+    Returns:
+        pd.DataFrame: The filtered leads.
+    """
+    state = _load_state(state_path)
+    dataset_version = state["dataset_version"] + 1 if state else 1
+
+    if chunked:
+        hashes = {"leads": [], "sample": []}
+        ChunkedDataProcessor(leads_path, sample_path).prepare(
+            csv_path, on_chunk=lambda source, chunk: hashes[source].append(_row_hashes(chunk)))
+        leads_hashes = _combine_hashes(hashes["leads"])
+        sample_hashes = _combine_hashes(hashes["sample"])
+        filtered_dataframe = read_csv(csv_path)
+        if is_arrow_available():
+            write_arrow(filtered_dataframe, arrow_path, dataset_version=dataset_version)
+    else:
+        projection = ChunkedDataProcessor(leads_path, sample_path)
+        data_processor = DataProcessor.from_dataframes(
+            projection.read("leads"), projection.read("sample"))
+        filtered_dataframe = data_processor.get_filter_data()
+        _materialize(data_processor, filtered_dataframe, csv_path, arrow_path, dataset_version)
+        leads_hashes = _row_hashes(data_processor.df1)
+        sample_hashes = _row_hashes(data_processor.df2)
+
+    _save_state(state_path, leads_hashes, sample_hashes, dataset_version)
+    return filtered_dataframe
+
+
+def refresh_filtered_dataset(leads_path: str = "./DataFiles/Leads.csv",
+                             sample_path: str = "./DataFiles/SampleData.csv",
+                             csv_path: str = FILTERED_DATA_PATH,
+                             arrow_path: str = FILTERED_ARROW_PATH,
+                             state_path: str = FILTERED_STATE_PATH) -> pd.DataFrame:
+    """
+    Incrementally refreshes the filtered leads. Only Lead Numbers that are
+    new, changed or removed in either file since the last build are merged
+    and filtered; their rows replace the old ones in the materialized dataset
+    and the dataset version is bumped. Falls back to a full build when there
+    is no previous build.
+
+    Both files are streamed twice through `ChunkedDataProcessor`: once to
+    hash every Lead Number and once to collect the rows of the affected
+    ones, so neither file is loaded as a whole.
+
+    Returns:
+        pd.DataFrame: The filtered leads.
+    """
+    state = _load_state(state_path)
+    if state is None or not os.path.exists(csv_path):
+        logging.info("No previous build state, running a full build.")
+        return build_filtered_dataset(leads_path, sample_path, csv_path, arrow_path, state_path)
+
+    processor = ChunkedDataProcessor(leads_path, sample_path)
+    leads_hashes = _source_hashes(processor, "leads")
+    sample_hashes = _source_hashes(processor, "sample")
+    affected = _changed_leads(leads_hashes, state["leads"]).union(
+        _changed_leads(sample_hashes, state["sample"]))
+
+    current_dataframe = read_csv(csv_path)
+    if affected.empty:
+        logging.info("Filtered dataset is up to date.")
+        if is_arrow_available() and not os.path.exists(arrow_path):
+            write_arrow(current_dataframe, arrow_path, dataset_version=state["dataset_version"])
+        return current_dataframe
+
+    subset_processor = DataProcessor.from_dataframes(
+        processor.read("leads", affected), processor.read("sample", affected))
+    new_rows = subset_processor.get_filter_data()
+    kept_rows = current_dataframe[~current_dataframe[MERGE_COLUMN].isin(affected)]
+    filtered_dataframe = pd.concat(
+        [kept_rows, apply_schema(new_rows)[kept_rows.columns]], ignore_index=True)
+
+    dataset_version = state["dataset_version"] + 1
+    _materialize(subset_processor, filtered_dataframe, csv_path, arrow_path, dataset_version)
+    _save_state(state_path, leads_hashes, sample_hashes, dataset_version)
+    logging.info(
+        f"Incremental refresh: {len(affected)} Lead Numbers reprocessed, "
+        f"{len(new_rows)} rows written, dataset version {dataset_version}.")
+    return filtered_dataframe
+
+
+def verify_incremental(leads_path: str = "./DataFiles/Leads.csv",
+                       sample_path: str = "./DataFiles/SampleData.csv",
+                       csv_path: str = FILTERED_DATA_PATH) -> bool:
+    """
+    Checks that the materialized dataset equals a full rebuild from the
+    current files, ignoring row order. Does not write anything.
+
+    Returns:
+        bool: True if both contain the same rows.
+    """
+    def normalize(dataframe: pd.DataFrame) -> pd.DataFrame:
+        dataframe = apply_schema(dataframe)
+        for column in DICTIONARY_COLUMNS:
+            if column in dataframe.columns:
+                dataframe[column] = dataframe[column].astype("string")
+        return dataframe.sort_values(list(dataframe.columns)).reset_index(drop=True)
+
+    materialized_dataframe = read_csv(csv_path)
+    full_dataframe = DataProcessor(df1_path=leads_path, df2_path=sample_path).get_filter_data()
+    try:
+        pd.testing.assert_frame_equal(
+            normalize(materialized_dataframe),
+            normalize(full_dataframe[materialized_dataframe.columns]))
+    except AssertionError as e:
+        logging.error(f"Incremental dataset differs from a full rebuild: {e}")
+        return False
+    logging.info("Incremental dataset matches a full rebuild.")
+    return True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the filtered lead dataset.")
+    parser.add_argument("command", nargs="?", default="full",
+                        choices=["full", "incremental", "verify"])
+    command = parser.parse_args().command
+
+    if command == "full":
+        build_filtered_dataset()
+    elif command == "incremental":
+        refresh_filtered_dataset()
+    elif command == "verify":
+        raise SystemExit(0 if verify_incremental() else 1)
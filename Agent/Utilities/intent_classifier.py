@@ -0,0 +1,257 @@
+import json
+import logging
+import os
+import re
+import time
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from Constants.intent_classifier_constants import (
+    INTENT_KEYWORD_RULES,
+    INTENT_MODEL_PATH,
+    INTENT_SEED_QUERIES_PATH,
+    INTENT_QUERY_LOG_PATH,
+    INTENT_MIN_EVAL_QUERIES,
+)
+
+logging.basicConfig(level=logging.INFO,
+                    format='%(asctime)s - %(levelname)s - %(message)s')
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def _features(query: str) -> List[str]:
+    tokens = TOKEN_PATTERN.findall(query.lower())
+    return tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+
+
+class IntentClassifier:
+    """
+    Lightweight local intent classifier used ahead of the LLM.
+
+    Keyword rules answer first with full confidence when exactly one intent
+    matches. Otherwise a TF-IDF (word unigrams and bigrams) softmax regression
+    model scores every label. Both run in well under a millisecond on CPU.
+
+    Attributes:
+        labels (List[str]): Intent labels known to the linear model.
+        vocabulary (Dict[str, int]): Feature to column mapping.
+    """
+
+    def __init__(self, rules: Optional[Dict[str, str]] = None) -> None:
+        rules = INTENT_KEYWORD_RULES if rules is None else rules
+        self.rules = {intent: re.compile(pattern, re.IGNORECASE)
+                      for intent, pattern in rules.items()}
+        self.labels: List[str] = []
+        self.vocabulary: Dict[str, int] = {}
+        self.idf = np.empty(0)
+        self.weights = np.empty((0, 0))
+        self.bias = np.empty(0)
+
+    @property
+    def is_trained(self) -> bool:
+        return bool(self.labels)
+
+    def _vectorize(self, query: str) -> Tuple[np.ndarray, np.ndarray]:
+        counts = Counter(feature for feature in _features(query)
+                         if feature in self.vocabulary)
+        if not counts:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        columns = np.fromiter((self.vocabulary[f] for f in counts), dtype=np.int64)
+        values = np.fromiter(counts.values(), dtype=np.float64) * self.idf[columns]
+        return columns, values / np.linalg.norm(values)
+
+    def _match_rules(self, query: str) -> Optional[str]:
+        matches = [intent for intent, pattern in self.rules.items()
+                   if pattern.search(query)]
+        return matches[0] if len(matches) == 1 else None
+
+    def predict(self, query: str) -> Tuple[Optional[str], float]:
+        """
+        Predicts the intent of a query.
+
+        Args:
+            query (str): The user query.
+
+        Returns:
+            Tuple[Optional[str], float]: The intent and its confidence, or
+            (None, 0.0) when neither the rules nor the model can answer.
+        """
+        intent = self._match_rules(query)
+        if intent is not None:
+            return intent, 1.0
+
+        if not self.is_trained:
+            return None, 0.0
+
+        columns, values = self._vectorize(query)
+        if not len(columns):
+            return None, 0.0
+        logits = values @ self.weights[columns] + self.bias
+        probabilities = np.exp(logits - logits.max())
+        probabilities /= probabilities.sum()
+        best = int(probabilities.argmax())
+        return self.labels[best], float(probabilities[best])
+
+    def fit(self, queries: List[str], intents: List[str], epochs: int = 300,
+            learning_rate: float = 1.0, l2: float = 1e-3) -> "IntentClassifier":
+        """
+        Trains the TF-IDF softmax regression model with full-batch gradient descent.
+
+        Args:
+            queries (List[str]): Training queries.
+            intents (List[str]): Intent label of each query.
+            epochs (int): Gradient descent iterations.
+            learning_rate (float): Step size.
+            l2 (float): L2 regularisation strength.
+
+        Returns:
+            IntentClassifier: The trained classifier.
+        """
+        self.labels = sorted(set(intents))
+        document_frequency = Counter(
+            feature for query in queries for feature in set(_features(query)))
+        self.vocabulary = {feature: i for i, feature in enumerate(sorted(document_frequency))}
+        self.idf = np.array([
+            np.log((1 + len(queries)) / (1 + document_frequency[feature])) + 1
+            for feature in sorted(document_frequency)
+        ])
+
+        features = np.zeros((len(queries), len(self.vocabulary)))
+        for row, query in enumerate(queries):
+            columns, values = self._vectorize(query)
+            features[row, columns] = values
+        targets = np.zeros((len(queries), len(self.labels)))
+        targets[np.arange(len(queries)), [self.labels.index(i) for i in intents]] = 1
+
+        self.weights = np.zeros((len(self.vocabulary), len(self.labels)))
+        self.bias = np.zeros(len(self.labels))
+        for _ in range(epochs):
+            logits = features @ self.weights + self.bias
+            logits -= logits.max(axis=1, keepdims=True)
+            probabilities = np.exp(logits)
+            probabilities /= probabilities.sum(axis=1, keepdims=True)
+            error = (probabilities - targets) / len(queries)
+            self.weights -= learning_rate * (features.T @ error + l2 * self.weights)
+            self.bias -= learning_rate * error.sum(axis=0)
+        return self
+
+    def save(self, path: str = INTENT_MODEL_PATH) -> None:
+        with open(path, "w") as f:
+            json.dump({
+                "labels": self.labels,
+                "vocabulary": self.vocabulary,
+                "idf": self.idf.tolist(),
+                "weights": self.weights.tolist(),
+                "bias": self.bias.tolist(),
+            }, f)
+        logging.info(f"Intent classifier saved to {path}.")
+
+    @classmethod
+    def load(cls, path: str = INTENT_MODEL_PATH) -> "IntentClassifier":
+        """
+        Loads a trained classifier. Falls back to keyword rules only when no
+        model file exists.
+        """
+        classifier = cls()
+        if not os.path.exists(path):
+            logging.warning(
+                f"No intent classifier model at {path}, using keyword rules only.")
+            return classifier
+        with open(path) as f:
+            model = json.load(f)
+        classifier.labels = model["labels"]
+        classifier.vocabulary = model["vocabulary"]
+        classifier.idf = np.asarray(model["idf"])
+        classifier.weights = np.asarray(model["weights"])
+        classifier.bias = np.asarray(model["bias"])
+        logging.info(f"Intent classifier loaded from {path}.")
+        return classifier
+
+
+def load_labelled_queries(*paths: str) -> List[Dict]:
+    """
+    Reads `{"query", "intent"}` JSON lines from the given files, skipping
+    files that do not exist.
+    """
+    rows = []
+    for path in paths:
+        if not os.path.exists(path):
+            continue
+        with open(path) as f:
+            rows.extend(json.loads(line) for line in f if line.strip())
+    return [row for row in rows if row.get("query") and row.get("intent")]
+
+
+def train_and_evaluate(threshold: float, eval_fraction: float = 0.25, seed: int = 0) -> None:
+    """
+    Trains on the seed and logged queries, reports accuracy, coverage and
+    latency of the fast path against the logged LLM latency, then retrains
+    on everything and saves the model.
+
+    Only logged (real) queries are held out for the evaluation, split by
+    distinct query so repeated queries never end up on both sides. The seed
+    phrases are always trained on: they are templates, and scoring them says
+    nothing about real traffic. Accuracy is not reported until the log holds
+    `INTENT_MIN_EVAL_QUERIES` distinct queries.
+    """
+    seed_rows = load_labelled_queries(INTENT_SEED_QUERIES_PATH)
+    logged_rows = load_labelled_queries(INTENT_QUERY_LOG_PATH)
+    rows = seed_rows + logged_rows
+    if len(rows) < 4:
+        raise ValueError("Not enough labelled queries to train the classifier.")
+
+    distinct_queries = sorted({r["query"].strip().lower() for r in logged_rows})
+    order = np.random.default_rng(seed).permutation(len(distinct_queries))
+    held_out = {distinct_queries[i]
+                for i in order[:int(len(distinct_queries) * eval_fraction)]}
+    eval_rows = [r for r in logged_rows if r["query"].strip().lower() in held_out]
+    train_rows = seed_rows + [r for r in logged_rows
+                              if r["query"].strip().lower() not in held_out]
+
+    if len(distinct_queries) < INTENT_MIN_EVAL_QUERIES or not eval_rows:
+        print(f"{len(distinct_queries)} distinct logged queries, at least "
+              f"{INTENT_MIN_EVAL_QUERIES} are needed for a held-out evaluation; "
+              f"accuracy is not reported.")
+        IntentClassifier().fit(
+            [r["query"] for r in rows], [r["intent"] for r in rows]).save(INTENT_MODEL_PATH)
+        return
+
+    classifier = IntentClassifier().fit(
+        [r["query"] for r in train_rows], [r["intent"] for r in train_rows])
+
+    latencies, correct, confident, confident_correct = [], 0, 0, 0
+    for row in eval_rows:
+        start_time = time.perf_counter()
+        intent, confidence = classifier.predict(row["query"])
+        latencies.append(time.perf_counter() - start_time)
+        correct += intent == row["intent"]
+        if confidence >= threshold:
+            confident += 1
+            confident_correct += intent == row["intent"]
+
+    latencies_ms = np.array(latencies) * 1000
+    print(f"train={len(train_rows)} held-out logged={len(eval_rows)} threshold={threshold}")
+    print(f"classifier accuracy (all):       {correct / len(eval_rows):.3f}")
+    print(f"fast-path coverage:              {confident / len(eval_rows):.3f}")
+    if confident:
+        print(f"fast-path accuracy:              {confident_correct / confident:.3f}")
+    print(f"classifier latency p50/p99 (ms): "
+          f"{np.percentile(latencies_ms, 50):.4f} / {np.percentile(latencies_ms, 99):.4f}")
+
+    llm_latencies = [r["llm_latency"] for r in rows if "llm_latency" in r]
+    if llm_latencies:
+        print(f"LLM path latency p50/p99 (ms):   "
+              f"{np.percentile(llm_latencies, 50) * 1000:.1f} / "
+              f"{np.percentile(llm_latencies, 99) * 1000:.1f} ({len(llm_latencies)} logged)")
+
+    IntentClassifier().fit(
+        [r["query"] for r in rows], [r["intent"] for r in rows]).save(INTENT_MODEL_PATH)
+
+
+if __name__ == "__main__":
+    from Constants.intent_classifier_constants import INTENT_CONFIDENCE_THRESHOLD
+
+    train_and_evaluate(threshold=INTENT_CONFIDENCE_THRESHOLD)
@@ -1,27 +1,109 @@
-import re
+import asyncio
 import json
-from typing import Dict
-from Constants.api_constants import APP_NAME
-from Constants.prompt_templated import INTENT_DETECTION_PROMPT_TEMPLATE
+import logging
+import threading
+import time
+from concurrent.futures import Executor
+from typing import Dict, Optional
+from Constants.api_constants import APP_NAME, INTENT_EXTRACTION_MODE
+from Constants.prompt_templated import (
+    INTENT_DETECTION_PROMPT_TEMPLATE,
+    COMBINED_INTENT_PROMPT_TEMPLATE,
+)
+from Constants.intent_classifier_constants import (
+    INTENT_FAST_PATH_ENABLED,
+    INTENT_CONFIDENCE_THRESHOLD,
+    INTENT_QUERY_LOG_PATH,
+)
 from Mixins.llm_response_mixin import LLMResponseMixin
+from Utilities.intent_classifier import IntentClassifier
+from Utilities.tracing import tracer
 
 
 class IntentDetection(LLMResponseMixin):
+    """
+    Detects the intent of a user query. A local classifier answers first and
+    the LLM is only asked when its confidence is below the threshold.
+
+    In "combined" mode the LLM also returns the agent arguments under
+    `arguments`, so the executor can skip the agent's own generation.
+
+    `aget_intent` appends to the intent query log on `io_executor` (the
+    event loop's default executor when None).
+    """
+
+    def __init__(self, classifier: Optional[IntentClassifier] = None,
+                 threshold: float = INTENT_CONFIDENCE_THRESHOLD,
+                 mode: str = INTENT_EXTRACTION_MODE,
+                 io_executor: Optional[Executor] = None):
+        if mode not in ("two_call", "combined"):
+            raise ValueError(f"Unknown intent extraction mode: {mode}")
+        if classifier is None and INTENT_FAST_PATH_ENABLED:
+            classifier = IntentClassifier.load()
+        self.classifier = classifier
+        self.threshold = threshold
+        self.mode = mode
+        self.io_executor = io_executor
+        self._log_lock = threading.Lock()
+
+    @property
+    def generation_profile(self) -> str:
+        return "intent_combined" if self.mode == "combined" else "intent"
+
+    def _build_prompt(self, query: str) -> str:
+        if self.mode == "combined":
+            return COMBINED_INTENT_PROMPT_TEMPLATE.format(query=query)
+        return INTENT_DETECTION_PROMPT_TEMPLATE.format(query=query)
+
+    def _fast_path_intent(self, query: str) -> Optional[Dict[str, str]]:
+        if self.classifier is None or not isinstance(query, str):
+            return None
+        intent, confidence = self.classifier.predict(query)
+        if intent is None or confidence < self.threshold:
+            return None
+        logging.info(
+            f"Intent '{intent}' detected locally with confidence {confidence:.2f}.")
+        return {"intent": intent, "action": query, "source": "classifier"}
+
+    def _log_llm_intent(self, query: str, intent_body: Dict[str, str], latency: float) -> None:
+        if not isinstance(intent_body, dict) or not intent_body.get("intent"):
+            return
+        try:
+            with self._log_lock, open(INTENT_QUERY_LOG_PATH, "a") as f:
+                f.write(json.dumps({"query": query, "intent": intent_body["intent"],
+                                    "mode": self.mode,
+                                    "llm_latency": round(latency, 4)}) + "\n")
+        except OSError as e:
+            logging.warning(f"Could not log intent query: {e}")
 
     def get_intent(self, query: str) -> Dict[str, str]:
-        prompt = INTENT_DETECTION_PROMPT_TEMPLATE.format(query=query)
+        fast_intent = self._fast_path_intent(query)
+        if fast_intent is not None:
+            return fast_intent
+
+        start_time = time.perf_counter()
+        prompt = self._build_prompt(query=query)
         response = self.get_llm_response(prompt=prompt)
         extracted_json = self._extract_json(response=response['llm_response'])
+        self._log_llm_intent(query, extracted_json, time.perf_counter() - start_time)
 
         return extracted_json
 
-    def _extract_json(self, response: str) -> Dict[str, str]:
-        match = re.search(r'\{.*\}', response, re.DOTALL)
+    async def aget_intent(self, query: str) -> Dict[str, str]:
+        with tracer.span("intent_detection", mode=self.mode) as span:
+            fast_intent = self._fast_path_intent(query)
+            if fast_intent is not None:
+                span.set_attributes(source="classifier", intent=fast_intent["intent"])
+                return fast_intent
+
+            start_time = time.perf_counter()
+            prompt = self._build_prompt(query=query)
+            response = await self.aget_llm_response(prompt=prompt)
+            extracted_json = self._extract_json(response=response['llm_response'])
+            span.set_attributes(source="llm", intent=str(
+                extracted_json.get("intent") if isinstance(extracted_json, dict) else None))
+            await asyncio.get_running_loop().run_in_executor(
+                self.io_executor, self._log_llm_intent,
+                query, extracted_json, time.perf_counter() - start_time)
 
-        if match:
-            json_str = match.group(0)
-            try:
-                extracted_json = json.loads(json_str)
-                return extracted_json
-            except json.JSONDecodeError as e:
-                raise
+            return extracted_json
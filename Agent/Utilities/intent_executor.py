@@ -1,7 +1,8 @@
 import logging
-from typing import Dict
-from Agents.dataframe_agent import DataFrameAgent
-from Agents.email_agent import EmailAgent
+from typing import Dict, Optional
+from Utilities.agent_executors import AgentExecutors
+from Utilities.agent_registry import AgentRegistry
+from Utilities.tracing import tracer
 
 logging.basicConfig(level=logging.INFO,
                     format='%(asctime)s - %(levelname)s - %(message)s')
@@ -14,8 +15,44 @@ class IntentExecutor:
     Methods:
         select_and_execute_agent_from_intent(intent_body):
             Executes the corresponding action based on the intent provided in the dictionary.
+        aselect_and_execute_agent_from_intent(intent_body):
+            Awaitable version that uses the agents' async LLM calls.
+
+    When the intent body carries `arguments` from combined extraction, the
+    agent acts on them directly; if they are unusable the agent's own
+    extraction call is used as a fallback.
+
+    The awaitable version holds a concurrency slot of the intent while the
+    agent runs and handles arguments on the CPU pool.
     """
 
+    def __init__(self, registry: Optional[AgentRegistry] = None,
+                 executors: Optional[AgentExecutors] = None):
+        """
+        Initializes the executor with an agent registry built once.
+
+        Args:
+            registry (Optional[AgentRegistry]): Registry of long-lived agents.
+                A new one is built when omitted.
+            executors (Optional[AgentExecutors]): Worker pools and per-intent
+                limits. New ones are built when omitted.
+        """
+        self.executors = executors or AgentExecutors()
+        self.registry = registry or AgentRegistry(cpu_executor=self.executors.cpu_pool)
+
+    def _execute_from_arguments(self, intent: str, intent_body: Dict[str, str]) -> Optional[str]:
+        arguments = intent_body.get('arguments')
+        ARGUMENT_MAP = self.registry.get_argument_handlers()
+        if not arguments or intent not in ARGUMENT_MAP:
+            return None
+
+        logging.info(f"Executing intent: {intent} with extracted arguments: {arguments}")
+        response_based_on_intent = ARGUMENT_MAP[intent](arguments=arguments)
+        if response_based_on_intent is None:
+            logging.warning(
+                f"Unusable arguments for {intent}, falling back to agent extraction.")
+        return response_based_on_intent
+
     def select_and_execute_agent_from_intent(self, intent_body: Dict[str, str]) -> str:
         """
         Selects and executes an agent action based on the given intent.
@@ -29,10 +66,7 @@ class IntentExecutor:
         Raises:
             ValueError: If the intent is not recognized or the action is invalid.
         """
-        INTENT_MAP = {
-            "write_email": EmailAgent().generate_email,
-            "search_dataframe": DataFrameAgent().get_filtred_data
-        }
+        INTENT_MAP = self.registry.get_handlers()
 
         try:
             intent = intent_body.get('intent')
@@ -45,6 +79,11 @@ class IntentExecutor:
             if intent not in INTENT_MAP:
                 raise ValueError(f"Unknown intent: {intent}")
 
+            response_based_on_intent = self._execute_from_arguments(
+                intent, intent_body)
+            if response_based_on_intent is not None:
+                return response_based_on_intent
+
             logging.info(f"Executing intent: {intent} with action: {action}")
             response_based_on_intent = INTENT_MAP[intent](action=action)
             logging.info(f"Response from {intent}: {response_based_on_intent}")
@@ -54,3 +93,47 @@ class IntentExecutor:
         except Exception as e:
             logging.error(f"Error executing intent: {e}")
             raise
+
+    async def aselect_and_execute_agent_from_intent(self, intent_body: Dict[str, str]) -> str:
+        """
+        Awaitable version of `select_and_execute_agent_from_intent`.
+
+        Args:
+            intent_body (Dict[str, str]): A dictionary containing 'intent' and 'action'.
+
+        Returns:
+            str: The response from the executed agent action.
+
+        Raises:
+            ValueError: If the intent is not recognized or the action is invalid.
+        """
+        INTENT_MAP = self.registry.get_async_handlers()
+
+        try:
+            intent = intent_body.get('intent')
+            action = intent_body.get('action')
+
+            if not intent or not action:
+                raise ValueError(
+                    "Intent body must contain both 'intent' and 'action' keys.")
+
+            if intent not in INTENT_MAP:
+                raise ValueError(f"Unknown intent: {intent}")
+
+            async with self.executors.limit(intent):
+                with tracer.span("agent_execution", intent=intent) as span:
+                    response_based_on_intent = await self.executors.run_cpu(
+                        self._execute_from_arguments, intent, intent_body)
+                    span.set_attributes(from_arguments=response_based_on_intent is not None)
+                    if response_based_on_intent is not None:
+                        return response_based_on_intent
+
+                    logging.info(f"Executing intent: {intent} with action: {action}")
+                    response_based_on_intent = await INTENT_MAP[intent](action=action)
+            logging.info(f"Response from {intent}: {response_based_on_intent}")
+
+            return response_based_on_intent
+
+        except Exception as e:
+            logging.error(f"Error executing intent: {e}")
+            raise
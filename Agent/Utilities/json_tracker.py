@@ -0,0 +1,63 @@
+import json
+from typing import Any, Dict, Iterator, Optional
+
+
+def _iter_json_objects(text: str) -> Iterator[str]:
+    """
+    Yields every balanced top-level `{...}` span of `text` in order. Braces
+    within string literals (including escaped quotes) are ignored; text
+    outside an object is skipped.
+    """
+    depth = 0
+    in_string = False
+    escaped = False
+    start = 0
+    for offset, char in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == "{":
+            if depth == 0:
+                start = offset
+            depth += 1
+        elif depth == 0:
+            continue
+        elif char == '"':
+            in_string = True
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                yield text[start:offset + 1]
+
+
+def extract_json(response: str) -> Optional[Dict[str, Any]]:
+    """
+    Returns the first balanced JSON object in `response` that decodes.
+
+    Unlike a greedy `\\{.*\\}` match, text after the object (a trailing
+    explanation, another object, stray braces) does not break decoding.
+
+    Args:
+        response (str): Model output potentially containing a JSON object.
+
+    Returns:
+        Optional[Dict[str, Any]]: The decoded object, or None if the response
+        holds no balanced object.
+
+    Raises:
+        json.JSONDecodeError: If no balanced object decodes; the error of the
+        first candidate is raised.
+    """
+    first_error = None
+    for candidate in _iter_json_objects(response):
+        try:
+            return json.loads(candidate)
+        except json.JSONDecodeError as e:
+            first_error = first_error or e
+    if first_error is not None:
+        raise first_error
+    return None
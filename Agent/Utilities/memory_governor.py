@@ -0,0 +1,95 @@
+import gc
+import logging
+import os
+import threading
+import time
+from typing import Callable, List, Optional
+
+logging.basicConfig(level=logging.INFO,
+                    format='%(asctime)s - %(levelname)s - %(message)s')
+
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def current_rss_mb() -> Optional[float]:
+    """
+    Resident set size of this process in MB, read from /proc/self/statm.
+    Returns None where /proc is unavailable.
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * PAGE_SIZE / (1024 * 1024)
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+class MemoryGovernor:
+    """
+    Runs memory cleanup only when it is needed instead of after every request:
+    when the process RSS exceeds `rss_limit_mb`, when an optional pressure
+    probe reports pressure, or once every `every_n_requests` requests.
+
+    RSS rarely shrinks after `gc.collect`, so RSS- and pressure-triggered
+    cleanups are at least `min_interval_seconds` apart; otherwise a process
+    above the limit would collect after every request again.
+    """
+
+    def __init__(self, every_n_requests: int, rss_limit_mb: float,
+                 cleanup: Optional[List[Callable[[], None]]] = None,
+                 pressure_probe: Optional[Callable[[], bool]] = None,
+                 min_interval_seconds: float = 60.0) -> None:
+        """
+        Args:
+            every_n_requests (int): Periodic cleanup interval; 0 disables it.
+            rss_limit_mb (float): RSS above which cleanup runs; 0 disables it.
+            cleanup (Optional[List[Callable]]): Extra cleanup steps run after `gc.collect`.
+            pressure_probe (Optional[Callable]): Returns True under external
+                (e.g. GPU) memory pressure.
+            min_interval_seconds (float): Minimum time between two RSS- or
+                pressure-triggered cleanups.
+        """
+        self.every_n_requests = every_n_requests
+        self.rss_limit_mb = rss_limit_mb
+        self.cleanup = cleanup or []
+        self.pressure_probe = pressure_probe
+        self.min_interval_seconds = min_interval_seconds
+        self.requests = 0
+        self.cleanups = 0
+        self._last_cleanup = float("-inf")
+        self._lock = threading.Lock()
+
+    def _should_clean(self) -> Optional[str]:
+        if self.every_n_requests and self.requests % self.every_n_requests == 0:
+            return "periodic"
+        if time.monotonic() - self._last_cleanup < self.min_interval_seconds:
+            return None
+        if self.rss_limit_mb:
+            rss = current_rss_mb()
+            if rss is not None and rss > self.rss_limit_mb:
+                return f"rss {rss:.0f}MB"
+        if self.pressure_probe is not None and self.pressure_probe():
+            return "pressure"
+        return None
+
+    def after_request(self) -> bool:
+        """
+        Records a finished request and cleans up if required.
+
+        Returns:
+            bool: True if a cleanup ran.
+        """
+        with self._lock:
+            self.requests += 1
+            reason = self._should_clean()
+            if reason is None:
+                return False
+
+            start_time = time.perf_counter()
+            gc.collect()
+            for step in self.cleanup:
+                step()
+            self.cleanups += 1
+            self._last_cleanup = time.monotonic()
+        logging.info(
+            f"Memory cleanup ({reason}) took {(time.perf_counter() - start_time) * 1000:.1f}ms.")
+        return True
@@ -0,0 +1,55 @@
+import logging
+from string import Formatter
+from typing import List
+
+from Constants.prompt_templated import (
+    INTENT_DETECTION_PROMPT_TEMPLATE,
+    COMBINED_INTENT_PROMPT_TEMPLATE,
+)
+from Constants.Agents.email_agent_constants import EMAIL_PROMPT_TEMPLATE
+from Constants.Agents.dataframe_agent_constants import DATAFRAME_AGENT_PROMPT_TEMPLATE
+from Mixins.llm_response_mixin import LLMResponseMixin
+
+logging.basicConfig(level=logging.INFO,
+                    format='%(asctime)s - %(levelname)s - %(message)s')
+
+PROMPT_TEMPLATES = [
+    INTENT_DETECTION_PROMPT_TEMPLATE,
+    COMBINED_INTENT_PROMPT_TEMPLATE,
+    EMAIL_PROMPT_TEMPLATE,
+    DATAFRAME_AGENT_PROMPT_TEMPLATE,
+]
+
+
+def template_prefix(template: str) -> str:
+    """
+    Returns the rendered text of a prompt template up to its first placeholder.
+    """
+    literal_parts = []
+    for literal_text, field_name, _, _ in Formatter().parse(template):
+        literal_parts.append(literal_text)
+        if field_name is not None:
+            break
+    return "".join(literal_parts)
+
+
+def get_prompt_prefixes() -> List[str]:
+    return [template_prefix(template) for template in PROMPT_TEMPLATES]
+
+
+class PromptPrefixRegistrar(LLMResponseMixin):
+    """
+    Registers the fixed instruction preambles of every prompt template with
+    the model server so it can resume from their precomputed state.
+    """
+
+    async def register_all(self) -> int:
+        """
+        Returns:
+            int: Number of prefixes the model server keeps state for.
+        """
+        registered = 0
+        for prefix in get_prompt_prefixes():
+            registered += await self.aregister_prompt_prefix(prefix)
+        logging.info(f"Registered {registered} prompt prefixes with the model server.")
+        return registered
@@ -0,0 +1,176 @@
+import itertools
+import json
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from Constants.cache_constants import (
+    QUERY_CACHE_MAX_BYTES,
+    QUERY_CACHE_TTL_BY_INTENT,
+    QUERY_CACHE_DEFAULT_TTL,
+    DATASET_DEPENDENT_INTENTS,
+    QUERY_CACHE_STATS_MAX_KEYS,
+)
+
+logging.basicConfig(level=logging.INFO,
+                    format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Sentence punctuation at the end of a word. Operators, decimal points and
+# the `@`/`.` inside tokens such as e-mail addresses are part of the query.
+SENTENCE_PUNCTUATION_PATTERN = re.compile(r"[.,;:!?]+(?=\s|$)")
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+class QueryCache:
+    """
+    End-to-end cache of Agent API answers keyed on the normalized query text.
+
+    Each entry remembers the intent it was answered with and, for intents in
+    `DATASET_DEPENDENT_INTENTS`, the dataset version it was computed from; a
+    lookup under a different version drops the entry. TTLs are set per
+    intent and total memory is bounded with LRU eviction.
+    """
+
+    def __init__(self, max_bytes: int = QUERY_CACHE_MAX_BYTES,
+                 ttl_by_intent: Optional[Dict[str, float]] = None,
+                 default_ttl: float = QUERY_CACHE_DEFAULT_TTL) -> None:
+        self.max_bytes = max_bytes
+        self.ttl_by_intent = dict(
+            QUERY_CACHE_TTL_BY_INTENT if ttl_by_intent is None else ttl_by_intent)
+        self.default_ttl = default_ttl
+
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def normalize(query: str) -> str:
+        """
+        Lower-cases the query, drops sentence punctuation ending a word and
+        collapses whitespace. "TotalVisits > 5?" and "totalvisits > 5" share
+        a key; "TotalVisits < 5" and "TotalVisits > 5" do not.
+        """
+        query = SENTENCE_PUNCTUATION_PATTERN.sub(" ", query.lower())
+        return WHITESPACE_PATTERN.sub(" ", query).strip()
+
+    @staticmethod
+    def _is_cacheable(response: Any) -> bool:
+        if isinstance(response, str):
+            try:
+                response = json.loads(response)
+            except json.JSONDecodeError:
+                return False
+        return isinstance(response, (dict, list)) and not (
+            isinstance(response, dict) and "error" in response)
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry["size"]
+
+    def get(self, query: str, dataset_version: str) -> Optional[Dict[str, Any]]:
+        """
+        Returns the cached `intent` and `query_response` for a query, or None.
+
+        Args:
+            query (str): The raw user query.
+            dataset_version (str): Current version of the filtered dataset.
+        """
+        if not isinstance(query, str):
+            return None
+        key = self.normalize(query)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (
+                    entry["expires_at"] < now
+                    or (entry["intent_name"] in DATASET_DEPENDENT_INTENTS
+                        and entry["dataset_version"] != dataset_version)):
+                self._remove(key)
+                entry = None
+
+            if entry is None:
+                self._misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return {"intent": entry["intent"], "query_response": entry["query_response"]}
+
+    def set(self, query: str, intent_body: Dict[str, Any], query_response: Any,
+            dataset_version: str) -> bool:
+        """
+        Stores an answer if its intent has a TTL and it is not an error.
+
+        Returns:
+            bool: True if the answer was cached.
+        """
+        intent = intent_body.get("intent") if isinstance(intent_body, dict) else None
+        ttl = self.ttl_by_intent.get(intent, self.default_ttl)
+        if not isinstance(query, str) or ttl <= 0 or not self._is_cacheable(query_response):
+            return False
+
+        size = len(json.dumps(query_response, default=str)) + len(query)
+        if size > self.max_bytes:
+            return False
+
+        key = self.normalize(query)
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = {
+                "intent": intent_body,
+                "intent_name": intent,
+                "query_response": query_response,
+                "dataset_version": dataset_version,
+                "expires_at": time.time() + ttl,
+                "size": size,
+            }
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+        return True
+
+    def flush(self) -> int:
+        """
+        Drops every entry and returns how many were removed.
+        """
+        with self._lock:
+            removed = len(self._entries)
+            self._entries.clear()
+            self._bytes = 0
+        logging.info(f"Query cache flushed, {removed} entries removed.")
+        return removed
+
+    def stats(self, max_keys: int = QUERY_CACHE_STATS_MAX_KEYS) -> Dict[str, Any]:
+        """
+        Returns counters, memory use and a summary of the `max_keys` most
+        recently used entries.
+        """
+        now = time.time()
+        with self._lock:
+            recent = list(itertools.islice(reversed(self._entries.items()), max_keys))
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "ttl_by_intent": self.ttl_by_intent,
+                "keys": [
+                    {
+                        "query": key,
+                        "intent": entry["intent_name"],
+                        "dataset_version": entry["dataset_version"],
+                        "expires_in": round(entry["expires_at"] - now, 1),
+                        "bytes": entry["size"],
+                    }
+                    for key, entry in recent
+                ],
+                "keys_truncated": len(self._entries) > len(recent),
+            }
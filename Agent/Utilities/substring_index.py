@@ -0,0 +1,161 @@
+import logging
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s"
+)
+
+REGEX_SPECIAL_CHARS = set(".^$*+?{}[]\\|()")
+NGRAM_SIZE = 3
+
+
+def _ngrams(text: str) -> set:
+    return {text[i:i + NGRAM_SIZE] for i in range(len(text) - NGRAM_SIZE + 1)}
+
+
+class ColumnSubstringIndex:
+    """
+    Trigram index over the distinct string values of a single column.
+
+    Each distinct value (as produced by `Series.astype(str)`) is lower-cased and
+    split into trigrams; postings map a trigram to the ids of the distinct
+    values containing it, and every distinct value maps to the row positions
+    holding it. A lookup intersects the postings of the pattern's trigrams and
+    verifies only the surviving candidates.
+
+    Attributes:
+        values (List[str]): Lower-cased distinct values.
+        row_ids (List[np.ndarray]): Row positions for each distinct value.
+    """
+
+    def __init__(self, series: pd.Series):
+        """
+        Builds the index for one column.
+
+        Args:
+            series (pd.Series): Column to index.
+        """
+        as_str = series.astype(str)
+        codes, uniques = pd.factorize(as_str, use_na_sentinel=True)
+
+        valid = codes >= 0
+        positions = np.flatnonzero(valid)
+        valid_codes = codes[valid]
+        order = np.argsort(valid_codes, kind="stable")
+        boundaries = np.flatnonzero(np.diff(valid_codes[order])) + 1
+
+        self.row_ids: List[np.ndarray] = np.split(positions[order], boundaries) \
+            if len(order) else []
+        self.values: List[str] = [str(value).lower() for value in uniques]
+
+        postings: Dict[str, List[int]] = defaultdict(list)
+        for value_id, value in enumerate(self.values):
+            for gram in _ngrams(value):
+                postings[gram].append(value_id)
+        self.postings: Dict[str, np.ndarray] = {
+            gram: np.asarray(ids, dtype=np.int64) for gram, ids in postings.items()
+        }
+
+    def _candidate_value_ids(self, pattern: str) -> np.ndarray:
+        grams = _ngrams(pattern)
+        if not grams:
+            return np.arange(len(self.values), dtype=np.int64)
+
+        lists = []
+        for gram in grams:
+            ids = self.postings.get(gram)
+            if ids is None:
+                return np.empty(0, dtype=np.int64)
+            lists.append(ids)
+
+        lists.sort(key=len)
+        candidates = lists[0]
+        for ids in lists[1:]:
+            candidates = np.intersect1d(candidates, ids, assume_unique=True)
+            if not len(candidates):
+                break
+        return candidates
+
+    def lookup(self, pattern: str) -> np.ndarray:
+        """
+        Returns the sorted row positions whose value contains `pattern`,
+        ignoring case.
+
+        Args:
+            pattern (str): Literal substring to search for.
+
+        Returns:
+            np.ndarray: Sorted row positions.
+        """
+        pattern = pattern.lower()
+        matches = [
+            self.row_ids[value_id]
+            for value_id in self._candidate_value_ids(pattern)
+            if pattern in self.values[value_id]
+        ]
+        if not matches:
+            return np.empty(0, dtype=np.int64)
+        return np.sort(np.concatenate(matches))
+
+
+class DataFrameSubstringIndex:
+    """
+    Lazily built per-column substring indexes for one DataFrame snapshot.
+
+    A column is indexed the first time it is queried and reused until the
+    snapshot is replaced.
+
+    Attributes:
+        dataframe (pd.DataFrame): The indexed DataFrame.
+    """
+
+    def __init__(self, dataframe: pd.DataFrame):
+        self.dataframe = dataframe
+        self._columns: Dict[str, ColumnSubstringIndex] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def is_indexable(pattern: str) -> bool:
+        """
+        Whether a lookup for `pattern` gives the same result as
+        `str.contains(pattern, case=False)`. Regex syntax and non-ASCII text
+        fall back to a full scan.
+        """
+        return pattern.isascii() and not (REGEX_SPECIAL_CHARS & set(pattern))
+
+    def _column_index(self, column: str) -> ColumnSubstringIndex:
+        index = self._columns.get(column)
+        if index is None:
+            with self._lock:
+                index = self._columns.get(column)
+                if index is None:
+                    start_time = time.perf_counter()
+                    index = ColumnSubstringIndex(self.dataframe[column])
+                    self._columns[column] = index
+                    logging.info(
+                        f"Built substring index for '{column}' in "
+                        f"{time.perf_counter() - start_time:.3f} seconds.")
+        return index
+
+    def contains(self, column: str, pattern: str) -> Optional[np.ndarray]:
+        """
+        Returns the row positions of `column` containing `pattern`, ignoring
+        case, or None when the pattern cannot be served from the index.
+
+        Args:
+            column (str): Column to search.
+            pattern (str): Substring to search for.
+
+        Returns:
+            Optional[np.ndarray]: Sorted row positions, or None.
+        """
+        if not self.is_indexable(pattern):
+            return None
+        return self._column_index(column).lookup(pattern)
@@ -0,0 +1,494 @@
+import contextlib
+import contextvars
+import json
+import logging
+import os
+import queue
+import random
+import re
+import threading
+import time
+import urllib.request
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from Constants.api_constants import (
+    TRACE_SERVICE_NAME,
+    TRACE_SAMPLE_RATE,
+    TRACE_SLOW_SECONDS,
+    TRACE_EXPORTER,
+    TRACE_JSONL_PATH,
+    TRACE_OTLP_ENDPOINT,
+    TRACE_EXPORT_BATCH_SIZE,
+    TRACE_EXPORT_INTERVAL_SECONDS,
+    TRACE_QUEUE_MAX_SPANS,
+)
+
+logging.basicConfig(level=logging.INFO,
+                    format='%(asctime)s - %(levelname)s - %(message)s')
+
+TRACEPARENT_HEADER = "traceparent"
+_TRACEPARENT = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+_OTLP_SPAN_KINDS = {"internal": 1, "server": 2, "client": 3}
+
+
+class SpanContext:
+    """
+    Identifiers of a span as carried by a W3C `traceparent` header.
+    """
+
+    __slots__ = ("trace_id", "span_id", "sampled")
+
+    def __init__(self, trace_id: str, span_id: str, sampled: bool):
+        self.trace_id = trace_id
+        self.span_id = span_id
+        self.sampled = sampled
+
+    @classmethod
+    def from_traceparent(cls, header: Optional[str]) -> Optional["SpanContext"]:
+        """
+        Parses a `traceparent` header. Returns None for a missing or
+        malformed header, or the all-zero ids the spec declares invalid.
+        """
+        match = _TRACEPARENT.match((header or "").strip().lower())
+        if match is None:
+            return None
+        trace_id, span_id, flags = match.groups()
+        if trace_id == "0" * 32 or span_id == "0" * 16:
+            return None
+        return cls(trace_id, span_id, bool(int(flags, 16) & 1))
+
+    def to_traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-{'01' if self.sampled else '00'}"
+
+
+class Span:
+    """
+    A timed operation within a trace.
+
+    Every span is recorded, sampled or not, so its ids can be propagated.
+    Finished spans are kept on the local root span (the first span of the
+    trace in this process) and handed to the exporter when the root ends,
+    if the trace is sampled or the root took at least the slow threshold.
+    """
+
+    __slots__ = ("tracer", "name", "kind", "context", "parent_id", "start_ns", "end_ns",
+                 "attributes", "error", "_root", "_finished")
+
+    def __init__(self, tracer: "Tracer", name: str, kind: str, context: SpanContext,
+                 parent_id: Optional[str], root: Optional["Span"],
+                 start_ns: Optional[int] = None, attributes: Optional[Dict[str, Any]] = None):
+        self.tracer = tracer
+        self.name = name
+        self.kind = kind
+        self.context = context
+        self.parent_id = parent_id
+        self.start_ns = start_ns or time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes = dict(attributes or {})
+        self.error: Optional[str] = None
+        self._root = root or self
+        self._finished: List["Span"] = []
+
+    @property
+    def trace_id(self) -> str:
+        return self.context.trace_id
+
+    @property
+    def duration_seconds(self) -> float:
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1e9
+
+    def set_attributes(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+
+    def record_error(self, error: BaseException) -> None:
+        self.error = f"{type(error).__name__}: {error}"
+
+    def end(self, end_ns: Optional[int] = None) -> None:
+        if self.end_ns is not None:
+            return
+        self.end_ns = end_ns or time.time_ns()
+        root = self._root
+        if root is not self:
+            if root.end_ns is None:
+                root._finished.append(self)
+            return
+        if self.context.sampled or self.duration_seconds >= self.tracer.slow_seconds:
+            self._finished.append(self)
+            self.tracer.export(self._finished)
+        self._finished = []
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.context.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "kind": self.kind,
+            "service": self.tracer.service_name,
+            "start_time_unix_nano": self.start_ns,
+            "duration_ms": round((self.end_ns - self.start_ns) / 1e6, 3),
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+
+class JSONLSpanExporter:
+    """
+    Appends finished spans to a local file, one JSON object per line.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def export(self, spans: List[Span]) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, "a") as f:
+            f.writelines(json.dumps(span.to_dict(), default=str) + "\n" for span in spans)
+
+
+class OTLPSpanExporter:
+    """
+    Posts finished spans to an OpenTelemetry collector over OTLP/HTTP with
+    the JSON encoding (e.g. http://localhost:4318/v1/traces).
+    """
+
+    def __init__(self, endpoint: str, service_name: str, timeout: float = 5.0):
+        self.endpoint = endpoint
+        self.service_name = service_name
+        self.timeout = timeout
+
+    @staticmethod
+    def _value(value: Any) -> Dict[str, Any]:
+        if isinstance(value, bool):
+            return {"boolValue": value}
+        if isinstance(value, int):
+            return {"intValue": str(value)}
+        if isinstance(value, float):
+            return {"doubleValue": value}
+        return {"stringValue": str(value)}
+
+    def _span(self, span: Span) -> Dict[str, Any]:
+        encoded = {
+            "traceId": span.trace_id,
+            "spanId": span.context.span_id,
+            "name": span.name,
+            "kind": _OTLP_SPAN_KINDS.get(span.kind, 1),
+            "startTimeUnixNano": str(span.start_ns),
+            "endTimeUnixNano": str(span.end_ns),
+            "attributes": [{"key": key, "value": self._value(value)}
+                           for key, value in span.attributes.items()],
+            "status": {"code": 2, "message": span.error} if span.error else {"code": 1},
+        }
+        if span.parent_id:
+            encoded["parentSpanId"] = span.parent_id
+        return encoded
+
+    def export(self, spans: List[Span]) -> None:
+        body = json.dumps({"resourceSpans": [{
+            "resource": {"attributes": [
+                {"key": "service.name", "value": {"stringValue": self.service_name}}]},
+            "scopeSpans": [{"scope": {"name": self.service_name},
+                            "spans": [self._span(span) for span in spans]}],
+        }]}).encode("utf-8")
+        request = urllib.request.Request(
+            self.endpoint, data=body, headers={"Content-Type": "application/json"})
+        with urllib.request.urlopen(request, timeout=self.timeout):
+            pass
+
+
+class Tracer:
+    """
+    Minimal distributed tracer with W3C trace-context propagation.
+
+    The current span lives in a context variable, so `span()` blocks nest
+    across awaits and into worker pools that run in a copy of the caller's
+    context. `inject()` adds the `traceparent` header for outgoing calls
+    and `TracingMiddleware` continues incoming ones.
+
+    Sampling is decided once per trace: a trace continued from an incoming
+    header follows the caller's decision, a new trace is sampled with
+    probability `sample_rate`. Traces whose local root took at least
+    `slow_seconds` are exported even when not sampled, so slow requests can
+    be broken down. Export runs on a background thread in batches; spans
+    are dropped rather than blocking requests when the queue is full.
+    """
+
+    def __init__(self, service_name: str, exporter: Optional[Any] = None,
+                 sample_rate: float = 1.0, slow_seconds: float = float("inf"),
+                 batch_size: int = 256, interval_seconds: float = 2.0,
+                 max_queued_spans: int = 10_000):
+        """
+        Args:
+            service_name (str): Name the spans of this process are exported under.
+            exporter (Optional[Any]): Object with `export(spans)`. Spans are
+                recorded for propagation but never exported when omitted.
+            sample_rate (float): Probability a new trace is sampled.
+            slow_seconds (float): Local root duration above which a trace is
+                exported regardless of sampling.
+            batch_size (int): Spans per export call.
+            interval_seconds (float): Longest a finished span waits for export.
+            max_queued_spans (int): Spans buffered for export before new ones are dropped.
+        """
+        self.service_name = service_name
+        self.exporter = exporter
+        self.sample_rate = sample_rate
+        self.slow_seconds = slow_seconds
+        self.batch_size = batch_size
+        self.interval_seconds = interval_seconds
+        self._current: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar(
+            f"{service_name}_current_span", default=None)
+        self._queue: "queue.Queue[Optional[Span]]" = queue.Queue(maxsize=max_queued_spans)
+        self._worker: Optional[threading.Thread] = None
+        self._worker_lock = threading.Lock()
+        self.exported_spans = 0
+        self.dropped_spans = 0
+        self.failed_exports = 0
+
+    @staticmethod
+    def _new_id(bits: int) -> str:
+        return f"{random.getrandbits(bits):0{bits // 4}x}"
+
+    def current_span(self) -> Optional[Span]:
+        return self._current.get()
+
+    def start_span(self, name: str, kind: str = "internal",
+                   parent: Optional[SpanContext] = None, start_ns: Optional[int] = None,
+                   **attributes: Any) -> Span:
+        """
+        Starts a span without making it current. Its parent is `parent` (a
+        remote context) or else the current span; without either it starts
+        a new trace.
+        """
+        current = self.current_span()
+        if parent is None and current is not None:
+            context = SpanContext(current.trace_id, self._new_id(64), current.context.sampled)
+            return Span(self, name, kind, context, current.context.span_id, current._root,
+                        start_ns, attributes)
+        if parent is not None:
+            context = SpanContext(parent.trace_id, self._new_id(64), parent.sampled)
+            parent_id = parent.span_id
+        else:
+            context = SpanContext(self._new_id(128), self._new_id(64),
+                                  random.random() < self.sample_rate)
+            parent_id = None
+        return Span(self, name, kind, context, parent_id, None, start_ns, attributes)
+
+    @contextlib.contextmanager
+    def use_span(self, span: Span, end_on_exit: bool = True) -> Iterator[Span]:
+        """
+        Makes `span` current for the block and records an exception leaving it.
+        """
+        token = self._current.set(span)
+        try:
+            yield span
+        except Exception as e:
+            span.record_error(e)
+            raise
+        finally:
+            try:
+                self._current.reset(token)
+            except ValueError:
+                # An abandoned async generator is closed from another context.
+                pass
+            if end_on_exit:
+                span.end()
+
+    def span(self, name: str, kind: str = "internal", **attributes: Any):
+        """
+        Context manager for a child span of the current span.
+        """
+        return self.use_span(self.start_span(name, kind, **attributes))
+
+    def record_span(self, name: str, start_ns: int, end_ns: int, **attributes: Any) -> None:
+        """
+        Records a finished child of the current span from known timings,
+        e.g. stages measured by another component.
+        """
+        self.start_span(name, start_ns=start_ns, **attributes).end(end_ns)
+
+    def set_attributes(self, **attributes: Any) -> None:
+        """
+        Adds attributes to the current span, if any.
+        """
+        span = self.current_span()
+        if span is not None:
+            span.set_attributes(**attributes)
+
+    def inject(self, headers: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+        """
+        Returns `headers` with the `traceparent` of the current span, for an
+        outgoing request.
+        """
+        headers = dict(headers or {})
+        span = self.current_span()
+        if span is not None:
+            headers[TRACEPARENT_HEADER] = span.context.to_traceparent()
+        return headers
+
+    def export(self, spans: List[Span]) -> None:
+        if self.exporter is None:
+            return
+        self._ensure_worker()
+        for span in spans:
+            try:
+                self._queue.put_nowait(span)
+            except queue.Full:
+                self.dropped_spans += 1
+
+    def _ensure_worker(self) -> None:
+        if self._worker is not None:
+            return
+        with self._worker_lock:
+            if self._worker is None:
+                self._worker = threading.Thread(
+                    target=self._export_loop, name="span-exporter", daemon=True)
+                self._worker.start()
+
+    def _flush(self, batch: List[Span]) -> None:
+        try:
+            self.exporter.export(batch)
+            self.exported_spans += len(batch)
+        except Exception as e:
+            self.failed_exports += 1
+            logging.warning(f"Could not export {len(batch)} spans: {e}")
+
+    def _export_loop(self) -> None:
+        stopping = False
+        while not stopping:
+            batch: List[Span] = []
+            deadline = time.monotonic() + self.interval_seconds
+            while len(batch) < self.batch_size:
+                try:
+                    span = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if span is None:
+                    stopping = True
+                    break
+                batch.append(span)
+            if batch:
+                self._flush(batch)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "service": self.service_name,
+            "exporter": type(self.exporter).__name__ if self.exporter else None,
+            "sample_rate": self.sample_rate,
+            "slow_seconds": self.slow_seconds,
+            "queued_spans": self._queue.qsize(),
+            "exported_spans": self.exported_spans,
+            "dropped_spans": self.dropped_spans,
+            "failed_exports": self.failed_exports,
+        }
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """
+        Exports the spans still queued and stops the export thread.
+        """
+        if self._worker is None:
+            return
+        self._queue.put(None)
+        self._worker.join(timeout)
+        self._worker = None
+
+
+class TracingMiddleware:
+    """
+    ASGI middleware that runs every HTTP request in a server span,
+    continuing the trace of an incoming `traceparent` header, and returns
+    the request's `traceparent` in the response headers. Streaming responses
+    are covered until their last chunk is sent.
+    """
+
+    def __init__(self, app, tracer: Tracer):
+        self.app = app
+        self.tracer = tracer
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        parent = SpanContext.from_traceparent(
+            headers.get(TRACEPARENT_HEADER.encode("latin-1"), b"").decode("latin-1"))
+        span = self.tracer.start_span(
+            f"{scope['method']} {scope['path']}", kind="server", parent=parent,
+            **{"http.method": scope["method"], "http.target": scope["path"]})
+
+        async def send_with_traceparent(message):
+            if message["type"] == "http.response.start":
+                span.set_attributes(**{"http.status_code": message["status"]})
+                if message["status"] >= 500:
+                    span.error = f"HTTP {message['status']}"
+                message = dict(message)
+                message["headers"] = list(message.get("headers", [])) + [
+                    (TRACEPARENT_HEADER.encode("latin-1"),
+                     span.context.to_traceparent().encode("latin-1"))]
+            await send(message)
+
+        with self.tracer.use_span(span):
+            await self.app(scope, receive, send_with_traceparent)
+
+
+def _build_exporter() -> Optional[Any]:
+    if TRACE_EXPORTER == "jsonl":
+        return JSONLSpanExporter(TRACE_JSONL_PATH)
+    if TRACE_EXPORTER == "otlp":
+        return OTLPSpanExporter(TRACE_OTLP_ENDPOINT, TRACE_SERVICE_NAME)
+    if TRACE_EXPORTER != "none":
+        logging.warning(f"Unknown TRACE_EXPORTER '{TRACE_EXPORTER}', spans are not exported.")
+    return None
+
+
+tracer = Tracer(
+    service_name=TRACE_SERVICE_NAME,
+    exporter=_build_exporter(),
+    sample_rate=TRACE_SAMPLE_RATE,
+    slow_seconds=TRACE_SLOW_SECONDS,
+    batch_size=TRACE_EXPORT_BATCH_SIZE,
+    interval_seconds=TRACE_EXPORT_INTERVAL_SECONDS,
+    max_queued_spans=TRACE_QUEUE_MAX_SPANS,
+)
+
+
+def slowest_traces(paths: Iterable[str], top: int = 10) -> List[Tuple[float, List[Dict[str, Any]]]]:
+    """
+    Reads spans exported to JSONL files (e.g. of both services) and returns
+    the `top` slowest traces as (seconds, spans ordered by start time).
+    """
+    traces: Dict[str, List[Dict[str, Any]]] = {}
+    for path in paths:
+        with open(path) as f:
+            for line in f:
+                if line.strip():
+                    span = json.loads(line)
+                    traces.setdefault(span["trace_id"], []).append(span)
+
+    result = []
+    for spans in traces.values():
+        spans.sort(key=lambda span: span["start_time_unix_nano"])
+        start = spans[0]["start_time_unix_nano"]
+        end = max(span["start_time_unix_nano"] + span["duration_ms"] * 1e6 for span in spans)
+        result.append(((end - start) / 1e9, spans))
+    result.sort(key=lambda item: item[0], reverse=True)
+    return result[:top]
+
+
+def _print_slowest(paths: List[str]) -> None:
+    for seconds, spans in slowest_traces(paths):
+        print(f"trace {spans[0]['trace_id']} {seconds:8.3f} s")
+        start = spans[0]["start_time_unix_nano"]
+        for span in spans:
+            offset = (span["start_time_unix_nano"] - start) / 1e6
+            print(f"  {offset:10.1f} ms +{span['duration_ms']:10.1f} ms  "
+                  f"{span['service']:<18} {span['name']}"
+                  f"{'  ERROR ' + span['error'] if span['error'] else ''}")
+
+
+if __name__ == "__main__":
+    import sys
+
+    _print_slowest(sys.argv[1:])
@@ -0,0 +1,79 @@
+# Run from the Agent directory:
+#   python -m benchmarks.chunked_data_processor [rows] [--chunked-only]
+import multiprocessing
+import os
+import resource
+import sys
+import time
+
+import pandas as pd
+
+from Utilities.chunked_data_processor import MERGE_COLUMN, ChunkedDataProcessor
+from Utilities.data_processor import DataProcessor
+
+
+def _write_synthetic_inputs(rows: int, leads_path: str, sample_path: str,
+                            base_leads_path: str = "./DataFiles/Leads.csv",
+                            base_sample_path: str = "./DataFiles/SampleData.csv") -> None:
+    """
+    Writes `rows`-row copies of the lead files, repeating the base rows with
+    fresh Lead Numbers, one repetition at a time.
+    """
+    base_leads = pd.read_csv(base_leads_path)
+    base_sample = pd.read_csv(base_sample_path, encoding="ISO-8859-1")
+    written = 0
+    repetition = 0
+    while written < rows:
+        count = min(len(base_leads), rows - written)
+        offset = repetition * 10_000_000
+        for base, path in ((base_leads, leads_path), (base_sample, sample_path)):
+            block = base.head(count).copy()
+            block[MERGE_COLUMN] += offset
+            block.to_csv(path, mode="w" if written == 0 else "a",
+                         header=written == 0, index=False)
+        written += count
+        repetition += 1
+
+
+def _run_path(chunked: bool, leads_path: str, sample_path: str,
+              output_path: str, results) -> None:
+    start_time = time.perf_counter()
+    if chunked:
+        rows = ChunkedDataProcessor(leads_path, sample_path).prepare(output_path)
+    else:
+        data_processor = DataProcessor(df1_path=leads_path, df2_path=sample_path)
+        filtered_dataframe = data_processor.get_filter_data()
+        data_processor.save_filtered_dataframe(filtered_dataframe, output_path)
+        rows = len(filtered_dataframe)
+    results.put({
+        "rows": rows,
+        "wall_s": round(time.perf_counter() - start_time, 1),
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    })
+
+
+def main(rows: int, run_full: bool = True, directory: str = "/tmp") -> None:
+    """
+    Compares peak RSS and wall time of the full in-memory path and the
+    chunked path on synthetic inputs, each in a fresh process.
+    """
+    leads_path = os.path.join(directory, f"leads_{rows}.csv")
+    sample_path = os.path.join(directory, f"sample_{rows}.csv")
+    if not os.path.exists(leads_path):
+        _write_synthetic_inputs(rows, leads_path, sample_path)
+
+    context = multiprocessing.get_context("spawn")
+    for chunked in (True, False) if run_full else (True,):
+        results = context.Queue()
+        process = context.Process(target=_run_path, args=(
+            chunked, leads_path, sample_path,
+            os.path.join(directory, f"filtered_{rows}.csv"), results))
+        process.start()
+        process.join()
+        report = results.get() if process.exitcode == 0 else {"exitcode": process.exitcode}
+        print(f"rows={rows} {'chunked' if chunked else 'full':>7}: {report}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000,
+         run_full="--chunked-only" not in sys.argv)
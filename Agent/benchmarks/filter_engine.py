@@ -0,0 +1,62 @@
+# Run from the Agent directory: python -m benchmarks.filter_engine
+import time
+
+import numpy as np
+import pandas as pd
+
+from Utilities.filter_engine import FilterEngine
+from Utilities.substring_index import DataFrameSubstringIndex
+
+
+def main(rows: int = 1_000_000, repeat: int = 5) -> None:
+    """
+    Compares typed predicates with the stringified scan used before
+    (`astype(str).str.contains`) on synthetic leads.
+    """
+    rng = np.random.default_rng(0)
+    cities = np.array(["Mumbai", "Thane & Outskirts", "Other Cities", "Select", "Tier II Cities"])
+    sources = np.array(["Google", "Direct Traffic", "Organic Search", "Referral Sites"])
+    dataframe = pd.DataFrame({
+        "City": pd.Categorical(cities[rng.integers(0, len(cities), rows)]),
+        "Lead Source": pd.Categorical(sources[rng.integers(0, len(sources), rows)]),
+        "TotalVisits": rng.integers(0, 30, rows).astype(np.float64),
+        "Total Time Spent on Website": rng.integers(0, 2000, rows),
+        "Company": pd.array([f"Company {i % 5000}" for i in range(rows)], dtype="string"),
+    })
+    engine = FilterEngine(dataframe, DataFrameSubstringIndex(dataframe))
+
+    def timed(function) -> float:
+        function()
+        start_time = time.perf_counter()
+        for _ in range(repeat):
+            function()
+        return (time.perf_counter() - start_time) / repeat * 1000
+
+    cases = [
+        ("TotalVisits == 5",
+         lambda: dataframe[dataframe["TotalVisits"].astype(str).str.contains("5", case=False, na=False)],
+         {"column": "TotalVisits", "op": "eq", "value": 5}),
+        ("Time between 100 and 500",
+         None,
+         {"column": "Total Time Spent on Website", "op": "between", "value": [100, 500]}),
+        ("City == Mumbai",
+         lambda: dataframe[dataframe["City"].astype(str).str.contains("Mumbai", case=False, na=False)],
+         {"column": "City", "op": "eq", "value": "mumbai"}),
+        ("Company contains 123",
+         lambda: dataframe[dataframe["Company"].astype(str).str.contains("123", case=False, na=False)],
+         {"column": "Company", "op": "contains", "value": "123"}),
+        ("City in (..) AND TotalVisits > 10 OR Lead Source == Google",
+         None,
+         {"or": [{"and": [{"column": "City", "op": "in", "value": ["Mumbai", "Select"]},
+                          {"column": "TotalVisits", "op": "gt", "value": 10}]},
+                 {"column": "Lead Source", "op": "eq", "value": "Google"}]}),
+    ]
+    print(f"rows={rows}")
+    for name, stringified, predicate in cases:
+        typed_ms = timed(lambda: engine.filter(predicate))
+        stringified_ms = f"{timed(stringified):9.2f}" if stringified else "      n/a"
+        print(f"{name:<58} stringified {stringified_ms} ms   typed {typed_ms:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
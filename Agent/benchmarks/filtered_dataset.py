@@ -0,0 +1,55 @@
+# Run from the Agent directory: python -m benchmarks.filtered_dataset
+import multiprocessing
+import time
+from typing import Dict
+
+from Constants.data_constants import FILTERED_DATA_PATH, FILTERED_ARROW_PATH
+from Utilities.filtered_dataset import read_arrow, read_csv
+
+
+def _memory_status_mb() -> Dict[str, float]:
+    memory = {}
+    with open("/proc/self/status") as f:
+        for line in f:
+            key, _, value = line.partition(":")
+            if key in ("VmRSS", "RssAnon", "RssFile"):
+                memory[key] = int(value.split()[0]) / 1024
+    return memory
+
+
+def _measure_load(reader_name: str, path: str, results) -> None:
+    reader = {"csv": read_csv, "arrow": read_arrow}[reader_name]
+    memory_before = _memory_status_mb()
+    start_time = time.perf_counter()
+    dataframe = reader(path)
+    load_time = time.perf_counter() - start_time
+    memory_after = _memory_status_mb()
+    report = {"load_ms": round(load_time * 1000, 1)}
+    for key in memory_after:
+        report[f"{key}_delta_mb"] = round(memory_after[key] - memory_before.get(key, 0.0), 1)
+    report["dataframe_mb"] = round(
+        float(dataframe.memory_usage(deep=True).sum()) / (1024 * 1024), 1)
+    results.put(report)
+
+
+def main(csv_path: str = FILTERED_DATA_PATH,
+                 arrow_path: str = FILTERED_ARROW_PATH) -> Dict[str, Dict]:
+    """
+    Loads each format in a fresh process and reports load time, growth of
+    resident memory (anonymous and file-backed, i.e. memory-mapped pages)
+    and the DataFrame's own memory usage.
+    """
+    context = multiprocessing.get_context("spawn")
+    report = {}
+    for reader_name, path in (("csv", csv_path), ("arrow", arrow_path)):
+        results = context.Queue()
+        process = context.Process(target=_measure_load, args=(reader_name, path, results))
+        process.start()
+        report[reader_name] = results.get()
+        process.join()
+        print(f"{reader_name:>5}: {report[reader_name]}")
+    return report
+
+
+if __name__ == "__main__":
+    main()
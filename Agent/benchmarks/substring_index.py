@@ -0,0 +1,48 @@
+# Run from the Agent directory: python -m benchmarks.substring_index
+import time
+
+import numpy as np
+import pandas as pd
+
+from Utilities.substring_index import DataFrameSubstringIndex
+
+
+def main(row_counts=(100_000, 1_000_000, 10_000_000), distinct: int = 20_000) -> None:
+    """
+    Compares the indexed lookup with the `astype(str).str.contains` scan on
+    synthetic company names.
+    """
+    rng = np.random.default_rng(0)
+    words = np.array(["university", "college", "labs", "pets", "global",
+                      "systems", "academy", "foods", "health", "group"])
+    names = np.array([
+        f"{' '.join(rng.choice(words, 2))} {i}" for i in range(distinct)
+    ])
+    patterns = ["univ", "pets global", "health 12", "zzz"]
+
+    for rows in row_counts:
+        dataframe = pd.DataFrame({"Company": names[rng.integers(0, distinct, rows)]})
+
+        start_time = time.perf_counter()
+        index = DataFrameSubstringIndex(dataframe)
+        index.contains("Company", "warm")
+        build_time = time.perf_counter() - start_time
+
+        for pattern in patterns:
+            start_time = time.perf_counter()
+            expected = np.flatnonzero(dataframe["Company"].astype(str).str.contains(
+                pattern, case=False, na=False).to_numpy())
+            scan_time = time.perf_counter() - start_time
+
+            start_time = time.perf_counter()
+            result = index.contains("Company", pattern)
+            index_time = time.perf_counter() - start_time
+
+            assert np.array_equal(expected, result)
+            print(f"rows={rows:>10} pattern={pattern!r:<15} matches={len(result):>9} "
+                  f"scan={scan_time * 1000:9.2f}ms index={index_time * 1000:9.2f}ms")
+        print(f"rows={rows:>10} index build={build_time:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
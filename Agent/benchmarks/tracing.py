@@ -0,0 +1,35 @@
+# Run from the Agent directory: python -m benchmarks.tracing
+import time
+from typing import List
+
+from Utilities.tracing import Span, Tracer
+
+
+def main(spans: int = 200_000) -> None:
+    """
+    Cost of a span on the request path, sampled (exported to a discarding
+    exporter) and not sampled.
+    """
+    class DiscardingExporter:
+        def export(self, batch: List[Span]) -> None:
+            pass
+
+    for sample_rate in (0.0, 1.0):
+        bench = Tracer("bench", exporter=DiscardingExporter(), sample_rate=sample_rate,
+                       max_queued_spans=spans * 2)
+        start_time = time.perf_counter()
+        for _ in range(spans // 4):
+            with bench.use_span(bench.start_span("request", kind="server")):
+                with bench.span("intent_detection"):
+                    pass
+                with bench.span("llm_call", kind="client"):
+                    bench.inject()
+                with bench.span("serialization"):
+                    pass
+        elapsed = time.perf_counter() - start_time
+        bench.shutdown()
+        print(f"sample_rate {sample_rate:.1f}: {elapsed / spans * 1e6:6.2f} us/span")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The Agent modules import each other from the Agent directory.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,65 @@
+import asyncio
+import time
+
+import pytest
+
+from Utilities.agent_executors import AgentExecutors, IntentBusyError
+
+
+def test_email_burst_does_not_hold_up_searches():
+    async def main():
+        executors = AgentExecutors(io_workers=8, cpu_workers=2, queue_timeout=5,
+                                   limits={"write_email": 2, "search_dataframe": 8})
+        search_latencies = []
+
+        async def email():
+            async with executors.limit("write_email"):
+                await executors.run_io(time.sleep, 0.4)
+
+        async def search():
+            start_time = time.perf_counter()
+            async with executors.limit("search_dataframe"):
+                await executors.run_cpu(time.sleep, 0.01)
+            search_latencies.append(time.perf_counter() - start_time)
+
+        started_at = time.perf_counter()
+        await asyncio.gather(*[email() for _ in range(6)], *[search() for _ in range(20)])
+        total = time.perf_counter() - started_at
+        stats = executors.stats()["intents"]
+        executors.shutdown()
+        return search_latencies, total, stats
+
+    search_latencies, total, stats = asyncio.run(main())
+
+    # Six emails through two slots take three rounds; searches finish long before.
+    assert total >= 1.1
+    assert max(search_latencies) < 0.5
+    assert stats["write_email"]["peak_in_flight"] == 2
+    assert stats["search_dataframe"]["completed"] == 20
+
+
+def test_intent_at_its_limit_is_rejected_after_the_queue_timeout():
+    async def main():
+        executors = AgentExecutors(limits={"write_email": 1}, queue_timeout=0.1, retry_after=3)
+
+        async def email():
+            async with executors.limit("write_email"):
+                await executors.run_io(time.sleep, 0.5)
+
+        running = asyncio.create_task(email())
+        await asyncio.sleep(0.05)
+        started_at = time.perf_counter()
+        with pytest.raises(IntentBusyError) as error:
+            await email()
+        waited = time.perf_counter() - started_at
+        await running
+        stats = executors.stats()["intents"]["write_email"]
+        executors.shutdown()
+        return error.value, waited, stats
+
+    error, waited, stats = asyncio.run(main())
+
+    assert (error.intent, error.retry_after) == ("write_email", 3)
+    assert 0.09 <= waited < 0.4
+    assert stats["rejected"] == 1
+    assert stats["completed"] == 1
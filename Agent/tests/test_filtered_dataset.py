@@ -0,0 +1,106 @@
+import functools
+
+import pandas as pd
+import pytest
+
+from Utilities import filtered_dataset
+from Utilities.chunked_data_processor import ChunkedDataProcessor
+
+
+def write_sources(directory, leads, sample):
+    leads_path, sample_path = directory / "leads.csv", directory / "sample.csv"
+    pd.DataFrame(leads).to_csv(leads_path, index=False)
+    pd.DataFrame(sample).to_csv(sample_path, index=False)
+    return str(leads_path), str(sample_path)
+
+
+def build(directory, name, leads_path, sample_path, refresh=False):
+    paths = {
+        "csv_path": str(directory / f"{name}.csv"),
+        "arrow_path": str(directory / f"{name}.arrow"),
+        "state_path": str(directory / f"{name}_state.npz"),
+    }
+    if refresh:
+        return filtered_dataset.refresh_filtered_dataset(leads_path, sample_path, **paths)
+    return filtered_dataset.build_filtered_dataset(leads_path, sample_path, **paths)
+
+
+def normalize(dataframe):
+    dataframe = filtered_dataset.apply_schema(dataframe)
+    dataframe = dataframe.astype({column: "string" for column in dataframe.columns
+                                  if column in filtered_dataset.DICTIONARY_COLUMNS})
+    return dataframe.sort_values(list(dataframe.columns)).reset_index(drop=True)
+
+
+@pytest.fixture(autouse=True)
+def small_chunks(monkeypatch):
+    # Several chunks per file, so Lead Numbers and column dtypes span chunks.
+    monkeypatch.setattr(filtered_dataset, "ChunkedDataProcessor",
+                        functools.partial(ChunkedDataProcessor, chunk_size=3))
+
+
+def test_refresh_equals_full_rebuild(tmp_path):
+    leads = {
+        "Lead Number": [1, 2, 3, 4, 5, 6, 7, 8],
+        "Lead Origin": ["Landing Page Submission"] * 6 + ["API", "Landing Page Submission"],
+        "City": ["Mumbai", "Pune", "Mumbai", None, "Thane", "Pune", "Mumbai", "Pune"],
+        "TotalVisits": [1, 2, 3, 4, 5, 6, 7, 8],
+    }
+    sample = {
+        "Lead Number": [1, 2, 3, 4, 5, 6, 7, 8],
+        "Company": ["A", "B", None, "D", "E", "F", "G", "H"],
+        "Skype Id": [None, None, None, None, None, "s6", None, None],
+    }
+    leads_path, sample_path = write_sources(tmp_path, leads, sample)
+    build(tmp_path, "materialized", leads_path, sample_path)
+
+    leads["TotalVisits"][1] = None
+    leads["Lead Origin"][4] = "API"
+    sample["Company"][2] = "C"
+    sample["Skype Id"][0] = "s1"
+    for column, value in (("Lead Number", 9), ("Lead Origin", "Landing Page Submission"),
+                          ("City", "Delhi"), ("TotalVisits", 9)):
+        leads[column].append(value)
+    for column, value in (("Lead Number", 9), ("Company", "I"), ("Skype Id", None)):
+        sample[column].append(value)
+    for column in sample:
+        del sample[column][5]
+    leads_path, sample_path = write_sources(tmp_path, leads, sample)
+
+    refreshed = build(tmp_path, "materialized", leads_path, sample_path, refresh=True)
+    rebuilt = build(tmp_path, "rebuilt", leads_path, sample_path)
+
+    assert sorted(refreshed["Lead Number"]) == [1, 2, 3, 4, 8, 9]
+    pd.testing.assert_frame_equal(normalize(refreshed), normalize(rebuilt[refreshed.columns]))
+    pd.testing.assert_frame_equal(
+        normalize(filtered_dataset.read_csv(str(tmp_path / "materialized.csv"))),
+        normalize(filtered_dataset.read_csv(str(tmp_path / "rebuilt.csv"))))
+
+
+def test_refresh_without_changes_keeps_the_dataset_version(tmp_path):
+    leads_path, sample_path = write_sources(
+        tmp_path,
+        {"Lead Number": [1, 2], "Lead Origin": ["Landing Page Submission"] * 2},
+        {"Lead Number": [1, 2], "Company": ["A", None]})
+    build(tmp_path, "materialized", leads_path, sample_path)
+    build(tmp_path, "materialized", leads_path, sample_path, refresh=True)
+
+    state = filtered_dataset._load_state(str(tmp_path / "materialized_state.npz"))
+    assert state["dataset_version"] == 1
+
+
+def test_refresh_without_changes_rebuilds_a_missing_arrow_file(tmp_path):
+    pytest.importorskip("pyarrow")
+    leads_path, sample_path = write_sources(
+        tmp_path,
+        {"Lead Number": [1, 2], "Lead Origin": ["Landing Page Submission"] * 2},
+        {"Lead Number": [1, 2], "Company": ["A", None]})
+    build(tmp_path, "materialized", leads_path, sample_path)
+    arrow_path = tmp_path / "materialized.arrow"
+    arrow_path.unlink()
+
+    refreshed = build(tmp_path, "materialized", leads_path, sample_path, refresh=True)
+
+    assert arrow_path.exists()
+    pd.testing.assert_frame_equal(
+        normalize(filtered_dataset.read_arrow(str(arrow_path))), normalize(refreshed))
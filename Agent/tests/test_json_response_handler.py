@@ -0,0 +1,28 @@
+import json
+
+import pandas as pd
+import pytest
+
+from Handlers.json_response_handler import accepts_gzip, dumps
+
+
+@pytest.mark.parametrize("accept_encoding, expected", [
+    ("gzip", True),
+    ("gzip, deflate, br", True),
+    ("deflate, GZIP;q=0.5", True),
+    ("gzip;q=0", False),
+    ("gzip; q=0.0, deflate", False),
+    ("*", True),
+    ("*;q=0", False),
+    ("gzip;q=0, *", False),
+    ("br", False),
+    ("", False),
+])
+def test_accepts_gzip_honours_quality_values(accept_encoding, expected):
+    assert accepts_gzip(accept_encoding) is expected
+
+
+def test_dumps_writes_unsupported_values_as_strings():
+    body = json.loads(dumps({"created": pd.Timestamp("2025-01-02 03:04:05"),
+                             "total": 3}))
+    assert body == {"created": "2025-01-02 03:04:05", "total": 3}
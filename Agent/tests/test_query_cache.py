@@ -0,0 +1,38 @@
+from Utilities.query_cache import QueryCache
+
+SEARCH_INTENT = {"intent": "search_dataframe", "action": "search"}
+
+
+def test_comparison_operators_get_different_keys():
+    assert QueryCache.normalize("Leads with TotalVisits > 5") != \
+        QueryCache.normalize("Leads with TotalVisits < 5")
+    assert QueryCache.normalize("TotalVisits >= 5") != QueryCache.normalize("TotalVisits <= 5")
+
+
+def test_decimals_and_email_addresses_are_kept():
+    assert QueryCache.normalize("score above 2.5") != QueryCache.normalize("score above 25")
+    assert QueryCache.normalize("Email john.doe@example.com.") == "email john.doe@example.com"
+
+
+def test_case_whitespace_and_trailing_punctuation_share_a_key():
+    assert QueryCache.normalize("  Find leads from Mumbai?  ") == \
+        QueryCache.normalize("find leads, from mumbai")
+
+
+def test_cached_answers_do_not_cross_operators():
+    cache = QueryCache()
+    cache.set("Leads with TotalVisits > 5", SEARCH_INTENT, {"total": 10}, "v1")
+
+    assert cache.get("Leads with TotalVisits < 5", "v1") is None
+    assert cache.get("leads with totalvisits > 5.", "v1")["query_response"] == {"total": 10}
+
+
+def test_stats_lists_a_bounded_number_of_keys():
+    cache = QueryCache()
+    for i in range(5):
+        cache.set(f"query {i}", SEARCH_INTENT, {"total": i}, "v1")
+
+    stats = cache.stats(max_keys=2)
+    assert stats["entries"] == 5
+    assert [entry["query"] for entry in stats["keys"]] == ["query 4", "query 3"]
+    assert stats["keys_truncated"]
@@ -1,3 +1,4 @@
+import asyncio
 import json
 import logging
 import time
@@ -8,19 +9,36 @@ from typing_extensions import Annotated
 
 from fastapi import FastAPI, Request, Depends
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 
 from slowapi import Limiter
 from slowapi.errors import RateLimitExceeded
 from slowapi.middleware import SlowAPIMiddleware
 from slowapi.util import get_remote_address
 
+from Utilities.generation_params import validate_generation_params, validate_profile
 from Utilities.get_llm_response import LLMResponse
+from Utilities.metrics import CONTENT_TYPE
+from Utilities.model_metrics import (
+    REGISTRY,
+    IN_FLIGHT_REQUESTS,
+    RATE_LIMITED,
+    record_request,
+    update_scheduler_gauges,
+)
+from Utilities.request_scheduler import RequestScheduler, QueueFullError
+from Utilities.tracing import TracingMiddleware, tracer
 from Utilities.user_authenticator import UserAuthenticator
-from Constants.api_constants import REQ_PER_MIN
+from Constants.model_constants import MODEL_PATH, DEFAULT_GENERATION_PROFILE
+from Constants.api_constants import (
+    REQ_PER_MIN,
+    QUEUE_MAX_SIZE,
+    GENERATION_WORKERS,
+    RETRY_AFTER_SECONDS,
+)
 
 from Handlers.error_handler import ErrorHandlers
-from Handlers.json_response_handler import JSONResponseHandler
+from Handlers.json_response_handler import JSONResponseHandler, dumps
 
 logging.basicConfig(
     level=logging.INFO,
@@ -31,12 +49,14 @@ app = FastAPI()
 
 limiter = Limiter(key_func=get_remote_address)
 app.state.limiter = limiter
-app.add_exception_handler(
-    RateLimitExceeded,
-    lambda request, exc: JSONResponse(
-        status_code=429, content={"detail": "rate limit exceeded"}
-    ),
-)
+
+
+def rate_limit_exceeded(request: Request, exc: RateLimitExceeded) -> JSONResponse:
+    RATE_LIMITED.inc(endpoint=request.url.path)
+    return JSONResponse(status_code=429, content={"detail": "rate limit exceeded"})
+
+
+app.add_exception_handler(RateLimitExceeded, rate_limit_exceeded)
 
 app.add_middleware(SlowAPIMiddleware)
 
@@ -48,13 +68,41 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
-
-model_path = "Model/mistral-7b-instruct-v0.2.Q5_K_S.gguf"
+app.add_middleware(TracingMiddleware, tracer=tracer)
 
 user_auth = UserAuthenticator()
 json_response_handler = JSONResponseHandler()
 error_handler = ErrorHandlers()
-llm_response = LLMResponse(model_path=model_path)
+llm_response = LLMResponse(model_path=MODEL_PATH)
+scheduler = RequestScheduler(
+    backend=llm_response,
+    max_queue_size=QUEUE_MAX_SIZE,
+    workers=max(GENERATION_WORKERS, llm_response.llm.concurrency),
+    retry_after=RETRY_AFTER_SECONDS,
+)
+
+
+@app.on_event("startup")
+async def start_scheduler() -> None:
+    await scheduler.start()
+
+
+@app.on_event("shutdown")
+async def stop_scheduler() -> None:
+    await scheduler.stop()
+    llm_response.llm.close()
+    tracer.shutdown()
+
+
+def record_generation_spans(queue_time: float, generation_time: float, **attributes) -> None:
+    """
+    Adds `queue` and `generation` spans, timed by the scheduler, to the
+    request span. Both end now; coalesced requests share them with the
+    request that started the generation.
+    """
+    generation_start = time.time_ns() - int(generation_time * 1e9)
+    tracer.record_span("queue", generation_start - int(queue_time * 1e9), generation_start)
+    tracer.record_span("generation", generation_start, time.time_ns(), **attributes)
 
 
 @app.post("/model_s/inference/get-response")
@@ -62,21 +110,50 @@ llm_response = LLMResponse(model_path=model_path)
 async def get_audio_transcript(
     request: Request, auth_flag: Annotated[bool, Depends(user_auth.get_current_user)]
 ) -> JSONResponse:
-
+    """
+    Generates a response for `prompt`. Optional fields: `generation`
+    (per-request max_new_tokens, stop, temperature, top_k, top_p,
+    repetition_penalty), `profile` (name the request is counted under) and
+    `stop_at_json`.
+    """
     start_time = time.time()
     logging.info("Inference request received.")
+    endpoint = "get-response"
+    profile, app_name = DEFAULT_GENERATION_PROFILE, "TEST_APP"
+    IN_FLIGHT_REQUESTS.inc(endpoint=endpoint)
 
     try:
         data = await request.json()
         prompt = data.get("prompt")
         app_name = data.get("app_name", "TEST_APP")
 
+        stop_at_json = data.get("stop_at_json", False)
+        generation_params = validate_generation_params(data.get("generation"))
+        profile = validate_profile(data.get("profile"))
+
         incoming_client_ip = request.client.host
         incoming_client_port = request.client.port
 
-        llm_output = llm_response.generate_response(
-            prompt=prompt
-        )
+        if not isinstance(prompt, str):
+            raise TypeError("Prompt must be a string.")
+        if not isinstance(stop_at_json, bool):
+            raise TypeError("stop_at_json must be a boolean.")
+
+        tracer.set_attributes(profile=profile, app_name=app_name)
+        with tracer.span("cache_lookup"):
+            llm_output = await asyncio.to_thread(
+                llm_response.get_cached_response, prompt, app_name=app_name,
+                stop_at_json=stop_at_json, **generation_params)
+        cache_hit = llm_output is not None
+        if cache_hit:
+            generation = {"queue_time": 0.0, "generation_time": 0.0, "coalesced": False}
+        else:
+            generation = await scheduler.submit(
+                prompt, stop_at_json=stop_at_json, profile=profile, **generation_params)
+            llm_output = generation["output"]
+            record_generation_spans(generation["queue_time"], generation["generation_time"],
+                                    coalesced=generation["coalesced"])
+        tracer.set_attributes(cache_hit=cache_hit, coalesced=generation["coalesced"])
 
         end_time = time.time()
         process_time = round(end_time - start_time, 1)
@@ -84,7 +161,13 @@ async def get_audio_transcript(
         result_response = {
             "response_id": str(uuid.uuid1()),
             "process_time": process_time,
+            "queue_time": round(generation["queue_time"], 3),
+            "generation_time": round(generation["generation_time"], 3),
+            "cache_hit": cache_hit,
+            "coalesced": generation["coalesced"],
+            "profile": profile,
             "app_name": app_name,
+            "trace_id": tracer.current_span().trace_id,
             "datetime": str(datetime.now()),
             "llm_response": str(llm_output),
             "incoming_client_ip": incoming_client_ip,
@@ -95,8 +178,147 @@ async def get_audio_transcript(
 
         logging.info(
             f"Response generated successfully in {process_time} seconds.")
-        return json_response_handler.get_200_response(response_dict=result_response)
+        serialization_start = time.perf_counter()
+        with tracer.span("serialization"):
+            response = json_response_handler.get_200_response(
+                response_dict=result_response, request=request)
+        stages = {"serialization": time.perf_counter() - serialization_start,
+                  "total": time.time() - start_time}
+        if not cache_hit:
+            stages.update(queue=generation["queue_time"],
+                          generation=generation["generation_time"])
+        record_request(endpoint, profile, app_name, 200, stages,
+                       cache_hit=cache_hit, coalesced=generation["coalesced"])
+        return response
+
+    except QueueFullError as e:
+        record_request(endpoint, profile, app_name, 503)
+        return error_handler.handle_queue_full_error(str(e), retry_after=e.retry_after)
+    except (
+        json.JSONDecodeError,
+        KeyError,
+        TypeError,
+        ValueError,
+        FileNotFoundError,
+        PermissionError,
+        AttributeError,
+    ) as e:
+        logging.error(f"Request error: {e}")
+        record_request(endpoint, profile, app_name, 400)
+        return error_handler.handle_error(e, status_code=400)
+    except Exception as e:
+        logging.error(f"Internal server error: {e}", exc_info=True)
+        record_request(endpoint, profile, app_name, 500)
+        return error_handler.handle_error(e, status_code=500)
+    finally:
+        IN_FLIGHT_REQUESTS.dec(endpoint=endpoint)
+
 
+@app.post("/model_s/inference/stream-response")
+@limiter.limit(f"{REQ_PER_MIN}/minute")
+async def stream_response(
+    request: Request, auth_flag: Annotated[bool, Depends(user_auth.get_current_user)]
+):
+    """
+    Streams generated tokens as NDJSON lines: one `{"event": "token"}` line
+    per token followed by a `{"event": "done"}` line with timings, or an
+    `{"event": "error"}` line if generation fails midway. With
+    `"stop_at_json": true` generation ends when the first top-level JSON
+    object closes. Like get-response, it accepts per-request `generation`
+    parameters and a `profile` name.
+    """
+    start_time = time.time()
+    logging.info("Streaming inference request received.")
+    endpoint = "stream-response"
+    profile, app_name = DEFAULT_GENERATION_PROFILE, "TEST_APP"
+    streaming = False
+    IN_FLIGHT_REQUESTS.inc(endpoint=endpoint)
+
+    try:
+        data = await request.json()
+        prompt = data.get("prompt")
+        app_name = data.get("app_name", "TEST_APP")
+
+        stop_at_json = data.get("stop_at_json", False)
+        generation_params = validate_generation_params(data.get("generation"))
+        profile = validate_profile(data.get("profile"))
+
+        if not isinstance(prompt, str):
+            raise TypeError("Prompt must be a string.")
+        if not prompt.strip():
+            raise ValueError("Prompt cannot be empty.")
+        if not isinstance(stop_at_json, bool):
+            raise TypeError("stop_at_json must be a boolean.")
+
+        tracer.set_attributes(profile=profile, app_name=app_name)
+        with tracer.span("cache_lookup"):
+            cached_output = await asyncio.to_thread(
+                llm_response.get_cached_response, prompt, app_name=app_name,
+                stop_at_json=stop_at_json, **generation_params)
+        tracer.set_attributes(cache_hit=cached_output is not None)
+        generation_stream = None
+        if cached_output is None:
+            generation_stream = await scheduler.submit_stream(
+                prompt, stop_at_json=stop_at_json, profile=profile, **generation_params)
+        response_id = str(uuid.uuid1())
+
+        async def ndjson_events():
+            tokens = 0
+            try:
+                if generation_stream is None:
+                    yield dumps({"event": "token", "token": cached_output}) + b"\n"
+                    stats = {"queue_time": 0.0, "time_to_first_token": 0.0,
+                             "generation_time": 0.0, "coalesced": False}
+                else:
+                    async for token in generation_stream:
+                        tokens += 1
+                        yield dumps({"event": "token", "token": token}) + b"\n"
+                    stats = await generation_stream.stats()
+                    record_generation_spans(
+                        stats["queue_time"], stats["generation_time"], coalesced=stats["coalesced"],
+                        tokens=tokens, time_to_first_token=stats["time_to_first_token"])
+                process_time = round(time.time() - start_time, 1)
+                yield dumps({
+                    "event": "done",
+                    "response_id": response_id,
+                    "trace_id": tracer.current_span().trace_id,
+                    "app_name": app_name,
+                    "datetime": str(datetime.now()),
+                    "process_time": process_time,
+                    "queue_time": round(stats["queue_time"], 3),
+                    "time_to_first_token": round(stats["time_to_first_token"], 3),
+                    "generation_time": round(stats["generation_time"], 3),
+                    "cache_hit": generation_stream is None,
+                    "coalesced": stats["coalesced"],
+                    "tokens": tokens,
+                    "stop_at_json": stop_at_json,
+                    "profile": profile,
+                }) + b"\n"
+                logging.info(
+                    f"Response streamed in {process_time} seconds, "
+                    f"first token after {stats['time_to_first_token']:.3f} seconds.")
+                stages = {"total": time.time() - start_time}
+                if generation_stream is not None:
+                    stages.update(queue=stats["queue_time"],
+                                  time_to_first_token=stats["time_to_first_token"],
+                                  generation=stats["generation_time"])
+                record_request(endpoint, profile, app_name, 200, stages,
+                               cache_hit=generation_stream is None,
+                               coalesced=stats["coalesced"])
+            except Exception as e:
+                logging.error(f"Streaming error: {e}", exc_info=True)
+                record_request(endpoint, profile, app_name, 500)
+                yield dumps({"event": "error", "error": "An unexpected error occurred"}) + b"\n"
+            finally:
+                IN_FLIGHT_REQUESTS.dec(endpoint=endpoint)
+
+        response = StreamingResponse(ndjson_events(), media_type="application/x-ndjson")
+        streaming = True
+        return response
+
+    except QueueFullError as e:
+        record_request(endpoint, profile, app_name, 503)
+        return error_handler.handle_queue_full_error(str(e), retry_after=e.retry_after)
     except (
         json.JSONDecodeError,
         KeyError,
@@ -106,8 +328,136 @@ async def get_audio_transcript(
         PermissionError,
         AttributeError,
     ) as e:
+        logging.error(f"Request error: {e}")
+        record_request(endpoint, profile, app_name, 400)
+        return error_handler.handle_error(e, status_code=400)
+    except Exception as e:
+        logging.error(f"Internal server error: {e}", exc_info=True)
+        record_request(endpoint, profile, app_name, 500)
+        return error_handler.handle_error(e, status_code=500)
+    finally:
+        if not streaming:
+            IN_FLIGHT_REQUESTS.dec(endpoint=endpoint)
+
+
+@app.get("/model_s/cache/stats")
+async def get_cache_stats(
+    request: Request, auth_flag: Annotated[bool, Depends(user_auth.get_current_user)]
+) -> JSONResponse:
+    """
+    Returns response cache size and per-application hit/miss counters.
+    """
+    try:
+        cache_stats = llm_response.cache.stats() if llm_response.cache else {
+            "enabled": False}
+        return json_response_handler.get_200_response(
+            response_dict=cache_stats, request=request)
+    except Exception as e:
+        logging.error(f"Internal server error: {e}", exc_info=True)
+        return error_handler.handle_error(e, status_code=500)
+
+
+@app.post("/model_s/prefixes/register")
+async def register_prefix(
+    request: Request, auth_flag: Annotated[bool, Depends(user_auth.get_current_user)]
+) -> JSONResponse:
+    """
+    Precomputes the model state for a fixed prompt prefix so later prompts
+    starting with it only evaluate their remaining tokens.
+    """
+    try:
+        data = await request.json()
+        prefix = data.get("prefix")
+        if not isinstance(prefix, str) or not prefix.strip():
+            raise ValueError("Prefix must be a non-empty string.")
+
+        registered = await scheduler.run_in_worker(llm_response.register_prefix, prefix)
+        return json_response_handler.get_200_response(
+            response_dict={"registered": registered}, request=request)
+
+    except (json.JSONDecodeError, TypeError, ValueError) as e:
         logging.error(f"Request error: {e}")
         return error_handler.handle_error(e, status_code=400)
     except Exception as e:
         logging.error(f"Internal server error: {e}", exc_info=True)
         return error_handler.handle_error(e, status_code=500)
+
+
+@app.get("/model_s/prefixes/stats")
+async def get_prefix_stats(
+    request: Request, auth_flag: Annotated[bool, Depends(user_auth.get_current_user)]
+) -> JSONResponse:
+    """
+    Returns prompt-evaluation time with and without prefix state reuse.
+    """
+    try:
+        return json_response_handler.get_200_response(
+            response_dict=llm_response.llm.prefix_stats(), request=request)
+    except Exception as e:
+        logging.error(f"Internal server error: {e}", exc_info=True)
+        return error_handler.handle_error(e, status_code=500)
+
+
+@app.get("/model_s/backend/stats")
+async def get_backend_stats(
+    request: Request, auth_flag: Annotated[bool, Depends(user_auth.get_current_user)]
+) -> JSONResponse:
+    """
+    Returns backend statistics, e.g. RSS per replica and aggregate tokens/sec.
+    """
+    try:
+        backend_stats = await asyncio.to_thread(llm_response.llm.stats)
+        backend_stats["backend"] = llm_response.backend_name
+        return json_response_handler.get_200_response(
+            response_dict=backend_stats, request=request)
+    except Exception as e:
+        logging.error(f"Internal server error: {e}", exc_info=True)
+        return error_handler.handle_error(e, status_code=500)
+
+
+@app.get("/model_s/generation/stats")
+async def get_generation_stats(
+    request: Request, auth_flag: Annotated[bool, Depends(user_auth.get_current_user)]
+) -> JSONResponse:
+    """
+    Returns generations, tokens and latency per generation profile.
+    """
+    try:
+        return json_response_handler.get_200_response(
+            response_dict=llm_response.profile_stats(), request=request)
+    except Exception as e:
+        logging.error(f"Internal server error: {e}", exc_info=True)
+        return error_handler.handle_error(e, status_code=500)
+
+
+@app.get("/model_s/scheduler/stats")
+async def get_scheduler_stats(
+    request: Request, auth_flag: Annotated[bool, Depends(user_auth.get_current_user)]
+) -> JSONResponse:
+    """
+    Returns the queue depth, in-flight generations and how many requests
+    were coalesced with an identical in-flight generation.
+    """
+    try:
+        return json_response_handler.get_200_response(
+            response_dict=scheduler.stats(), request=request)
+    except Exception as e:
+        logging.error(f"Internal server error: {e}", exc_info=True)
+        return error_handler.handle_error(e, status_code=500)
+
+
+@app.get("/metrics")
+async def get_metrics(
+    request: Request, auth_flag: Annotated[bool, Depends(user_auth.get_current_user)]
+) -> Response:
+    """
+    Prometheus metrics: stage latencies, prompt and generated tokens,
+    tokens/sec, queue depth, in-flight requests, cache hits and rate-limit
+    rejections, labelled by generation profile and `app_name`.
+    """
+    try:
+        update_scheduler_gauges(scheduler.stats())
+        return Response(content=REGISTRY.render(), media_type=CONTENT_TYPE)
+    except Exception as e:
+        logging.error(f"Internal server error: {e}", exc_info=True)
+        return error_handler.handle_error(e, status_code=500)
@@ -1 +1,26 @@
-REQ_PER_MIN = 100
\ No newline at end of file
+import os
+
+REQ_PER_MIN = 100
+
+# Generation scheduler
+QUEUE_MAX_SIZE = 64
+GENERATION_WORKERS = 1
+RETRY_AFTER_SECONDS = 5
+
+# Responses at least this large (bytes) are gzip-compressed for clients that accept it.
+GZIP_MIN_BYTES = 1024
+GZIP_LEVEL = 5
+
+# Tracing: spans of each request are linked to the other service through the
+# W3C `traceparent` header. New traces are sampled at TRACE_SAMPLE_RATE, traces
+# taking at least TRACE_SLOW_SECONDS are always kept. TRACE_EXPORTER is
+# "jsonl" (TRACE_JSONL_PATH), "otlp" (an OTLP/HTTP collector) or "none".
+TRACE_SERVICE_NAME = "sdr-model-server"
+TRACE_SAMPLE_RATE = float(os.getenv("TRACE_SAMPLE_RATE", "0.01"))
+TRACE_SLOW_SECONDS = float(os.getenv("TRACE_SLOW_SECONDS", "10"))
+TRACE_EXPORTER = os.getenv("TRACE_EXPORTER", "jsonl")
+TRACE_JSONL_PATH = os.getenv("TRACE_JSONL_PATH", "./Logs/model_traces.jsonl")
+TRACE_OTLP_ENDPOINT = os.getenv("TRACE_OTLP_ENDPOINT", "http://localhost:4318/v1/traces")
+TRACE_EXPORT_BATCH_SIZE = 256
+TRACE_EXPORT_INTERVAL_SECONDS = 2.0
+TRACE_QUEUE_MAX_SPANS = 10_000
@@ -0,0 +1,105 @@
+import os
+
+
+def _parse_cpu_sets(value: str):
+    cpu_sets = []
+    for group in filter(None, value.split(";")):
+        cpus = set()
+        for part in group.split(","):
+            start, _, end = part.partition("-")
+            cpus.update(range(int(start), int(end or start) + 1))
+        cpu_sets.append(cpus)
+    return cpu_sets
+
+
+MODEL_PATH = os.getenv(
+    "MODEL_PATH", "Model/mistral-7b-instruct-v0.2.Q5_K_S.gguf")
+
+# One of "gpu", "cpu", "llama_cpp", "stub" or "replicas". Selectable per
+# deployment without code edits. "llama_cpp" supports prompt-prefix state
+# reuse; "replicas" runs MODEL_REPLICAS processes of REPLICA_BACKEND.
+MODEL_BACKEND = os.getenv("MODEL_BACKEND", "gpu")
+
+GENERATION_CONFIG = {
+    "max_new_tokens": 512,
+    "temperature": 0.001,
+    "top_k": 50,
+    "top_p": 0.9,
+    "repetition_penalty": 1.2,
+}
+
+# Per-request overrides of GENERATION_CONFIG accepted by the inference
+# endpoints, with their allowed (min, max) range. `context_length` is fixed
+# when the model is loaded and cannot be overridden per request.
+GENERATION_PARAM_BOUNDS = {
+    "max_new_tokens": (1, int(os.getenv("GENERATION_MAX_NEW_TOKENS_LIMIT", "1024"))),
+    "temperature": (0.0, 2.0),
+    "top_k": (0, 1000),
+    "top_p": (0.0, 1.0),
+    "repetition_penalty": (0.5, 2.0),
+}
+GENERATION_MAX_STOP_SEQUENCES = 4
+DEFAULT_GENERATION_PROFILE = "default"
+
+# Generation profiles and calling applications that get their own metric
+# series and statistics; any other value is counted as OTHER_LABEL.
+KNOWN_GENERATION_PROFILES = os.getenv(
+    "KNOWN_GENERATION_PROFILES", "default,intent,intent_combined,dataframe_filter,email").split(",")
+KNOWN_APP_NAMES = os.getenv("KNOWN_APP_NAMES", "Sales_Agent,TEST_APP").split(",")
+OTHER_LABEL = "other"
+
+BACKEND_CONFIGS = {
+    "gpu": {
+        "model_type": "mistral",
+        "mmap": True,
+        "gpu_layers": int(os.getenv("MODEL_GPU_LAYERS", "-1")),
+        "threads": int(os.getenv("MODEL_THREADS", "-1")),
+        "batch_size": int(os.getenv("MODEL_BATCH_SIZE", "8")),
+        "context_length": int(os.getenv("MODEL_CONTEXT_LENGTH", "2048")),
+    },
+    "cpu": {
+        "model_type": "mistral",
+        "mmap": True,
+        "gpu_layers": 0,
+        "threads": int(os.getenv("MODEL_THREADS", str(os.cpu_count() or 1))),
+        "batch_size": int(os.getenv("MODEL_BATCH_SIZE", "8")),
+        "context_length": int(os.getenv("MODEL_CONTEXT_LENGTH", "2048")),
+    },
+    "llama_cpp": {
+        "use_mmap": True,
+        "n_gpu_layers": int(os.getenv("MODEL_GPU_LAYERS", "0")),
+        "n_threads": int(os.getenv("MODEL_THREADS", str(os.cpu_count() or 1))),
+        "n_batch": int(os.getenv("MODEL_BATCH_SIZE", "512")),
+        "n_ctx": int(os.getenv("MODEL_CONTEXT_LENGTH", "2048")),
+    },
+    "replicas": {
+        "replicas": int(os.getenv("MODEL_REPLICAS", "2")),
+        "backend": os.getenv("REPLICA_BACKEND", "cpu"),
+        # e.g. "0-3;4-7" pins replica 0 to CPUs 0-3 and replica 1 to CPUs 4-7.
+        "cpu_sets": _parse_cpu_sets(os.getenv("REPLICA_CPU_SETS", "")),
+    },
+    "stub": {
+        "latency_ms": float(os.getenv("STUB_LATENCY_MS", "50")),
+        "token_latency_ms": float(os.getenv("STUB_TOKEN_LATENCY_MS", "5")),
+        "response": os.getenv(
+            "STUB_RESPONSE",
+            '{"intent": "search_dataframe", "action": "stub response"}'),
+    },
+}
+
+# Prompt-level response cache
+CACHE_ENABLED = os.getenv("CACHE_ENABLED", "true").lower() == "true"
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "2048"))
+CACHE_MAX_BYTES = int(os.getenv("CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+CACHE_TTL_SECONDS = float(os.getenv("CACHE_TTL_SECONDS", "86400"))
+# Path of the SQLite file backing the persistent tier; unset disables it.
+CACHE_SQLITE_PATH = os.getenv("CACHE_SQLITE_PATH")
+
+# Memory cleanup runs every N generations, above the RSS limit (MB) or when
+# the backend reports memory pressure, not after every generation.
+MEMORY_CLEANUP_EVERY_N_REQUESTS = int(os.getenv("MEMORY_CLEANUP_EVERY_N_REQUESTS", "200"))
+MEMORY_RSS_LIMIT_MB = float(os.getenv("MEMORY_RSS_LIMIT_MB", "0"))
+# Minimum seconds between two RSS- or pressure-triggered cleanups.
+MEMORY_CLEANUP_MIN_INTERVAL_SECONDS = float(os.getenv("MEMORY_CLEANUP_MIN_INTERVAL_SECONDS", "60"))
+# Fraction of GPU memory reserved by torch above which the GPU backend reports pressure.
+GPU_MEMORY_PRESSURE_FRACTION = float(os.getenv("GPU_MEMORY_PRESSURE_FRACTION", "0.9"))
@@ -0,0 +1,88 @@
+import logging
+from typing import Any, Dict, Optional
+
+from Constants.model_constants import (
+    DEFAULT_GENERATION_PROFILE,
+    GENERATION_CONFIG,
+    GENERATION_PARAM_BOUNDS,
+    GENERATION_MAX_STOP_SEQUENCES,
+)
+
+logging.basicConfig(level=logging.INFO,
+                    format='%(asctime)s - %(levelname)s - %(message)s')
+
+
+def validate_generation_params(params: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Validates per-request generation parameters.
+
+    Args:
+        params (Optional[Dict[str, Any]]): Overrides of `GENERATION_CONFIG`
+            (`max_new_tokens`, `temperature`, `top_k`, `top_p`,
+            `repetition_penalty`) and an optional `stop` list of strings.
+
+    Returns:
+        Dict[str, Any]: The overrides in canonical form. `stop` becomes a
+        tuple, so the result can be part of the scheduler coalescing key.
+
+    Raises:
+        TypeError: If `params` or a value has the wrong type.
+        ValueError: If a parameter is unknown or out of range.
+    """
+    if params is None:
+        return {}
+    if not isinstance(params, dict):
+        raise TypeError("generation must be an object.")
+
+    validated = {}
+    for key, value in params.items():
+        if key == "stop":
+            if isinstance(value, str):
+                value = [value]
+            if not isinstance(value, list) or not all(isinstance(v, str) and v for v in value):
+                raise TypeError("stop must be a list of non-empty strings.")
+            if len(value) > GENERATION_MAX_STOP_SEQUENCES:
+                raise ValueError(
+                    f"At most {GENERATION_MAX_STOP_SEQUENCES} stop sequences are allowed.")
+            validated["stop"] = tuple(value)
+            continue
+        if key not in GENERATION_PARAM_BOUNDS:
+            raise ValueError(
+                f"Unknown generation parameter '{key}'. "
+                f"Allowed: {sorted(GENERATION_PARAM_BOUNDS) + ['stop']}")
+        expected = type(GENERATION_CONFIG[key])
+        if isinstance(value, bool) or not isinstance(value, (int, float)) \
+                or (expected is int and not float(value).is_integer()):
+            raise TypeError(f"{key} must be of type {expected.__name__}.")
+        low, high = GENERATION_PARAM_BOUNDS[key]
+        if not low <= value <= high:
+            raise ValueError(f"{key} must be between {low} and {high}.")
+        validated[key] = expected(value)
+    return validated
+
+
+def validate_profile(profile: Optional[str]) -> str:
+    """
+    Returns the generation profile name a request is counted under.
+
+    Raises:
+        TypeError: If `profile` is not a string.
+        ValueError: If `profile` is empty or longer than 64 characters.
+    """
+    if profile is None:
+        return DEFAULT_GENERATION_PROFILE
+    if not isinstance(profile, str):
+        raise TypeError("profile must be a string.")
+    if not 0 < len(profile) <= 64:
+        raise ValueError("profile must be between 1 and 64 characters.")
+    return profile
+
+
+def effective_generation_params(overrides: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Returns `GENERATION_CONFIG` with the request overrides applied and
+    `stop` as a list (empty when no stop sequence is set).
+    """
+    params = {**GENERATION_CONFIG, "stop": [], **overrides}
+    params["stop"] = list(params["stop"])
+    return params
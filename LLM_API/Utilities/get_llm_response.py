@@ -1,7 +1,32 @@
 import logging
-import torch
-import gc
-from ctransformers import AutoModelForCausalLM
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Dict, Iterator, Optional
+
+from Constants.model_constants import (
+    MODEL_BACKEND,
+    DEFAULT_GENERATION_PROFILE,
+    CACHE_ENABLED,
+    CACHE_MAX_ENTRIES,
+    CACHE_MAX_BYTES,
+    CACHE_TTL_SECONDS,
+    CACHE_SQLITE_PATH,
+    MEMORY_CLEANUP_EVERY_N_REQUESTS,
+    MEMORY_RSS_LIMIT_MB,
+    MEMORY_CLEANUP_MIN_INTERVAL_SECONDS,
+)
+from Utilities.generation_params import effective_generation_params
+from Utilities.json_tracker import JSONObjectTracker, stop_at_json_end
+from Utilities.memory_governor import MemoryGovernor
+from Utilities.model_backends import ModelBackend, create_backend
+from Utilities.model_metrics import (
+    GENERATED_TOKENS,
+    PROMPT_TOKENS,
+    TOKENS_PER_SECOND,
+    profile_label,
+)
+from Utilities.response_cache import ResponseCache
 
 logging.basicConfig(level=logging.INFO,
                     format='%(asctime)s - %(levelname)s - %(message)s')
@@ -9,59 +34,150 @@ logging.basicConfig(level=logging.INFO,
 
 class LLMResponse:
     """
-    A class for generating responses from a causal language model using ctransformers.
+    A class for generating responses from a causal language model through a
+    pluggable model backend, with a prompt-level response cache in front.
+
+    Generation parameters can be overridden per request (see
+    `validate_generation_params`) without reloading the model. Requests name
+    the generation profile they belong to, and tokens and latency are
+    counted per profile. With `stop_at_json`, generation is stopped as soon
+    as the first top-level JSON object closes.
     """
 
-    def __init__(self, model_path: str) -> None:
+    def __init__(self, model_path: str, backend: Optional[str] = None,
+                 cache: Optional[ResponseCache] = None) -> None:
         """
         Initializes the LLMResponse object with the given parameters.
 
         Args:
             model_path (str): Path to the pretrained model.
+            backend (Optional[str]): Backend name. Defaults to `MODEL_BACKEND`.
+            cache (Optional[ResponseCache]): Response cache. Built from the cache
+                constants when omitted and `CACHE_ENABLED` is set.
         """
         self.model_path = model_path
+        self.backend_name = backend or MODEL_BACKEND
         self.llm = self._initialize_model()
+        if cache is None and CACHE_ENABLED:
+            cache = ResponseCache(max_entries=CACHE_MAX_ENTRIES,
+                                  max_bytes=CACHE_MAX_BYTES,
+                                  ttl_seconds=CACHE_TTL_SECONDS,
+                                  sqlite_path=CACHE_SQLITE_PATH)
+        self.cache = cache
+        self.memory_governor = MemoryGovernor(
+            MEMORY_CLEANUP_EVERY_N_REQUESTS, MEMORY_RSS_LIMIT_MB,
+            cleanup=[self.llm.release_memory],
+            pressure_probe=self.llm.memory_pressure,
+            min_interval_seconds=MEMORY_CLEANUP_MIN_INTERVAL_SECONDS)
+        self._stats_lock = threading.Lock()
+        self._profile_stats: Dict[str, Dict[str, float]] = defaultdict(
+            lambda: {"generations": 0, "tokens": 0, "stopped_at_json": 0, "seconds": 0.0})
 
-    def _initialize_model(self):
+    def _initialize_model(self) -> ModelBackend:
         """
-        Initializes the language model.
+        Initializes the language model backend.
 
         Returns:
-            AutoModelForCausalLM: Loaded language model.
+            ModelBackend: Loaded model backend.
         """
-        if not torch.cuda.is_available():
-            raise RuntimeError(
-                "GPU not available. This code must run on a GPU.")
-
         try:
             logging.info(
-                "Initializing the language model from %s", self.model_path)
-            with torch.no_grad():
-                model = AutoModelForCausalLM.from_pretrained(
-                    self.model_path,
-                    model_type="mistral",
-                    gpu_layers=-1,
-                    max_new_tokens=512,
-                    temperature=0.001,
-                    top_k=50,
-                    top_p=0.9,
-                    repetition_penalty=1.2,
-                    context_length=2048,
-                    threads=-1,
-                    stream=False
-                )
-                logging.info("Model initialized successfully on GPU.")
-                return model
+                "Initializing the '%s' backend from %s", self.backend_name, self.model_path)
+            return create_backend(self.backend_name, self.model_path)
         except Exception as e:
             logging.error("Failed to initialize the model: %s", str(e))
             raise
 
-    def generate_response(self, prompt: str) -> str:
+    def _cache_key(self, prompt: str, stop_at_json: bool = False,
+                   generation: Optional[Dict[str, Any]] = None) -> str:
+        params = {**effective_generation_params(generation or {}), "backend": self.backend_name}
+        if stop_at_json:
+            params["stop_at_json"] = True
+        return ResponseCache.make_key(prompt, params, self.model_path)
+
+    def get_cached_response(self, prompt: str, app_name: Optional[str] = None,
+                            stop_at_json: bool = False, **generation: Any) -> Optional[str]:
+        """
+        Looks up a previously generated response without touching the model.
+        May block on the SQLite tier's lock; async callers run it in a thread.
+
+        Args:
+            prompt (str): Input prompt for the language model.
+            app_name (Optional[str]): Application the lookup is counted for.
+            stop_at_json (bool): Whether the response was cut after its JSON object.
+            **generation: Validated generation parameter overrides.
+
+        Returns:
+            Optional[str]: The cached response, or None on a miss.
+        """
+        if self.cache is None:
+            return None
+        return self.cache.get(self._cache_key(prompt, stop_at_json, generation),
+                              app_name=app_name)
+
+    def _tokens(self, prompt: str, stop_at_json: bool, profile: str,
+                generation: Dict[str, Any]) -> Iterator[str]:
+        """
+        Streams backend tokens, stopped at the end of the first JSON object
+        when requested, and counts them for the profile. The backend stream
+        is closed when this generator is, which releases the model.
+        """
+        start_time = time.perf_counter()
+        tracker = JSONObjectTracker()
+        tokens = self.llm.stream(prompt, **generation)
+        if stop_at_json:
+            tokens = stop_at_json_end(tokens, tracker)
+        count = 0
+        try:
+            for token in tokens:
+                count += 1
+                yield token
+        finally:
+            close = getattr(tokens, "close", None)
+            if close is not None:
+                close()
+            seconds = time.perf_counter() - start_time
+            profile = profile_label(profile)
+            with self._stats_lock:
+                stats = self._profile_stats[profile]
+                stats["generations"] += 1
+                stats["tokens"] += count
+                stats["stopped_at_json"] += int(stop_at_json and tracker.complete)
+                stats["seconds"] += seconds
+            PROMPT_TOKENS.inc(self.llm.count_tokens(prompt), profile=profile)
+            GENERATED_TOKENS.inc(count, profile=profile)
+            if count and seconds > 0:
+                TOKENS_PER_SECOND.observe(count / seconds, profile=profile)
+
+    def profile_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Generations, tokens and latency per generation profile. Cache hits
+        are not counted.
         """
-        Generates a response based on the given prompt.
+        with self._stats_lock:
+            profiles = {name: dict(stats) for name, stats in self._profile_stats.items()}
+        for stats in profiles.values():
+            generations = stats["generations"]
+            stats["mean_tokens"] = round(stats["tokens"] / generations, 1)
+            stats["mean_latency_s"] = round(stats["seconds"] / generations, 3)
+            stats["tokens_per_second"] = round(stats["tokens"] / stats["seconds"], 2) \
+                if stats["seconds"] else 0.0
+            stats["seconds"] = round(stats["seconds"], 3)
+        return profiles
+
+    def generate_response(self, prompt: str, stop_at_json: bool = False,
+                          profile: str = DEFAULT_GENERATION_PROFILE,
+                          **generation: Any) -> str:
+        """
+        Generates a response based on the given prompt. The cache is only
+        written: callers look up `get_cached_response` before scheduling a
+        generation, so a miss is not looked up twice.
 
         Args:
             prompt (str): Input prompt for the language model.
+            stop_at_json (bool): Stop generating once a top-level JSON object closes.
+            profile (str): Generation profile the request is counted under.
+            **generation: Validated generation parameter overrides.
 
         Returns:
             str: Generated response.
@@ -71,11 +187,57 @@ class LLMResponse:
 
         try:
             logging.info("Generating response for the prompt.")
-            response = self.llm(prompt)
-            torch.cuda.empty_cache()
-            gc.collect()
+            response = "".join(self._tokens(prompt, stop_at_json, profile, generation))
+            self.memory_governor.after_request()
+            if self.cache is not None:
+                self.cache.set(self._cache_key(prompt, stop_at_json, generation), str(response))
             logging.info("Response generated successfully.")
             return response
         except Exception as e:
             logging.error("Error during response generation: %s", str(e))
             raise
+
+    def register_prefix(self, prefix: str) -> bool:
+        """
+        Precomputes and keeps the model state for a fixed prompt prefix.
+
+        Args:
+            prefix (str): Prompt prefix shared by many requests.
+
+        Returns:
+            bool: False when the backend cannot reuse prefix state.
+        """
+        return self.llm.register_prefix(prefix)
+
+    def stream_response(self, prompt: str, stop_at_json: bool = False,
+                        profile: str = DEFAULT_GENERATION_PROFILE,
+                        **generation: Any) -> Iterator[str]:
+        """
+        Generates a response token by token.
+
+        Args:
+            prompt (str): Input prompt for the language model.
+            stop_at_json (bool): Stop generating once a top-level JSON object closes.
+            profile (str): Generation profile the request is counted under.
+            **generation: Validated generation parameter overrides.
+
+        Yields:
+            str: Generated text pieces as soon as they are decoded.
+        """
+        if not prompt.strip():
+            raise ValueError("Prompt cannot be empty.")
+
+        try:
+            logging.info("Streaming response for the prompt.")
+            pieces = []
+            for token in self._tokens(prompt, stop_at_json, profile, generation):
+                pieces.append(token)
+                yield token
+            self.memory_governor.after_request()
+            if self.cache is not None:
+                self.cache.set(self._cache_key(prompt, stop_at_json, generation),
+                               "".join(pieces))
+            logging.info("Response streamed successfully.")
+        except Exception as e:
+            logging.error("Error during response streaming: %s", str(e))
+            raise
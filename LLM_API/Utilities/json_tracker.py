@@ -0,0 +1,132 @@
+import json
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+
+class JSONObjectTracker:
+    """
+    Incremental brace and string-state tracker for text that contains a JSON
+    object, fed piece by piece as tokens arrive.
+
+    Text before the first `{` is skipped. Inside an object, braces within
+    string literals (including escaped quotes) are ignored, so the tracker
+    knows exactly where the top-level object closes without re-scanning the
+    text seen so far.
+
+    Attributes:
+        complete (bool): True once a top-level object has closed.
+        consumed (int): Characters fed so far.
+    """
+
+    def __init__(self):
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+        self.complete = False
+        self.consumed = 0
+        self.start: Optional[int] = None
+        self.end: Optional[int] = None
+
+    def feed(self, text: str) -> Optional[int]:
+        """
+        Advances the tracker over `text`.
+
+        Args:
+            text (str): The next piece of generated text.
+
+        Returns:
+            Optional[int]: Offset in `text` just past the closing brace of the
+            first top-level object, or None if it has not closed yet.
+        """
+        if self.complete:
+            return None
+        for offset, char in enumerate(text):
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == "\\":
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+            elif char == "{":
+                if self.depth == 0:
+                    self.start = self.consumed + offset
+                self.depth += 1
+            elif self.depth == 0:
+                continue
+            elif char == '"':
+                self.in_string = True
+            elif char == "}":
+                self.depth -= 1
+                if self.depth == 0:
+                    self.complete = True
+                    self.end = self.consumed + offset + 1
+                    self.consumed += offset + 1
+                    return offset + 1
+        self.consumed += len(text)
+        return None
+
+
+def iter_json_objects(text: str) -> Iterator[str]:
+    """
+    Yields every balanced top-level `{...}` span of `text` in order.
+    """
+    position = 0
+    while True:
+        tracker = JSONObjectTracker()
+        if tracker.feed(text[position:]) is None:
+            return
+        yield text[position + tracker.start:position + tracker.end]
+        position += tracker.end
+
+
+def extract_json(response: str) -> Optional[Dict[str, Any]]:
+    """
+    Returns the first balanced JSON object in `response` that decodes.
+
+    Unlike a greedy `\\{.*\\}` match, text after the object (a trailing
+    explanation, another object, stray braces) does not break decoding.
+
+    Args:
+        response (str): Model output potentially containing a JSON object.
+
+    Returns:
+        Optional[Dict[str, Any]]: The decoded object, or None if the response
+        holds no balanced object.
+
+    Raises:
+        json.JSONDecodeError: If no balanced object decodes; the error of the
+        first candidate is raised.
+    """
+    first_error = None
+    for candidate in iter_json_objects(response):
+        try:
+            return json.loads(candidate)
+        except json.JSONDecodeError as e:
+            first_error = first_error or e
+    if first_error is not None:
+        raise first_error
+    return None
+
+
+def stop_at_json_end(tokens: Iterable[str],
+                     tracker: Optional[JSONObjectTracker] = None) -> Iterator[str]:
+    """
+    Passes tokens through until the first top-level JSON object closes, then
+    stops iterating `tokens`, which stops the underlying generation. The
+    token holding the closing brace is cut just after it. Pass a `tracker`
+    to inspect afterwards whether the object closed.
+    """
+    tracker = tracker or JSONObjectTracker()
+    iterator = iter(tokens)
+    try:
+        for token in iterator:
+            end = tracker.feed(token)
+            if end is not None:
+                if token[:end]:
+                    yield token[:end]
+                return
+            yield token
+    finally:
+        close = getattr(iterator, "close", None)
+        if close is not None:
+            close()
@@ -0,0 +1,307 @@
+import logging
+import re
+import threading
+import time
+from typing import Any, Dict, Iterator, Optional
+
+from Constants.model_constants import (
+    BACKEND_CONFIGS,
+    GENERATION_CONFIG,
+    GPU_MEMORY_PRESSURE_FRACTION,
+)
+from Utilities.generation_params import effective_generation_params
+
+logging.basicConfig(level=logging.INFO,
+                    format='%(asctime)s - %(levelname)s - %(message)s')
+
+
+class ModelBackend:
+    """
+    Base class for the model backends used by `LLMResponse`.
+
+    Subclasses implement `stream`, which takes per-request overrides of
+    `GENERATION_CONFIG` (`max_new_tokens`, `temperature`, `top_k`, `top_p`,
+    `repetition_penalty`) and `stop` sequences as keyword arguments and
+    applies them without reloading the model. `release_memory` and
+    `memory_pressure` are optional hooks used by the memory governor, which
+    only releases memory under pressure or every N generations.
+    `count_tokens` counts prompt tokens for the metrics. Backends that can
+    save and restore evaluated model state set `supports_prefix_state` and
+    implement `register_prefix`.
+    """
+
+    name = "base"
+    supports_prefix_state = False
+    concurrency = 1
+
+    def __init__(self, model_path: str, config: Dict[str, Any]) -> None:
+        self.model_path = model_path
+        self.config = config
+
+    def stream(self, prompt: str, **params: Any) -> Iterator[str]:
+        raise NotImplementedError
+
+    def count_tokens(self, prompt: str) -> int:
+        """
+        Number of prompt tokens. Approximated by whitespace-separated words
+        for backends without an in-process tokenizer.
+        """
+        return len(prompt.split())
+
+    def release_memory(self) -> None:
+        pass
+
+    def memory_pressure(self) -> bool:
+        return False
+
+    def register_prefix(self, prefix: str) -> bool:
+        """
+        Precomputes the model state for a fixed prompt prefix.
+
+        Returns:
+            bool: False when the backend cannot reuse prefix state.
+        """
+        return False
+
+    def prefix_stats(self) -> Dict[str, Any]:
+        return {"supported": self.supports_prefix_state}
+
+    def stats(self) -> Dict[str, Any]:
+        return {}
+
+    def close(self) -> None:
+        pass
+
+
+class CTransformersBackend(ModelBackend):
+    """
+    GGUF model served through ctransformers on the CPU.
+    """
+
+    name = "cpu"
+
+    def __init__(self, model_path: str, config: Dict[str, Any]) -> None:
+        super().__init__(model_path, config)
+        self.llm = self._initialize_model()
+
+    def _initialize_model(self):
+        from ctransformers import AutoModelForCausalLM
+
+        logging.info(
+            "Initializing the %s model from %s with %s", self.name, self.model_path, self.config)
+        model = AutoModelForCausalLM.from_pretrained(
+            self.model_path,
+            **self.config,
+            **GENERATION_CONFIG,
+            stream=False,
+        )
+        logging.info("Model initialized successfully on %s.", self.name.upper())
+        return model
+
+    @staticmethod
+    def _call_kwargs(params: Dict[str, Any]) -> Dict[str, Any]:
+        if "stop" in params:
+            params = {**params, "stop": list(params["stop"])}
+        return params
+
+    def stream(self, prompt: str, **params: Any) -> Iterator[str]:
+        return self.llm(prompt, stream=True, **self._call_kwargs(params))
+
+    def count_tokens(self, prompt: str) -> int:
+        return len(self.llm.tokenize(prompt))
+
+
+class CTransformersGPUBackend(CTransformersBackend):
+    """
+    GGUF model served through ctransformers with layers offloaded to the GPU.
+    torch is only imported by this backend.
+    """
+
+    name = "gpu"
+
+    def _initialize_model(self):
+        import torch
+
+        if not torch.cuda.is_available():
+            raise RuntimeError(
+                "GPU not available. Use MODEL_BACKEND=cpu to run on the CPU.")
+
+        with torch.no_grad():
+            return super()._initialize_model()
+
+    def release_memory(self) -> None:
+        import torch
+
+        torch.cuda.empty_cache()
+
+    def memory_pressure(self) -> bool:
+        import torch
+
+        total = torch.cuda.get_device_properties(0).total_memory
+        return torch.cuda.memory_reserved(0) > GPU_MEMORY_PRESSURE_FRACTION * total
+
+
+class LlamaCppBackend(ModelBackend):
+    """
+    GGUF model served through llama-cpp-python, which can save and restore
+    the evaluated context.
+
+    Registered prefixes (the fixed instruction preambles of the agent
+    templates) are evaluated once and their state is saved. A prompt that
+    starts with a registered prefix restores that state first, so only the
+    remaining tokens are evaluated. Prompt-evaluation time, measured as time
+    to the first generated token, is recorded with and without reuse.
+    """
+
+    name = "llama_cpp"
+    supports_prefix_state = True
+
+    def __init__(self, model_path: str, config: Dict[str, Any]) -> None:
+        super().__init__(model_path, config)
+        self.llm = self._initialize_model()
+        self._lock = threading.Lock()
+        self._prefix_states: Dict[str, Any] = {}
+        self._prompt_eval_stats: Dict[str, Dict[str, float]] = {
+            key: {"count": 0, "seconds": 0.0} for key in ("with_prefix", "without_prefix")}
+
+    def _initialize_model(self):
+        from llama_cpp import Llama
+
+        logging.info(
+            "Initializing the %s model from %s with %s", self.name, self.model_path, self.config)
+        model = Llama(model_path=self.model_path, verbose=False, **self.config)
+        logging.info("Model initialized successfully with llama.cpp.")
+        return model
+
+    @staticmethod
+    def _generation_kwargs(params: Dict[str, Any]) -> Dict[str, Any]:
+        params = effective_generation_params(params)
+        return {
+            "max_tokens": params["max_new_tokens"],
+            "temperature": params["temperature"],
+            "top_k": params["top_k"],
+            "top_p": params["top_p"],
+            "repeat_penalty": params["repetition_penalty"],
+            "stop": params["stop"] or None,
+        }
+
+    def register_prefix(self, prefix: str) -> bool:
+        if not prefix or prefix in self._prefix_states:
+            return True
+        with self._lock:
+            start_time = time.perf_counter()
+            self.llm.reset()
+            self.llm.eval(self.llm.tokenize(prefix.encode("utf-8"), add_bos=True))
+            self._prefix_states[prefix] = self.llm.save_state()
+            logging.info(
+                "Registered prompt prefix of %d characters in %.3f seconds.",
+                len(prefix), time.perf_counter() - start_time)
+        return True
+
+    def _restore_prefix(self, prompt: str) -> bool:
+        matches = [prefix for prefix in self._prefix_states if prompt.startswith(prefix)]
+        if not matches:
+            return False
+        self.llm.load_state(self._prefix_states[max(matches, key=len)])
+        return True
+
+    def stream(self, prompt: str, **params: Any) -> Iterator[str]:
+        """
+        Streams the generated text. The model is locked from the first token
+        request until the generator is exhausted or closed, so callers that
+        stop early must close it.
+        """
+        with self._lock:
+            start_time = time.perf_counter()
+            reused = self._restore_prefix(prompt)
+            first_token = True
+            chunks = self.llm(prompt, stream=True, **self._generation_kwargs(params))
+            try:
+                for chunk in chunks:
+                    if first_token:
+                        stats = self._prompt_eval_stats[
+                            "with_prefix" if reused else "without_prefix"]
+                        stats["count"] += 1
+                        stats["seconds"] += time.perf_counter() - start_time
+                        first_token = False
+                    yield chunk["choices"][0]["text"]
+            finally:
+                chunks.close()
+
+    def count_tokens(self, prompt: str) -> int:
+        return len(self.llm.tokenize(prompt.encode("utf-8"), add_bos=True))
+
+    def prefix_stats(self) -> Dict[str, Any]:
+        stats = {"supported": True, "registered_prefixes": len(self._prefix_states)}
+        for key, eval_stats in self._prompt_eval_stats.items():
+            count = eval_stats["count"]
+            stats[key] = {
+                "count": count,
+                "mean_prompt_eval_ms": round(eval_stats["seconds"] / count * 1000, 2)
+                if count else None,
+            }
+        return stats
+
+
+class StubBackend(ModelBackend):
+    """
+    Deterministic backend for benchmarks and CI. Streams the configured
+    response word by word after a fixed prompt latency (`latency_ms`) and a
+    per-token latency (`token_latency_ms`), honouring `max_new_tokens` (one
+    word per token) and `stop` sequences.
+    """
+
+    name = "stub"
+
+    def _response(self, params: Dict[str, Any]) -> str:
+        params = effective_generation_params(params)
+        words = re.findall(r"\S+\s*", self.config["response"])
+        response = "".join(words[:params["max_new_tokens"]])
+        for stop in params["stop"]:
+            response = response.split(stop, 1)[0]
+        return response
+
+    def stream(self, prompt: str, **params: Any) -> Iterator[str]:
+        time.sleep(self.config["latency_ms"] / 1000)
+        for token in re.findall(r"\S+\s*", self._response(params)):
+            time.sleep(self.config["token_latency_ms"] / 1000)
+            yield token
+
+
+BACKENDS = {
+    backend.name: backend
+    for backend in (CTransformersBackend, CTransformersGPUBackend, LlamaCppBackend, StubBackend)
+}
+
+
+def create_backend(name: str, model_path: str,
+                   overrides: Optional[Dict[str, Any]] = None) -> ModelBackend:
+    """
+    Builds the backend registered under `name` with its configuration from
+    `BACKEND_CONFIGS`.
+
+    Args:
+        name (str): Backend name, e.g. "gpu", "cpu", "llama_cpp", "stub" or "replicas".
+        model_path (str): Path to the model weights.
+        overrides (Optional[Dict[str, Any]]): Values replacing keys already
+            present in the backend configuration.
+
+    Returns:
+        ModelBackend: The initialized backend.
+
+    Raises:
+        ValueError: If no backend is registered under `name`.
+    """
+    if name == "replicas":
+        from Utilities.replica_pool import ReplicaPool
+        backend_class = ReplicaPool
+    elif name in BACKENDS:
+        backend_class = BACKENDS[name]
+    else:
+        raise ValueError(
+            f"Unknown model backend '{name}'. Available: {sorted(BACKENDS) + ['replicas']}")
+
+    config = dict(BACKEND_CONFIGS[name])
+    config.update({key: value for key, value in (overrides or {}).items()
+                   if key in config})
+    return backend_class(model_path, config)
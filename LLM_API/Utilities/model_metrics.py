@@ -0,0 +1,87 @@
+from typing import Any, Dict, Optional
+
+from Constants.model_constants import KNOWN_APP_NAMES, KNOWN_GENERATION_PROFILES, OTHER_LABEL
+from Utilities.metrics import MetricsRegistry, TOKEN_RATE_BUCKETS
+
+# Metrics of the model server, exposed on /metrics. `profile` is the
+# generation profile the calling agent sent (one per intent), `app_name`
+# the calling application; both pass through `profile_label`/`app_label`.
+REGISTRY = MetricsRegistry()
+
+STAGE_SECONDS = REGISTRY.histogram(
+    "model_stage_seconds",
+    "Latency of a request stage (queue, time_to_first_token, generation, "
+    "serialization, total) in seconds.",
+    ("stage", "endpoint", "profile", "app_name"))
+REQUESTS = REGISTRY.counter(
+    "model_requests_total", "Inference requests by response status.",
+    ("endpoint", "profile", "app_name", "status"))
+CACHE_HITS = REGISTRY.counter(
+    "model_cache_hits_total", "Inference requests answered from the response cache.",
+    ("endpoint", "profile", "app_name"))
+COALESCED_REQUESTS = REGISTRY.counter(
+    "model_coalesced_requests_total",
+    "Inference requests that joined an identical in-flight generation.",
+    ("endpoint", "profile", "app_name"))
+RATE_LIMITED = REGISTRY.counter(
+    "model_rate_limited_total", "Requests rejected by the rate limiter.", ("endpoint",))
+IN_FLIGHT_REQUESTS = REGISTRY.gauge(
+    "model_in_flight_requests", "Inference requests being handled.", ("endpoint",))
+QUEUE_DEPTH = REGISTRY.gauge(
+    "model_queue_depth", "Generations waiting for a worker.")
+IN_FLIGHT_GENERATIONS = REGISTRY.gauge(
+    "model_in_flight_generations", "Distinct generations queued or running.")
+
+PROMPT_TOKENS = REGISTRY.counter(
+    "model_prompt_tokens_total", "Prompt tokens evaluated.", ("profile",))
+GENERATED_TOKENS = REGISTRY.counter(
+    "model_generated_tokens_total", "Tokens generated.", ("profile",))
+TOKENS_PER_SECOND = REGISTRY.histogram(
+    "model_tokens_per_second", "Generation speed per request in tokens/s.",
+    ("profile",), buckets=TOKEN_RATE_BUCKETS)
+
+
+def profile_label(profile: Any) -> str:
+    """
+    The generation profile as a label value. Profiles outside
+    `KNOWN_GENERATION_PROFILES` are "other", which keeps the number of
+    series bounded.
+    """
+    return profile if isinstance(profile, str) and profile in KNOWN_GENERATION_PROFILES \
+        else OTHER_LABEL
+
+
+def app_label(app_name: Any) -> str:
+    """
+    The calling application as a label value, "other" unless it is one of
+    `KNOWN_APP_NAMES`.
+    """
+    return app_name if isinstance(app_name, str) and app_name in KNOWN_APP_NAMES \
+        else OTHER_LABEL
+
+
+def record_request(endpoint: str, profile: str, app_name: str, status: int,
+                   stages: Optional[Dict[str, float]] = None,
+                   cache_hit: bool = False, coalesced: bool = False) -> None:
+    """
+    Records a finished inference request: its status, the latency of each
+    stage in `stages` (seconds by stage name) and whether it was served
+    from the cache or joined an in-flight generation.
+    """
+    labels = {"endpoint": endpoint, "profile": profile_label(profile),
+              "app_name": app_label(app_name)}
+    REQUESTS.inc(status=status, **labels)
+    for stage, seconds in (stages or {}).items():
+        STAGE_SECONDS.observe(seconds, stage=stage, **labels)
+    if cache_hit:
+        CACHE_HITS.inc(**labels)
+    if coalesced:
+        COALESCED_REQUESTS.inc(**labels)
+
+
+def update_scheduler_gauges(scheduler_stats: Dict[str, Any]) -> None:
+    """
+    Sets the queue gauges from `RequestScheduler.stats()`, at scrape time.
+    """
+    QUEUE_DEPTH.set(scheduler_stats["queue_depth"])
+    IN_FLIGHT_GENERATIONS.set(scheduler_stats["in_flight_generations"])
@@ -0,0 +1,235 @@
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Set
+
+from Constants.model_constants import (
+    MEMORY_CLEANUP_EVERY_N_REQUESTS,
+    MEMORY_RSS_LIMIT_MB,
+    MEMORY_CLEANUP_MIN_INTERVAL_SECONDS,
+)
+from Utilities.memory_governor import MemoryGovernor
+from Utilities.model_backends import ModelBackend
+
+logging.basicConfig(level=logging.INFO,
+                    format='%(asctime)s - %(levelname)s - %(message)s')
+
+THREAD_CONFIG_KEYS = ("threads", "n_threads")
+REPLICA_STOP_TIMEOUT_SECONDS = 5
+
+
+def _read_memory_status(pid: int) -> Dict[str, int]:
+    """
+    Returns resident memory of a process in kB from /proc. `RssFile` holds
+    the memory-mapped weights, which replicas share through the page cache.
+    """
+    memory = {}
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                key, _, value = line.partition(":")
+                if key in ("VmRSS", "RssAnon", "RssFile", "RssShmem"):
+                    memory[key] = int(value.split()[0])
+    except OSError:
+        pass
+    return memory
+
+
+def _replica_main(index: int, backend_name: str, model_path: str,
+                  cpu_set: Optional[Set[int]], connection) -> None:
+    """
+    Entry point of a replica process: pins itself to its CPUs, loads the
+    model (memory-mapped by the backend) and serves requests from the pipe.
+    """
+    from Utilities.model_backends import create_backend
+
+    try:
+        overrides = {}
+        if cpu_set:
+            os.sched_setaffinity(0, cpu_set)
+            overrides = {key: len(cpu_set) for key in THREAD_CONFIG_KEYS}
+        backend = create_backend(backend_name, model_path, overrides=overrides)
+    except Exception as e:
+        connection.send(("error", f"Replica {index} failed to load: {e}"))
+        return
+    memory_governor = MemoryGovernor(MEMORY_CLEANUP_EVERY_N_REQUESTS, MEMORY_RSS_LIMIT_MB,
+                                     cleanup=[backend.release_memory],
+                                     pressure_probe=backend.memory_pressure,
+                                     min_interval_seconds=MEMORY_CLEANUP_MIN_INTERVAL_SECONDS)
+    connection.send(("ready", os.getpid()))
+
+    while True:
+        message = connection.recv()
+        if message[0] == "stop":
+            return
+        if message[0] != "generate":
+            continue
+
+        stopping = False
+        try:
+            tokens = backend.stream(message[1], **message[2])
+            try:
+                for token in tokens:
+                    if connection.poll():
+                        control = connection.recv()[0]
+                        if control in ("cancel", "stop"):
+                            stopping = control == "stop"
+                            break
+                    connection.send(("token", token))
+            finally:
+                close = getattr(tokens, "close", None)
+                if close is not None:
+                    close()
+            memory_governor.after_request()
+            connection.send(("end",))
+        except Exception as e:
+            connection.send(("error", str(e)))
+        if stopping:
+            return
+
+
+class _Replica:
+    def __init__(self, index: int, process, connection, cpu_set: Optional[Set[int]]):
+        self.index = index
+        self.process = process
+        self.connection = connection
+        self.cpu_set = cpu_set
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.requests = 0
+        self.tokens = 0
+        self.busy_seconds = 0.0
+
+
+class ReplicaPool(ModelBackend):
+    """
+    Serves the model from N replica processes behind a least-loaded dispatcher.
+
+    Each replica loads the same GGUF file through a backend that memory-maps
+    it, so the weights are shared through the page cache instead of being
+    copied per process. Replicas can be pinned to CPU sets, in which case
+    their thread count follows the size of the set. A replica handles one
+    generation at a time; `concurrency` tells the scheduler how many
+    generations may run at once.
+    """
+
+    name = "replicas"
+
+    def __init__(self, model_path: str, config: Dict[str, Any]) -> None:
+        super().__init__(model_path, config)
+        self.concurrency = config["replicas"]
+        self._started_at = time.time()
+        self._dispatch_lock = threading.Lock()
+        self._replicas: List[_Replica] = []
+
+        context = multiprocessing.get_context("spawn")
+        cpu_sets = config.get("cpu_sets") or []
+        for index in range(config["replicas"]):
+            cpu_set = cpu_sets[index] if index < len(cpu_sets) else None
+            parent_connection, child_connection = context.Pipe()
+            process = context.Process(
+                target=_replica_main,
+                args=(index, config["backend"], model_path, cpu_set, child_connection),
+                daemon=True,
+            )
+            process.start()
+            self._replicas.append(_Replica(index, process, parent_connection, cpu_set))
+
+        for replica in self._replicas:
+            status = replica.connection.recv()
+            if status[0] != "ready":
+                self.close()
+                raise RuntimeError(status[1])
+            logging.info(
+                f"Replica {replica.index} ready (pid {status[1]}, cpus {sorted(replica.cpu_set or [])}).")
+
+    def _acquire(self) -> _Replica:
+        with self._dispatch_lock:
+            replica = min(self._replicas, key=lambda r: r.in_flight)
+            replica.in_flight += 1
+        return replica
+
+    def stream(self, prompt: str, **params: Any) -> Iterator[str]:
+        replica = self._acquire()
+        try:
+            with replica.lock:
+                start_time = time.perf_counter()
+                replica.connection.send(("generate", prompt, params))
+                finished = False
+                try:
+                    while True:
+                        message = replica.connection.recv()
+                        if message[0] == "token":
+                            replica.tokens += 1
+                            yield message[1]
+                        elif message[0] == "end":
+                            finished = True
+                            break
+                        else:
+                            finished = True
+                            raise RuntimeError(message[1])
+                finally:
+                    if not finished:
+                        replica.connection.send(("cancel",))
+                        while replica.connection.recv()[0] not in ("end", "error"):
+                            pass
+                    replica.requests += 1
+                    replica.busy_seconds += time.perf_counter() - start_time
+        finally:
+            with self._dispatch_lock:
+                replica.in_flight -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Per-replica RSS and load plus aggregate tokens/sec since start.
+        """
+        replicas = []
+        for replica in self._replicas:
+            replicas.append({
+                "index": replica.index,
+                "pid": replica.process.pid,
+                "cpus": sorted(replica.cpu_set or []),
+                "in_flight": replica.in_flight,
+                "requests": replica.requests,
+                "tokens": replica.tokens,
+                "tokens_per_busy_second": round(replica.tokens / replica.busy_seconds, 2)
+                if replica.busy_seconds else 0.0,
+                "memory_kb": _read_memory_status(replica.process.pid),
+            })
+        total_tokens = sum(r.tokens for r in self._replicas)
+        return {
+            "replicas": replicas,
+            "total_tokens": total_tokens,
+            "aggregate_tokens_per_second": round(
+                total_tokens / (time.time() - self._started_at), 2),
+        }
+
+    def close(self) -> None:
+        """
+        Stops every replica. A replica in the middle of a generation gets the
+        stop once its current request lets go of the pipe, or after
+        `REPLICA_STOP_TIMEOUT_SECONDS`, in which case it finishes the
+        generation early. Replicas that do not exit in time are terminated.
+        """
+        for replica in self._replicas:
+            if not replica.process.is_alive():
+                continue
+            locked = replica.lock.acquire(timeout=REPLICA_STOP_TIMEOUT_SECONDS)
+            try:
+                replica.connection.send(("stop",))
+            except (BrokenPipeError, OSError):
+                pass
+            finally:
+                if locked:
+                    replica.lock.release()
+        for replica in self._replicas:
+            replica.process.join(timeout=REPLICA_STOP_TIMEOUT_SECONDS)
+            if replica.process.is_alive():
+                logging.warning(f"Replica {replica.index} did not stop; terminating it.")
+                replica.process.terminate()
+                replica.process.join(timeout=REPLICA_STOP_TIMEOUT_SECONDS)
+            if replica.process.is_alive():
+                replica.process.kill()
+                replica.process.join()
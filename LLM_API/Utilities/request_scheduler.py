@@ -0,0 +1,331 @@
+import asyncio
+import functools
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+logging.basicConfig(level=logging.INFO,
+                    format='%(asctime)s - %(levelname)s - %(message)s')
+
+
+class QueueFullError(Exception):
+    """
+    Raised when the generation queue cannot accept another request.
+    """
+
+    def __init__(self, retry_after: int):
+        super().__init__("Generation queue is full.")
+        self.retry_after = retry_after
+
+
+_STREAM_END = object()
+
+
+@dataclass
+class GenerationJob:
+    prompt: str
+    params: Dict[str, Any]
+    future: asyncio.Future
+    stream: bool = False
+    enqueued_at: float = field(default_factory=time.perf_counter)
+    waiters: int = 1
+    subscribers: List[asyncio.Queue] = field(default_factory=list)
+    published: List[Any] = field(default_factory=list)
+
+    def publish(self, item: Any) -> None:
+        """
+        Hands a token (or the end marker / an exception) to every subscriber
+        and keeps it for subscribers that join later.
+        """
+        self.published.append(item)
+        for subscriber in self.subscribers:
+            subscriber.put_nowait(item)
+
+    def subscribe(self) -> asyncio.Queue:
+        subscriber = asyncio.Queue()
+        for item in self.published:
+            subscriber.put_nowait(item)
+        self.subscribers.append(subscriber)
+        return subscriber
+
+    def release(self) -> None:
+        """
+        Drops one waiter; the job is cancelled once nobody waits for it.
+        """
+        self.waiters -= 1
+        if self.waiters <= 0 and not self.future.done():
+            self.future.cancel()
+
+
+class GenerationStream:
+    """
+    Async iterator over the tokens of a queued streaming generation.
+
+    Several streams may subscribe to one coalesced job; each sees every
+    token from the start. Leaving the iteration early (e.g. the client
+    disconnected) cancels the job once no other subscriber is left, which
+    stops the generation at the next token.
+    """
+
+    def __init__(self, job: GenerationJob, coalesced: bool = False):
+        self._job = job
+        self._queue = job.subscribe()
+        self.coalesced = coalesced
+
+    async def __aiter__(self) -> AsyncIterator[str]:
+        finished = False
+        try:
+            while True:
+                item = await self._queue.get()
+                if item is _STREAM_END:
+                    finished = True
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            if not finished:
+                self._job.subscribers.remove(self._queue)
+                self._job.release()
+
+    async def stats(self) -> Dict[str, Any]:
+        """
+        Timing of the finished generation: `queue_time`,
+        `time_to_first_token` and `generation_time`, plus `coalesced`.
+        """
+        stats = dict(await asyncio.shield(self._job.future))
+        stats["coalesced"] = self.coalesced
+        return stats
+
+
+class RequestScheduler:
+    """
+    Bounded request queue in front of a model backend with dedicated
+    generation workers.
+
+    Generation runs on a thread pool so the event loop stays free for auth,
+    rate limiting and other requests. Each worker runs one generation at a
+    time; none of the backends can generate several prompts in one call.
+
+    The backend only needs a `generate_response(prompt, **params)` method,
+    so the scheduler can be exercised with a fake backend on CPU. Streaming
+    requests additionally need `stream_response(prompt, **params)` yielding
+    tokens; they share the same queue and workers.
+
+    Requests are coalesced (singleflight): a prompt with the same parameters
+    as a queued or running job of the same kind does not queue its own
+    generation but waits for that job's result, or subscribes to its token
+    stream. The number of coalesced requests is reported by `stats`.
+    """
+
+    def __init__(self, backend: Any, max_queue_size: int, workers: int = 1,
+                 retry_after: int = 5):
+        """
+        Args:
+            backend (Any): Object with `generate_response` and optionally `stream_response`.
+            max_queue_size (int): Number of requests allowed to wait for a worker.
+            workers (int): Number of concurrent generation workers.
+            retry_after (int): Seconds suggested to clients when the queue is full.
+        """
+        self.backend = backend
+        self.max_queue_size = max_queue_size
+        self.workers = workers
+        self.retry_after = retry_after
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._tasks: List[asyncio.Task] = []
+        self._in_flight: Dict[Tuple, GenerationJob] = {}
+        self.coalesced_requests = 0
+        self.coalesced_stream_requests = 0
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def start(self) -> None:
+        """
+        Creates the queue and starts the worker tasks on the running loop.
+        """
+        self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="generation")
+        self._tasks = [asyncio.create_task(self._worker())
+                       for _ in range(self.workers)]
+        logging.info(
+            f"Request scheduler started with {self.workers} worker(s) and queue size {self.max_queue_size}.")
+
+    async def stop(self) -> None:
+        """
+        Cancels the workers and shuts down the generation thread pool.
+        """
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+        logging.info("Request scheduler stopped.")
+
+    async def submit(self, prompt: str, **params: Any) -> Dict[str, Any]:
+        """
+        Queues a prompt and waits for its generation.
+
+        Args:
+            prompt (str): Input prompt for the model.
+            **params: Generation parameters forwarded to the backend.
+
+        Returns:
+            Dict[str, Any]: `output`, `queue_time`, `generation_time` and
+            `coalesced`.
+
+        Raises:
+            QueueFullError: If the queue is at capacity.
+        """
+        job, coalesced = self._join_or_enqueue(prompt, params, stream=False)
+        try:
+            result = await asyncio.shield(job.future)
+        except asyncio.CancelledError:
+            job.release()
+            raise
+        return {**result, "coalesced": coalesced}
+
+    async def submit_stream(self, prompt: str, **params: Any) -> GenerationStream:
+        """
+        Queues a prompt for streaming generation.
+
+        Args:
+            prompt (str): Input prompt for the model.
+            **params: Generation parameters forwarded to the backend.
+
+        Returns:
+            GenerationStream: Iterator over the generated tokens.
+
+        Raises:
+            QueueFullError: If the queue is at capacity.
+        """
+        job, coalesced = self._join_or_enqueue(prompt, params, stream=True)
+        return GenerationStream(job, coalesced=coalesced)
+
+    def _join_or_enqueue(self, prompt: str, params: Dict[str, Any],
+                         stream: bool) -> Tuple[GenerationJob, bool]:
+        """
+        Returns the in-flight job for the same prompt, parameters and kind,
+        or queues a new one.
+
+        Raises:
+            QueueFullError: If a new job is needed and the queue is at capacity.
+        """
+        if self._queue is None:
+            raise RuntimeError("Request scheduler has not been started.")
+
+        key = (stream, prompt) + tuple(sorted(params.items()))
+        job = self._in_flight.get(key)
+        if job is not None and not job.future.done():
+            job.waiters += 1
+            if stream:
+                self.coalesced_stream_requests += 1
+            else:
+                self.coalesced_requests += 1
+            logging.info("Coalesced request with an identical in-flight generation.")
+            return job, True
+
+        job = GenerationJob(prompt=prompt, params=params,
+                            future=asyncio.get_running_loop().create_future(),
+                            stream=stream)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            logging.warning("Generation queue is full, rejecting request.")
+            raise QueueFullError(retry_after=self.retry_after)
+        self._in_flight[key] = job
+        job.future.add_done_callback(
+            lambda _: self._in_flight.pop(key, None) if self._in_flight.get(key) is job else None)
+        return job, False
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "queue_depth": self.queue_depth,
+            "in_flight_generations": len(self._in_flight),
+            "coalesced_requests": self.coalesced_requests,
+            "coalesced_stream_requests": self.coalesced_stream_requests,
+        }
+
+    async def run_in_worker(self, fn: Any, *args: Any) -> Any:
+        """
+        Runs a blocking model call on the generation thread pool, outside
+        the queue, e.g. for warm-up work.
+        """
+        if self._executor is None:
+            raise RuntimeError("Request scheduler has not been started.")
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    async def _execute(self, job: GenerationJob) -> None:
+        loop = asyncio.get_running_loop()
+        started_at = time.perf_counter()
+        try:
+            output = await loop.run_in_executor(
+                self._executor, functools.partial(
+                    self.backend.generate_response, job.prompt, **job.params))
+        except Exception as e:
+            if not job.future.done():
+                job.future.set_exception(e)
+            return
+
+        if not job.future.done():
+            job.future.set_result({
+                "output": output,
+                "queue_time": started_at - job.enqueued_at,
+                "generation_time": time.perf_counter() - started_at,
+            })
+
+    async def _execute_stream(self, job: GenerationJob) -> None:
+        loop = asyncio.get_running_loop()
+        started_at = time.perf_counter()
+
+        def produce() -> Optional[float]:
+            first_token_at = None
+            try:
+                tokens = self.backend.stream_response(job.prompt, **job.params)
+                try:
+                    for token in tokens:
+                        if job.future.done():
+                            logging.info("Streaming consumer went away, stopping generation.")
+                            break
+                        if first_token_at is None:
+                            first_token_at = time.perf_counter()
+                        loop.call_soon_threadsafe(job.publish, token)
+                finally:
+                    close = getattr(tokens, "close", None)
+                    if close is not None:
+                        close()
+            except Exception as e:
+                logging.error(f"Error during streaming generation: {e}")
+                loop.call_soon_threadsafe(job.publish, e)
+            finally:
+                loop.call_soon_threadsafe(job.publish, _STREAM_END)
+            return first_token_at
+
+        first_token_at = await loop.run_in_executor(self._executor, produce)
+        finished_at = time.perf_counter()
+        if not job.future.done():
+            job.future.set_result({
+                "queue_time": started_at - job.enqueued_at,
+                "time_to_first_token": (first_token_at or finished_at) - started_at,
+                "generation_time": finished_at - started_at,
+            })
+
+    async def _worker(self) -> None:
+        while True:
+            job = await self._queue.get()
+            try:
+                if job.future.done():
+                    continue
+                if job.stream:
+                    await self._execute_stream(job)
+                else:
+                    await self._execute(job)
+            finally:
+                self._queue.task_done()
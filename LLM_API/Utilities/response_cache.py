@@ -0,0 +1,148 @@
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from typing import Any, Dict, Optional
+
+from Utilities.model_metrics import app_label
+
+logging.basicConfig(level=logging.INFO,
+                    format='%(asctime)s - %(levelname)s - %(message)s')
+
+
+class ResponseCache:
+    """
+    LRU cache of generated responses with a TTL, a memory cap and an optional
+    SQLite-backed persistent tier.
+
+    Entries are keyed on a hash of everything that determines the output, so
+    the same prompt under different generation parameters or another model
+    never collides. Lookups count hits and misses per application, with
+    unknown applications counted as "other" (see `app_label`).
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int, ttl_seconds: float,
+                 sqlite_path: Optional[str] = None) -> None:
+        """
+        Args:
+            max_entries (int): Maximum number of in-memory entries.
+            max_bytes (int): Maximum total size of in-memory responses.
+            ttl_seconds (float): How long an entry stays valid.
+            sqlite_path (Optional[str]): File for the persistent tier; disabled when None.
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[str, int]] = defaultdict(
+            lambda: {"hits": 0, "misses": 0})
+
+        self._db = None
+        if sqlite_path:
+            self._db = sqlite3.connect(sqlite_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS response_cache "
+                "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)")
+            self._db.execute(
+                "DELETE FROM response_cache WHERE expires_at < ?", (time.time(),))
+            self._db.commit()
+            logging.info(f"Response cache persistent tier at {sqlite_path}.")
+
+    @staticmethod
+    def make_key(prompt: str, params: Dict[str, Any], model_path: str) -> str:
+        """
+        Hashes the prompt, generation parameters and model path into a cache key.
+        """
+        material = json.dumps(
+            {"prompt": prompt, "params": params, "model": model_path},
+            sort_keys=True, default=str)
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def _evict(self) -> None:
+        while self._entries and (len(self._entries) > self.max_entries
+                                 or self._bytes > self.max_bytes):
+            _, (_, _, size) = self._entries.popitem(last=False)
+            self._bytes -= size
+
+    def _store_memory(self, key: str, value: str, expires_at: float) -> None:
+        size = len(value.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._bytes -= previous[2]
+        self._entries[key] = (value, expires_at, size)
+        self._bytes += size
+        self._evict()
+
+    def _get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at, size = entry
+                if expires_at >= now:
+                    self._entries.move_to_end(key)
+                    return value
+                del self._entries[key]
+                self._bytes -= size
+
+            if self._db is None:
+                return None
+            row = self._db.execute(
+                "SELECT value, expires_at FROM response_cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            value, expires_at = row
+            if expires_at < now:
+                self._db.execute(
+                    "DELETE FROM response_cache WHERE key = ?", (key,))
+                self._db.commit()
+                return None
+            self._store_memory(key, value, expires_at)
+            return value
+
+    def get(self, key: str, app_name: Optional[str] = None) -> Optional[str]:
+        """
+        Returns the cached response for `key`, or None. When `app_name` is
+        given the lookup is counted towards that application's hit/miss stats.
+        """
+        value = self._get(key)
+        if app_name is not None:
+            with self._lock:
+                self._counters[app_label(app_name)]["hits" if value is not None else "misses"] += 1
+        return value
+
+    def set(self, key: str, value: str) -> None:
+        """
+        Stores a response in memory and, if enabled, in the persistent tier.
+        """
+        expires_at = time.time() + self.ttl_seconds
+        with self._lock:
+            self._store_memory(key, value, expires_at)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO response_cache (key, value, expires_at) VALUES (?, ?, ?)",
+                    (key, value, expires_at))
+                self._db.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns entry count, memory use and per-application hit/miss counters.
+        """
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl_seconds,
+                "persistent": self._db is not None,
+                "apps": {app: dict(counts) for app, counts in self._counters.items()},
+            }
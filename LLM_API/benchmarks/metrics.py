@@ -0,0 +1,39 @@
+# Run from the LLM_API directory: python -m benchmarks.metrics
+import time
+
+from Utilities.metrics import MetricsRegistry
+
+
+def main(samples: int = 1_000_000) -> None:
+    """
+    Cost of one recorded sample, to compare with request latencies.
+    """
+    registry = MetricsRegistry()
+    histogram = registry.histogram("bench_seconds", "Benchmark.", ("stage", "intent", "app_name"))
+    counter = registry.counter("bench_total", "Benchmark.", ("intent", "app_name"))
+    gauge = registry.gauge("bench_in_flight", "Benchmark.", ("endpoint",))
+
+    def in_progress() -> None:
+        with gauge.track_in_progress(endpoint="get-response"):
+            pass
+
+    cases = [
+        ("histogram.observe", lambda: histogram.observe(
+            0.123, stage="llm_call", intent="write_email", app_name="Sales_Agent")),
+        ("counter.inc", lambda: counter.inc(intent="write_email", app_name="Sales_Agent")),
+        ("gauge.track_in_progress", in_progress),
+    ]
+    for name, function in cases:
+        start_time = time.perf_counter()
+        for _ in range(samples):
+            function()
+        print(f"{name:<24} {(time.perf_counter() - start_time) / samples * 1e9:8.0f} ns/sample")
+
+    start_time = time.perf_counter()
+    body = registry.render()
+    print(f"render                   {(time.perf_counter() - start_time) * 1e3:8.2f} ms "
+          f"({len(body)} bytes)")
+
+
+if __name__ == "__main__":
+    main()
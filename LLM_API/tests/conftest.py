@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The LLM API modules import each other from the LLM_API directory.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,119 @@
+import asyncio
+import threading
+
+import pytest
+
+from Handlers.error_handler import ErrorHandlers
+from Utilities.request_scheduler import QueueFullError, RequestScheduler
+
+
+class GatedBackend:
+    """
+    Fake backend whose generations block until `release` is set, so tests
+    control what is queued or running at any moment.
+    """
+
+    def __init__(self, tokens=("a", "b", "c", "d")):
+        self.tokens = tokens
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.calls = 0
+
+    def generate_response(self, prompt, **params):
+        self.calls += 1
+        self.started.set()
+        self.release.wait(5)
+        return f"{prompt}:{params}"
+
+    def stream_response(self, prompt, **params):
+        self.calls += 1
+        for index, token in enumerate(self.tokens):
+            if index == 2:
+                self.started.set()
+                self.release.wait(5)
+            yield token
+
+
+async def wait_for(event: threading.Event) -> None:
+    assert await asyncio.get_running_loop().run_in_executor(None, event.wait, 5)
+
+
+def run_with_scheduler(backend, test, **options):
+    async def main():
+        scheduler = RequestScheduler(backend=backend, **options)
+        await scheduler.start()
+        try:
+            return await test(scheduler)
+        finally:
+            backend.release.set()
+            await scheduler.stop()
+
+    return asyncio.run(main())
+
+
+def test_full_queue_is_rejected_with_503_and_retry_after():
+    backend = GatedBackend()
+
+    async def test(scheduler):
+        running = asyncio.create_task(scheduler.submit("running"))
+        await wait_for(backend.started)
+        queued = asyncio.create_task(scheduler.submit("queued"))
+        await asyncio.sleep(0)
+
+        with pytest.raises(QueueFullError) as error:
+            await scheduler.submit("rejected")
+
+        backend.release.set()
+        await asyncio.gather(running, queued)
+        return error.value
+
+    error = run_with_scheduler(backend, test, max_queue_size=1, workers=1, retry_after=7)
+    response = ErrorHandlers().handle_queue_full_error(str(error), error.retry_after)
+
+    assert error.retry_after == 7
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "7"
+
+
+def test_identical_requests_are_coalesced():
+    backend = GatedBackend()
+
+    async def test(scheduler):
+        first = asyncio.create_task(scheduler.submit("prompt", temperature=0.1))
+        await wait_for(backend.started)
+        second = asyncio.create_task(scheduler.submit("prompt", temperature=0.1))
+        other = asyncio.create_task(scheduler.submit("prompt", temperature=0.9))
+        await asyncio.sleep(0)
+        backend.release.set()
+        return await asyncio.gather(first, second, other), scheduler.stats()
+
+    (first, second, other), stats = run_with_scheduler(backend, test, max_queue_size=4)
+
+    assert backend.calls == 2
+    assert first["output"] == second["output"] != other["output"]
+    assert (first["coalesced"], second["coalesced"], other["coalesced"]) == (False, True, False)
+    assert stats["coalesced_requests"] == 1
+
+
+def test_stream_fans_out_to_late_subscribers():
+    backend = GatedBackend()
+
+    async def collect(stream):
+        return [token async for token in stream]
+
+    async def test(scheduler):
+        first_stream = await scheduler.submit_stream("prompt")
+        first = asyncio.create_task(collect(first_stream))
+        # Subscribe once the first tokens have already been published.
+        await wait_for(backend.started)
+        late_stream = await scheduler.submit_stream("prompt")
+        late = asyncio.create_task(collect(late_stream))
+        backend.release.set()
+        return await asyncio.gather(first, late), late_stream.coalesced, scheduler.stats()
+
+    (first, late), coalesced, stats = run_with_scheduler(backend, test, max_queue_size=4)
+
+    assert backend.calls == 1
+    assert first == late == ["a", "b", "c", "d"]
+    assert coalesced is True
+    assert stats["coalesced_stream_requests"] == 1
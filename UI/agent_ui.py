@@ -26,7 +26,10 @@ except Exception as e:
     logging.error("Error loading CSS: %s", e)
 
 
-def send_payload(api_url: str, user_query: str):
+def stream_payload(api_url: str, user_query: str):
+    """
+    Posts the query to the streaming endpoint and yields the NDJSON events.
+    """
 
     auth = ("agent1api", "agent@111")
 
@@ -34,11 +37,41 @@ def send_payload(api_url: str, user_query: str):
         "query": str(user_query)
     }
 
+    try:
+        with httpx.Client(timeout=3000, auth=auth) as client:
+            with client.stream("POST", api_url, json=payload) as response:
+                response.raise_for_status()
+                logging.info("Successfully sent Payload to streaming API.")
+                for line in response.iter_lines():
+                    if line:
+                        yield json.loads(line)
+    except httpx.RequestError as e:
+        st.error(f"Network error occurred: {e}")
+        logging.error("Network error occurred: %s", e)
+    except httpx.HTTPStatusError as e:
+        st.error(f"API responded with error: {e}")
+        logging.error("API responded with error: %s", e)
+    except Exception as e:
+        st.error(f"Unexpected error: {e}")
+        logging.error("Unexpected error: %s", e)
+
+
+def fetch_search_page(api_url: str, cursor: str):
+    """
+    Fetches the next page of a search result from its cursor.
+    """
+
+    auth = ("agent1api", "agent@111")
+
+    payload = {
+        "cursor": cursor
+    }
+
     try:
         with httpx.Client(timeout=3000, auth=auth) as client:
             response = client.post(api_url, json=payload)
             response.raise_for_status()
-            logging.info("Successfully sent Payload to API.")
+            logging.info("Successfully fetched search page.")
             return response.json()
     except httpx.RequestError as e:
         st.error(f"Network error occurred: {e}")
@@ -52,6 +85,52 @@ def send_payload(api_url: str, user_query: str):
     return None
 
 
+def page_to_dataframe(page: dict) -> pd.DataFrame:
+    return pd.DataFrame(page["rows"], columns=page["columns"])
+
+
+def render_query_response(agent_type: str, query_response):
+    if agent_type == "search_dataframe":
+        if isinstance(query_response, str):
+            query_response = json.loads(query_response)
+        if "error" in query_response:
+            st.error(query_response["error"])
+        elif "rows" in query_response:
+            st.session_state["search_results"] = {
+                "pages": [page_to_dataframe(query_response)],
+                "total": query_response["total"],
+                "next_cursor": query_response["next_cursor"],
+            }
+        else:
+            st.dataframe(pd.DataFrame(query_response))
+    else:
+        # st.markdown(response['query_response'])
+        st.json(query_response)
+
+
+def render_search_results():
+    """
+    Shows the search pages fetched so far and loads the next one on demand.
+    Kept in the session state so it survives the rerun of a button click.
+    """
+    results = st.session_state.get("search_results")
+    if not results:
+        return
+
+    df = pd.concat(results["pages"], ignore_index=True)
+    st.caption(f"Showing {len(df)} of {results['total']} matches")
+    st.dataframe(df)
+
+    if results["next_cursor"] and st.button("Load more"):
+        PAGE_API_URL = "http://0.0.0.0:8301/agent/inference/search-page"
+        response = fetch_search_page(api_url=PAGE_API_URL, cursor=results["next_cursor"])
+        if response is not None:
+            page = response["query_response"]
+            results["pages"].append(page_to_dataframe(page))
+            results["next_cursor"] = page["next_cursor"]
+            st.rerun()
+
+
 # Streamlit UI
 st.title("AI Agent | Sales Developement Representative")
 
@@ -64,21 +143,31 @@ if st.button("Submit"):
             st.error("Please enter a valid query.")
             logging.error("Invalid query length: %s", user_query)
         else:
-            API_URL = "http://0.0.0.0:8301/agent/inference/get-response"
-            response = send_payload(
-                api_url=API_URL, user_query=user_query)
-
-            if response:
-                st.subheader("Response:")
-                query_response = response.get("query_response")
-                with st.expander(f"Response Body {response['process_time']}s"):
-                    st.json(response)
-
-                agent_type = response.get("intent").get("intent")
-                if agent_type == "search_dataframe":
-                    data = json.loads(query_response)
-                    df = pd.DataFrame(data)
-                    st.dataframe(df)
-                else:
-                    # st.markdown(response['query_response'])
-                    st.json(response['query_response'])
+            API_URL = "http://0.0.0.0:8301/agent/inference/stream-response"
+            st.session_state.pop("search_results", None)
+            draft_placeholder = None
+            draft = ""
+            for event in stream_payload(api_url=API_URL, user_query=user_query):
+                event_type = event.get("event")
+                if event_type == "intent":
+                    st.subheader("Response:")
+                    draft_placeholder = st.empty()
+                elif event_type == "token":
+                    draft += event["token"]
+                    draft_placeholder.markdown(draft)
+                elif event_type == "error":
+                    st.error(event.get("error"))
+                elif event_type == "busy":
+                    st.warning(f"{event.get('error')} Retry in {event.get('retry_after')}s.")
+                elif event_type == "done":
+                    if draft_placeholder is not None:
+                        draft_placeholder.empty()
+                    with st.expander(f"Response Body {event['process_time']}s"
+                                     f" | first token {event.get('time_to_first_token')}s"):
+                        st.json(event)
+
+                    agent_type = event.get("intent").get("intent")
+                    render_query_response(
+                        agent_type=agent_type, query_response=event.get("query_response"))
+
+render_search_results()